@@ -0,0 +1,107 @@
+# backend/active_time.py
+"""
+Aktive Zeit pro Fenster unter Berücksichtigung von Leerlauf.
+
+Bisher zählt ein Fenster vom Fokuswechsel bis zum nächsten – auch wenn
+dazwischen eine Stunde niemand an der Tastatur saß, und das letzte Fenster
+läuft bis "jetzt". Hier werden die nach Zeit sortierten window- und
+input-Events in einem einzigen Durchlauf zusammengeführt (Merge-Join über
+zwei Cursor, Speicher O(1) abgesehen vom Ergebnis):
+
+- Aktivität = Fensterwechsel oder Input-Event.
+- Nach jeder Aktivität zählt höchstens `idle_seconds` als aktiv, der Rest
+  bis zur nächsten Aktivität bzw. bis zum Fensterwechsel als Leerlauf.
+
+Ergebnis: (app, title) -> [aktive Sekunden, Leerlauf-Sekunden].
+"""
+import heapq
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+DEFAULT_IDLE_SECONDS = 300.0
+
+Key = Tuple[Optional[str], Optional[str]]
+
+# Unix-Zeit auf ms genau – reicht für Leerlauf-Erkennung und ist deutlich billiger als
+# durations.EPOCH_SQL; bei über einer Million Input-Events zählt jede Funktion pro Zeile
+_EPOCH = "(julianday(timestamp) - 2440587.5) * 86400.0"
+
+_WINDOW_SQL = f"""
+    SELECT {_EPOCH}, json_extract(payload, '$.app'), json_extract(payload, '$.title')
+    FROM events
+    WHERE source = 'window' AND timestamp >= ? AND timestamp <= ?
+    ORDER BY timestamp, id
+"""
+
+_INPUT_SQL = f"""
+    SELECT {_EPOCH}
+    FROM events
+    WHERE source = 'input' AND timestamp >= ? AND timestamp <= ?
+    ORDER BY timestamp, id
+"""
+
+
+def _utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _db_str(ts: datetime) -> str:
+    # Format, in dem SQLAlchemy DateTime in SQLite ablegt (Vergleich als String)
+    return _utc(ts).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _stream(db: Session, sql: str, start: str, end: str) -> Iterator[tuple]:
+    # direkt über den DBAPI-Cursor: liefert zeilenweise, ohne Row-Objekte von SQLAlchemy.
+    # Der Cursor wird geschlossen, sobald der Generator erschöpft ist oder close() bekommt.
+    cursor = db.connection().connection.cursor()
+    try:
+        yield from cursor.execute(sql, (start, end))
+    finally:
+        cursor.close()
+
+
+def window_activity(
+    db: Session,
+    start: Optional[datetime],
+    end: Optional[datetime] = None,
+    idle_seconds: float = DEFAULT_IDLE_SECONDS,
+) -> Dict[Key, List[float]]:
+    # das letzte Fenster endet spätestens jetzt – und ohne Input nach idle_seconds
+    now = datetime.now(timezone.utc)
+    end = min(_utc(end), now) if end else now
+    end_t = end.timestamp()
+    lo, hi = _db_str(start) if start else "", _db_str(end)
+
+    result: Dict[Key, List[float]] = {}
+    current: Optional[List[float]] = None  # Akkumulator des fokussierten Fensters
+    focus_t = last_t = 0.0
+    active = 0.0
+
+    # Zeilen: (t, app, title) für Fensterwechsel, (t,) für Input. Tupel-Vergleich im
+    # Merge: bei gleichem t kommt (t,) zuerst, app/title werden nie verglichen.
+    with closing(_stream(db, _WINDOW_SQL, lo, hi)) as windows, closing(_stream(db, _INPUT_SQL, lo, hi)) as inputs:
+        for row in heapq.merge(windows, inputs):
+            t = row[0]
+            if current is not None:
+                active += min(t - last_t, idle_seconds)
+                last_t = t
+            if len(row) == 3:
+                if current is not None:
+                    current[0] += active
+                    current[1] += (t - focus_t) - active
+                current = result.setdefault((row[1], row[2]), [0.0, 0.0])
+                focus_t = last_t = t
+                active = 0.0
+
+    if current is not None and end_t > focus_t:
+        active += min(end_t - last_t, idle_seconds)
+        current[0] += active
+        current[1] += (end_t - focus_t) - active
+
+    # julianday() ist nur auf ms genau – mehr Stellen wären Rauschen
+    return {key: [round(a, 3), round(i, 3)] for key, (a, i) in result.items()}
@@ -0,0 +1,207 @@
+# backend/analysis_executor.py
+"""
+Parallele Fenster-Analyse über Tages-Partitionen.
+
+Der Zeitraum wird in UTC-Tage zerlegt. Jede Partition wird in einem
+Worker-Prozess gelesen und zu Teil-Aggregaten verdichtet:
+
+- Dauer pro (app, title) für alle Events außer dem letzten der Partition
+  (dessen Dauer hängt vom ersten Event der nächsten Partition ab)
+- Sequenzen der Länge n, die komplett in der Partition liegen und nicht das
+  letzte Event enthalten
+- Kopf (erste n-1) und Schwanz (letzte n) Events für die Nahtstellen
+
+Beim Zusammenführen werden die Dauern an den Tagesgrenzen ergänzt und alle
+Sequenzen gezählt, die über Grenzen laufen. Das Ergebnis ist identisch mit
+einem einzigen Durchlauf über den ganzen Zeitraum.
+"""
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+
+from backend.db import SessionLocal
+from backend.models import Event
+
+# Ab so vielen Tagen lohnt sich der Prozess-Pool, darunter läuft alles inline
+PARALLEL_MIN_DAYS = 4
+ANALYSIS_PROCESSES = max(1, (os.cpu_count() or 2) - 1)
+
+# Max. gleichzeitige schwere Analysen – der Rest wartet, damit Ingest und
+# Dashboard-Abfragen nicht verhungern
+MAX_CONCURRENT_ANALYSES = int(os.environ.get("TRACKER_MAX_CONCURRENT_ANALYSES", "2"))
+ANALYSIS_WAIT_SECONDS = 30
+
+Key = Tuple[Optional[str], Optional[str]]
+# (app, title, ts, dauer) – dauer None = letztes Event der Partition
+Item = List
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(MAX_CONCURRENT_ANALYSES)
+
+
+class AnalysisBusy(Exception):
+    """Alle Analyse-Slots belegt (→ HTTP 503)."""
+
+
+def _utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=ANALYSIS_PROCESSES)
+        return _pool
+
+
+def split_days(start: datetime, end: datetime) -> List[Tuple[datetime, datetime, bool]]:
+    """Zerlegt [start, end] in (von, bis, bis_inklusive) an UTC-Mitternacht."""
+    parts = []
+    cur = start
+    while True:
+        midnight = datetime(cur.year, cur.month, cur.day, tzinfo=timezone.utc) + timedelta(days=1)
+        if midnight >= end:
+            parts.append((cur, end, True))
+            return parts
+        parts.append((cur, midnight, False))
+        cur = midnight
+
+
+# =========================
+# Worker (läuft im Prozess-Pool)
+# =========================
+
+def scan_partition(start: datetime, end: datetime, end_inclusive: bool, n: int) -> dict:
+    db = SessionLocal()
+    try:
+        q = (
+            db.query(
+                Event.timestamp,
+                func.json_extract(Event.payload, "$.app"),
+                func.json_extract(Event.payload, "$.title"),
+            )
+            .filter(Event.source == "window")
+            .filter(Event.timestamp >= start)
+            .filter(Event.timestamp <= end if end_inclusive else Event.timestamp < end)
+            .order_by(Event.timestamp.asc(), Event.id.asc())
+        )
+        events = [(app, title, _utc(ts)) for ts, app, title in q]
+    finally:
+        db.close()
+
+    count = len(events)
+    if count == 0:
+        return {"count": 0}
+
+    durs: List[Optional[float]] = [
+        max((events[i + 1][2] - events[i][2]).total_seconds(), 0.0) for i in range(count - 1)
+    ]
+    durs.append(None)
+
+    durations: Dict[Key, float] = defaultdict(float)
+    for i in range(count - 1):
+        if durs[i] > 0:
+            durations[(events[i][0], events[i][1])] += durs[i]
+
+    sequences: Dict[tuple, List[float]] = {}
+    if n >= 2:
+        # nur Fenster, die das letzte Event (Dauer unbekannt) nicht enthalten
+        for i in range(count - n):
+            seq = tuple((events[i + j][0], events[i + j][1]) for j in range(n))
+            stats = sequences.setdefault(seq, [0, 0.0])
+            stats[0] += 1
+            stats[1] += sum(durs[i:i + n])
+
+    items = [[a, t, ts, d] for (a, t, ts), d in zip(events, durs)]
+    return {
+        "count": count,
+        "first_ts": events[0][2],
+        "durations": dict(durations),
+        "sequences": sequences,
+        "head": items[: max(n - 1, 0)],
+        "tail": items[-max(n, 1):],
+    }
+
+
+# =========================
+# Zusammenführen
+# =========================
+
+def _merge(parts: List[dict], end: datetime, n: int):
+    parts = [p for p in parts if p["count"]]
+
+    durations: Dict[Key, float] = defaultdict(float)
+    sequences: Dict[tuple, List[float]] = {}
+
+    # Dauer des jeweils letzten Events einer Partition nachtragen
+    for k, p in enumerate(parts):
+        next_ts = parts[k + 1]["first_ts"] if k + 1 < len(parts) else end
+        last = p["tail"][-1]
+        last[3] = max((next_ts - last[2]).total_seconds(), 0.0)
+        if p["count"] <= len(p["head"]):
+            p["head"][-1][3] = last[3]
+
+        for key, secs in p["durations"].items():
+            durations[key] += secs
+        if last[3] > 0:
+            durations[(last[0], last[1])] += last[3]
+
+        for seq, (count, secs) in p["sequences"].items():
+            stats = sequences.setdefault(seq, [0, 0.0])
+            stats[0] += count
+            stats[1] += secs
+
+    if n >= 2:
+        # Sequenzen, die im Schwanz einer Partition beginnen (ggf. über Grenzen)
+        for k, p in enumerate(parts):
+            tail = p["tail"]
+            for j in range(len(tail)):
+                window = list(tail[j:j + n])
+                nxt = k + 1
+                while len(window) < n and nxt < len(parts):
+                    window.extend(parts[nxt]["head"][: n - len(window)])
+                    nxt += 1
+                if len(window) < n:
+                    break  # Ende des Zeitraums erreicht
+                seq = tuple((item[0], item[1]) for item in window)
+                stats = sequences.setdefault(seq, [0, 0.0])
+                stats[0] += 1
+                stats[1] += sum(item[3] for item in window)
+
+    return dict(durations), sequences
+
+
+def analyze_windows(start: datetime, end: datetime, n: int = 0):
+    """
+    Liefert (durations, sequences) für window-Events in [start, end]:
+    - durations: (app, title) -> Sekunden
+    - sequences: ((app, title), ...) -> [count, total_seconds] (nur bei n >= 2)
+
+    Große Zeiträume laufen parallel im Prozess-Pool. Höchstens
+    MAX_CONCURRENT_ANALYSES Analysen gleichzeitig, sonst AnalysisBusy.
+    """
+    start, end = _utc(start), _utc(end)
+    partitions = split_days(start, end)
+
+    if not _slots.acquire(timeout=ANALYSIS_WAIT_SECONDS):
+        raise AnalysisBusy()
+    try:
+        if len(partitions) >= PARALLEL_MIN_DAYS:
+            pool = _get_pool()
+            futures = [pool.submit(scan_partition, a, b, incl, n) for a, b, incl in partitions]
+            parts = [f.result() for f in futures]
+        else:
+            parts = [scan_partition(a, b, incl, n) for a, b, incl in partitions]
+    finally:
+        _slots.release()
+
+    return _merge(parts, end, n)
@@ -1,6 +1,7 @@
 # analysis_local.py
 #!/usr/bin/env python3
 from datetime import datetime, timedelta, timezone
+from backend import durations
 from backend.db import SessionLocal
 from sqlalchemy import func
 from sqlalchemy.orm import Session
@@ -16,47 +17,17 @@ def summarize_top_windows(days: int = 1, limit: int = 20):
         end = datetime.now(timezone.utc)
         start = end - timedelta(days=days)
 
-        q = (
-            db.query(Event)
-            .filter(Event.source == "window")
-            .filter(Event.timestamp >= start)
-            .filter(Event.timestamp <= end)
-            .order_by(Event.timestamp.asc())
-        )
-        rows = q.all()
-        if not rows:
+        items = durations.top_windows(db, start, end, limit)
+        if not items:
             print("Keine window-Events im Zeitraum gefunden.")
             return
 
-        durations = {}
-
-        for idx, row in enumerate(rows):
-            this_ts = row.timestamp
-            payload = row.payload or {}
-            app = payload.get("app")
-            title = payload.get("title")
-
-            if idx < len(rows) - 1:
-                next_ts = rows[idx + 1].timestamp
-            else:
-                next_ts = end
-
-            delta = (next_ts - this_ts).total_seconds()
-            if delta < 0:
-                continue
-
-            key = (app, title)
-            durations[key] = durations.get(key, 0.0) + delta
-
-        # sortieren
-        items = sorted(durations.items(), key=lambda kv: kv[1], reverse=True)[:limit]
-
         print(f"Top Fenster/Anwendungen (letzte {days} Tage):")
         print("-" * 80)
-        for (app, title), secs in items:
-            mins = secs / 60.0
-            hours = secs / 3600.0
-            print(f"{hours:5.2f} h  | {mins:6.1f} min  | {app or '???'}  | {title or ''}")
+        for item in items:
+            mins = item.seconds / 60.0
+            hours = item.seconds / 3600.0
+            print(f"{hours:5.2f} h  | {mins:6.1f} min  | {item.app or '???'}  | {item.title or ''}")
     finally:
         db.close()
 
@@ -70,36 +41,17 @@ def summarize_daily_usage(days: int = 7):
         end = datetime.now(timezone.utc)
         start = end - timedelta(days=days)
 
-        q = (
-            db.query(Event)
-            .filter(Event.source == "window")
-            .filter(Event.timestamp >= start)
-            .filter(Event.timestamp <= end)
-            .order_by(Event.timestamp.asc())
-        )
-        rows = q.all()
-        if not rows:
+        # Pro Tag: earliest vs latest (MIN/MAX rechnet SQLite)
+        spans = durations.daily_spans(db, start, end)
+        if not spans:
             print("Keine window-Events im Zeitraum gefunden.")
             return
 
-        # Pro Tag: earliest vs latest
-        by_date = {}
-        for row in rows:
-            d = row.timestamp.astimezone(timezone.utc).date()
-            if d not in by_date:
-                by_date[d] = [row.timestamp, row.timestamp]
-            else:
-                if row.timestamp < by_date[d][0]:
-                    by_date[d][0] = row.timestamp
-                if row.timestamp > by_date[d][1]:
-                    by_date[d][1] = row.timestamp
-
         print(f"Aktive Fensterzeiten (Fensterwechsel) pro Tag, letzte {days} Tage:")
         print("-" * 80)
-        for d in sorted(by_date.keys()):
-            start_ts, end_ts = by_date[d]
-            span_hours = (end_ts - start_ts).total_seconds() / 3600.0
-            print(f"{d} : ~{span_hours:5.2f} h zwischen erstem und letztem Fensterwechsel")
+        for span in spans:
+            span_hours = span.span_seconds / 3600.0
+            print(f"{span.day} : ~{span_hours:5.2f} h zwischen erstem und letztem Fensterwechsel")
     finally:
         db.close()
 
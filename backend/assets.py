@@ -0,0 +1,127 @@
+# backend/assets.py
+"""
+Dashboard-Assets: einmal aufbereitet, dann aus dem Speicher ausgeliefert.
+
+templates/index.html bindet CSS und JS aus static/ ein. Beim Laden wird für
+jede Datei aus static/ ein Name mit Inhalts-Hash gebildet
+(dashboard.css → dashboard.3f2a9c1b7e44.css), die Verweise in index.html
+werden darauf umgeschrieben und alles wird vorab mit gzip (und brotli, falls
+installiert) komprimiert.
+
+- /assets/<name mit Hash>: ändert sich nie → immutable, ein Jahr cachebar
+- /: gleiche URL, neuer Inhalt möglich → no-cache, Revalidierung per ETag (304)
+
+Ändert sich eine Quelldatei (Entwicklung), wird beim nächsten Aufruf der
+Startseite neu aufbereitet – geprüft werden nur die mtimes.
+"""
+import gzip
+import hashlib
+import mimetypes
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional: dann nur gzip
+    brotli = None
+
+BASE_DIR = Path(__file__).resolve().parent
+INDEX_PATH = BASE_DIR / "templates" / "index.html"
+STATIC_DIR = BASE_DIR / "static"
+STATIC_PREFIX = "/static/"
+ASSET_PREFIX = "/assets/"
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+@dataclass
+class Asset:
+    content_type: str
+    raw: bytes
+    gzip: bytes
+    br: Optional[bytes]
+    etag: str
+
+    @classmethod
+    def build(cls, content_type: str, raw: bytes) -> "Asset":
+        return cls(
+            content_type=content_type,
+            raw=raw,
+            gzip=gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0),
+            br=brotli.compress(raw, quality=BROTLI_QUALITY) if brotli is not None else None,
+            etag=f'"{hashlib.sha256(raw).hexdigest()[:16]}"',
+        )
+
+    def encoded(self, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+        """(Body, Content-Encoding) passend zum Accept-Encoding des Clients."""
+        accepted = {part.split(";")[0].strip() for part in accept_encoding.lower().split(",")}
+        if self.br is not None and "br" in accepted:
+            return self.br, "br"
+        if "gzip" in accepted:
+            return self.gzip, "gzip"
+        return self.raw, None
+
+
+def _content_type(path: Path) -> str:
+    content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type == "application/javascript":
+        content_type += "; charset=utf-8"
+    return content_type
+
+
+def hashed_name(path: Path, raw: bytes) -> str:
+    digest = hashlib.sha256(raw).hexdigest()[:12]
+    return f"{path.stem}.{digest}{path.suffix}"
+
+
+class AssetBundle:
+    def __init__(self, index_path: Path = INDEX_PATH, static_dir: Path = STATIC_DIR):
+        self.index_path = index_path
+        self.static_dir = static_dir
+        self._lock = threading.Lock()
+        self._mtimes: Dict[Path, int] = {}
+        self.index: Optional[Asset] = None
+        self.assets: Dict[str, Asset] = {}
+
+    def _sources(self):
+        return [self.index_path] + sorted(p for p in self.static_dir.iterdir() if p.is_file())
+
+    def load(self):
+        sources = self._sources()
+        mtimes = {p: p.stat().st_mtime_ns for p in sources}
+
+        assets: Dict[str, Asset] = {}
+        html = self.index_path.read_text(encoding="utf-8")
+        for path in sources[1:]:
+            raw = path.read_bytes()
+            name = hashed_name(path, raw)
+            assets[name] = Asset.build(_content_type(path), raw)
+            html = html.replace(f"{STATIC_PREFIX}{path.name}", f"{ASSET_PREFIX}{name}")
+
+        index = Asset.build("text/html; charset=utf-8", html.encode("utf-8"))
+        with self._lock:
+            # alte Namen bleiben gültig: offene Tabs laden sonst nach einem Reload kein CSS/JS mehr
+            self.assets = {**self.assets, **assets}
+            self.index = index
+            self._mtimes = mtimes
+
+    def refresh_if_changed(self):
+        try:
+            changed = any(p.stat().st_mtime_ns != m for p, m in self._mtimes.items())
+            changed = changed or len(self._sources()) != len(self._mtimes)
+        except OSError:
+            changed = True
+        if changed or self.index is None:
+            self.load()
+
+    def get(self, name: str) -> Optional[Asset]:
+        return self.assets.get(name)
+
+
+bundle = AssetBundle()
@@ -0,0 +1,103 @@
+# backend/browser_dedup.py
+"""
+Serverseitige Drosselung für Browser-DOM-Events (POST /browser-events/batch).
+
+content.js meldet jeden Klick und jede Eingabe. Auf formularlastigen Seiten
+entstehen so viele identische oder fast identische Events:
+
+- Doppelte: gleiche Seite, gleiches Element, gleicher value_preview innerhalb
+  von DEDUP_WINDOW_SECONDS → nur das erste wird gespeichert. Das gilt auch
+  über Batch-Grenzen hinweg (LRU der zuletzt gesehenen Schlüssel).
+- Tippen: aufeinanderfolgende input-Events auf dasselbe Element innerhalb des
+  Fensters (value_preview wächst Zeichen für Zeichen) → nur das letzte.
+
+Die URL steht für den Tab – content.js schickt keine Tab-ID mit.
+
+filter() merkt sich die Schlüssel sofort, damit parallele Batches sich
+nicht gegenseitig durchlassen. Scheitert das Speichern, nimmt forget() sie
+wieder heraus – sonst würde der Wiederholungsversuch des Clients verworfen.
+"""
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from backend.schemas import BrowserEventCreate
+
+DEDUP_WINDOW_SECONDS = 2.0
+DEDUP_MAX_KEYS = 10_000
+COALESCE_EVENT_TYPES = {"input"}
+
+
+def _ts(event: BrowserEventCreate) -> float:
+    ts = event.timestamp
+    if ts is None:
+        return datetime.now(timezone.utc).timestamp()
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+def _element(event: BrowserEventCreate) -> tuple:
+    return (event.url, event.element_tag, event.element_type, event.element_id, event.element_name,
+            event.element_label)
+
+
+class BrowserEventDeduper:
+    def __init__(self, window_seconds: float = DEDUP_WINDOW_SECONDS, max_keys: int = DEDUP_MAX_KEYS):
+        self.window = window_seconds
+        self.max_keys = max_keys
+        self._seen: "OrderedDict[tuple, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _coalesce_typing(self, events: List[BrowserEventCreate]) -> List[BrowserEventCreate]:
+        out: List[BrowserEventCreate] = []
+        for event in events:
+            prev: Optional[BrowserEventCreate] = out[-1] if out else None
+            if (
+                prev is not None
+                and event.event_type in COALESCE_EVENT_TYPES
+                and prev.event_type == event.event_type
+                and _element(prev) == _element(event)
+                and 0 <= _ts(event) - _ts(prev) <= self.window
+            ):
+                out[-1] = event
+            else:
+                out.append(event)
+        return out
+
+    @staticmethod
+    def _key(event: BrowserEventCreate) -> tuple:
+        return (event.event_type, _element(event), event.value_preview)
+
+    def filter(self, events: List[BrowserEventCreate]) -> Tuple[List[BrowserEventCreate], int]:
+        """Liefert (zu speichernde Events, Anzahl verworfener)."""
+        events = sorted(events, key=_ts)
+        coalesced = self._coalesce_typing(events)
+
+        kept: List[BrowserEventCreate] = []
+        with self._lock:
+            for event in coalesced:
+                key = self._key(event)
+                ts = _ts(event)
+                last = self._seen.get(key)
+                if last is not None and 0 <= ts - last <= self.window:
+                    continue
+                self._seen[key] = ts
+                self._seen.move_to_end(key)
+                if len(self._seen) > self.max_keys:
+                    self._seen.popitem(last=False)
+                kept.append(event)
+        return kept, len(events) - len(kept)
+
+    def forget(self, events: List[BrowserEventCreate]):
+        """Macht filter() für nicht gespeicherte Events rückgängig."""
+        with self._lock:
+            for event in events:
+                key = self._key(event)
+                # nur den eigenen Eintrag entfernen, nicht den eines neueren Batches
+                if self._seen.get(key) == _ts(event):
+                    del self._seen[key]
+
+
+browser_deduper = BrowserEventDeduper()
@@ -0,0 +1,62 @@
+# backend/collector_telemetry.py
+"""
+Letzte Telemetrie-Berichte der Collectoren (nur im Speicher).
+
+Pro Collector wird der neueste Bericht plus ein kurzer Verlauf gehalten –
+nach einem Backend-Neustart sind die Daten nach einem Intervall wieder da.
+"""
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, List
+
+from backend.schemas import CollectorTelemetryIn, CollectorTelemetryOut
+
+HISTORY_LEN = 120  # Berichte je Collector (bei 30 s ≈ 1 h)
+
+
+class TelemetryStore:
+    def __init__(self, history_len: int = HISTORY_LEN):
+        self._lock = threading.Lock()
+        self._latest: Dict[str, tuple] = {}
+        self._history: Dict[str, Deque[tuple]] = {}
+        self.history_len = history_len
+
+    def add(self, report: CollectorTelemetryIn):
+        entry = (datetime.now(timezone.utc), report)
+        with self._lock:
+            self._latest[report.collector] = entry
+            self._history.setdefault(report.collector, deque(maxlen=self.history_len)).append(entry)
+
+    @staticmethod
+    def _out(entry: tuple, now: datetime) -> CollectorTelemetryOut:
+        received_at, report = entry
+        age = (now - received_at).total_seconds()
+        interval = max(report.interval_seconds, 1.0)
+        if age <= interval * 2:
+            status = "ok"
+        elif age <= interval * 5:
+            status = "warn"
+        else:
+            status = "offline"
+        return CollectorTelemetryOut(
+            **report.model_dump(),
+            received_at=received_at,
+            seconds_since_report=age,
+            status=status,
+        )
+
+    def latest(self) -> List[CollectorTelemetryOut]:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            entries = sorted(self._latest.items())
+        return [self._out(entry, now) for _, entry in entries]
+
+    def history(self, collector: str) -> List[CollectorTelemetryOut]:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            entries = list(self._history.get(collector, ()))
+        return [self._out(entry, now) for entry in entries]
+
+
+telemetry_store = TelemetryStore()
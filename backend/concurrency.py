@@ -0,0 +1,45 @@
+# backend/concurrency.py
+"""
+Explizites Auslagern schwerer, synchroner Arbeit aus dem Event-Loop.
+
+- Sync-Endpunkte (z.B. Export, Thumbnails) laufen in Starlettes Threadpool,
+  dessen Größe über TRACKER_THREADPOOL_TOKENS gesetzt wird.
+- Analysen laufen über run_analysis()/run_in_db_thread() in einem eigenen,
+  kleineren Kontingent (TRACKER_ANALYSIS_THREADS), damit sie Ingest und
+  einfache Lese-Endpunkte nicht verdrängen.
+"""
+import os
+from functools import partial
+from typing import Any, Callable
+
+import anyio
+from anyio.to_thread import run_sync
+
+from backend.db import SessionLocal
+
+THREADPOOL_TOKENS = int(os.environ.get("TRACKER_THREADPOOL_TOKENS", "40"))
+ANALYSIS_THREADS = int(os.environ.get("TRACKER_ANALYSIS_THREADS", "4"))
+
+analysis_limiter = anyio.CapacityLimiter(ANALYSIS_THREADS)
+
+
+def configure_threadpool():
+    """Beim Startup (im Event-Loop) aufrufen."""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_TOKENS
+
+
+async def run_analysis(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Führt func(*args) in einem Analyse-Thread aus."""
+    return await run_sync(partial(func, *args, **kwargs), limiter=analysis_limiter)
+
+
+async def run_in_db_thread(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Wie run_analysis, aber func bekommt eine eigene (sync) Session als erstes Argument."""
+    def call():
+        db = SessionLocal()
+        try:
+            return func(db, *args, **kwargs)
+        finally:
+            db.close()
+
+    return await run_sync(call, limiter=analysis_limiter)
@@ -0,0 +1,233 @@
+# backend/day_cache.py
+"""
+Vorberechnete Tages-Timelines für abgeschlossene UTC-Tage.
+
+Ein vergangener Tag ändert sich nicht mehr – Fensterwechsel, Input-Zählung
+und Dokument-Events müssen also nicht bei jedem Aufruf neu gerechnet werden.
+Pro Tag liegt in DAY_DIR eine gzip-komprimierte JSON-Datei. DAY_DIR gehört
+zur Datenbank (neben DB_PATH, z.B. tracker-days/ zu tracker.db), damit eine
+andere Datenbank – Benchmarks, Tests – nie die Dateien der echten sieht;
+TRACKER_DAY_DIR überschreibt das.
+
+- windows:   Tabelle der (app, title)-Paare, Spans verweisen per Index darauf
+- spans:     [Start, Dauer, Index] in Sekunden ab Mitternacht, aufeinander-
+             folgende Wechsel auf dasselbe Fenster zusammengefasst (RLE)
+- input:     Input-Events pro Minute (1440 Werte) und Summen je Typ
+- documents: [Sekunde, Typ, Name, Pfad]
+
+Die Datei wird beim ersten Abruf bzw. vom Hintergrund-Thread nach
+Tageswechsel gebaut und danach unverändert (gzip inklusive) ausgeliefert.
+Treffen späte Events für einen abgeschlossenen Tag ein, wird seine Datei
+verworfen und beim nächsten Abruf neu gebaut.
+"""
+import gzip
+import json
+import os
+import threading
+import time as _time
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.orm import Session
+
+from backend import durations
+from backend.db import DB_PATH, SessionLocal
+
+DAY_DIR = Path(os.environ.get("TRACKER_DAY_DIR") or Path(DB_PATH).resolve().with_name(f"{Path(DB_PATH).stem}-days"))
+FORMAT_VERSION = 1
+BACKFILL_DAYS = 7  # so viele abgeschlossene Tage baut der Hintergrund-Thread vor
+
+_EPOCH = durations.EPOCH_SQL.format(col="timestamp")
+
+# Fenster ab dem letzten Wechsel vor Mitternacht – es ist um 00:00 bereits im Fokus
+_WINDOW_SQL = text(f"""
+    SELECT {_EPOCH} AS t,
+           json_extract(payload, '$.app') AS app,
+           json_extract(payload, '$.title') AS title
+    FROM events
+    WHERE source = 'window'
+      AND timestamp >= COALESCE(
+            (SELECT MAX(timestamp) FROM events WHERE source = 'window' AND timestamp < :start), :start)
+      AND timestamp < :end
+    ORDER BY timestamp, id
+""").bindparams(bindparam("start", type_=DateTime), bindparam("end", type_=DateTime))
+
+# Minute direkt aus 'YYYY-MM-DD HH:MM:...' – ohne Datumsfunktion pro Zeile
+_INPUT_SQL = text("""
+    SELECT CAST(substr(timestamp, 12, 2) AS INTEGER) * 60 + CAST(substr(timestamp, 15, 2) AS INTEGER) AS minute,
+           type,
+           COUNT(*) AS n
+    FROM events
+    WHERE source = 'input' AND timestamp >= :start AND timestamp < :end
+    GROUP BY minute, type
+""").bindparams(bindparam("start", type_=DateTime), bindparam("end", type_=DateTime))
+
+_DOCUMENT_SQL = text(f"""
+    SELECT {_EPOCH} AS t, type,
+           json_extract(payload, '$.name') AS name,
+           json_extract(payload, '$.path') AS path
+    FROM events
+    WHERE source = 'document' AND timestamp >= :start AND timestamp < :end
+    ORDER BY timestamp, id
+""").bindparams(bindparam("start", type_=DateTime), bindparam("end", type_=DateTime))
+
+# Generation je Tag: invalidate() erhöht sie, ein Build schreibt nur, wenn sie sich
+# währenddessen nicht geändert hat (sonst fehlen ihm die späten Events)
+_lock = threading.Lock()
+_generation: dict = {}
+
+
+def _utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def day_bounds(day: date) -> Tuple[datetime, datetime]:
+    start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def is_closed(day: date) -> bool:
+    return day_bounds(day)[1] <= datetime.now(timezone.utc)
+
+
+def day_path(day: date) -> Path:
+    return DAY_DIR / f"{day.isoformat()}.json.gz"
+
+
+# =========================
+# Bauen
+# =========================
+
+def build_timeline(db: Session, day: date) -> dict:
+    start, end = day_bounds(day)
+    t0, t1 = start.timestamp(), end.timestamp()
+    params = {"start": start.replace(tzinfo=None), "end": end.replace(tzinfo=None)}
+
+    rows = db.execute(_WINDOW_SQL, params).all()
+    until = durations.span_end(db, end).timestamp() if rows else t1
+
+    windows, index = [], {}
+    spans = []
+    for i, (t, app, title) in enumerate(rows):
+        begin = max(t, t0)
+        finish = min(rows[i + 1][0] if i + 1 < len(rows) else until, t1)
+        if finish <= begin:
+            continue
+        key = (app, title)
+        if key not in index:
+            index[key] = len(windows)
+            windows.append([app, title])
+        idx = index[key]
+        offset = begin - t0
+        if spans and spans[-1][2] == idx and abs(spans[-1][0] + spans[-1][1] - offset) < 1e-6:
+            spans[-1][1] += finish - begin
+        else:
+            spans.append([offset, finish - begin, idx])
+
+    per_minute = [0] * 1440
+    by_type = {}
+    for minute, event_type, n in db.execute(_INPUT_SQL, params):
+        per_minute[minute] += n
+        by_type[event_type] = by_type.get(event_type, 0) + n
+
+    documents = [
+        [round(t - t0, 3), event_type, name, path]
+        for t, event_type, name, path in db.execute(_DOCUMENT_SQL, params)
+    ]
+
+    return {
+        "version": FORMAT_VERSION,
+        "day": day.isoformat(),
+        "closed": is_closed(day),
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "windows": windows,
+        "spans": [[round(a, 3), round(d, 3), i] for a, d, i in spans],
+        "input": {"per_minute": per_minute, "by_type": by_type, "total": sum(per_minute)},
+        "documents": documents,
+    }
+
+
+def encode(timeline: dict) -> bytes:
+    raw = json.dumps(timeline, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    # mtime=0: gleicher Inhalt → gleiche Bytes
+    return gzip.compress(raw, compresslevel=9, mtime=0)
+
+
+def get_day(db: Session, day: date) -> Tuple[bytes, bool]:
+    """
+    gzip-komprimierte Timeline eines Tages und ob sie endgültig ist.
+    Abgeschlossene Tage kommen aus DAY_DIR (bzw. werden dort abgelegt),
+    der laufende Tag wird jedes Mal frisch gebaut.
+    """
+    path = day_path(day)
+    if is_closed(day):
+        try:
+            return path.read_bytes(), True
+        except FileNotFoundError:
+            pass
+
+    with _lock:
+        generation = _generation.get(day, 0)
+    data = encode(build_timeline(db, day))
+    if not is_closed(day):
+        return data, False
+
+    with _lock:
+        if _generation.get(day, 0) == generation:
+            DAY_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)
+    return data, True
+
+
+# =========================
+# Späte Events
+# =========================
+
+def invalidate(days: Iterable[date]):
+    with _lock:
+        for day in days:
+            _generation[day] = _generation.get(day, 0) + 1
+            day_path(day).unlink(missing_ok=True)
+
+
+def note_events(timestamps: Iterable[Optional[datetime]]):
+    """Nach dem Ingest: Dateien abgeschlossener Tage verwerfen, für die Events nachkamen."""
+    today = datetime.now(timezone.utc).date()
+    late = {_utc(ts).date() for ts in timestamps if ts is not None}
+    late = {day for day in late if day < today}
+    if late:
+        invalidate(late)
+
+
+# =========================
+# Hintergrund-Thread
+# =========================
+
+def start_day_worker():
+    """Baut nach jedem Tageswechsel die fehlenden Dateien der letzten BACKFILL_DAYS Tage."""
+    def loop():
+        while True:
+            today = datetime.now(timezone.utc).date()
+            db = SessionLocal()
+            try:
+                for n in range(BACKFILL_DAYS, 0, -1):
+                    day = today - timedelta(days=n)
+                    if not day_path(day).exists():
+                        get_day(db, day)
+            except Exception as e:
+                db.rollback()
+                print(f"[ERROR] Tages-Timeline konnte nicht gebaut werden: {e}")
+            finally:
+                db.close()
+
+            # kurz nach der nächsten UTC-Mitternacht wieder
+            next_run = day_bounds(today)[1] + timedelta(minutes=1)
+            _time.sleep(max(60.0, (next_run - datetime.now(timezone.utc)).total_seconds()))
+
+    threading.Thread(target=loop, name="day-timeline", daemon=True).start()
@@ -1,26 +1,63 @@
 # backend/db.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import os
+from typing import AsyncGenerator, Generator
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 from .models import Base
 
-DATABASE_URL = "sqlite:///./tracker.db"
+DB_PATH = os.environ.get("TRACKER_DB_PATH", "./tracker.db")
+
+DATABASE_URL = f"sqlite:///{DB_PATH}"
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DB_PATH}"
+
+# Verbindungen im async Pool (Ingest + Lese-Endpunkte)
+DB_POOL_SIZE = int(os.environ.get("TRACKER_DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.environ.get("TRACKER_DB_MAX_OVERFLOW", "20"))
+# Wie lange SQLite auf einen Schreib-Lock wartet, bevor "database is locked" kommt
+DB_BUSY_TIMEOUT_MS = int(os.environ.get("TRACKER_DB_BUSY_TIMEOUT_MS", "5000"))
 
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False}  # nur für SQLite nötig
 )
 
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+)
+
+
+def _sqlite_pragmas(dbapi_conn, _record):
+    # WAL: Leser blockieren Schreiber nicht (wichtig bei parallelem Ingest + Dashboard)
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+    cur.close()
+
+
+event.listen(engine, "connect", _sqlite_pragmas)
+event.listen(async_engine.sync_engine, "connect", _sqlite_pragmas)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
 
 
 def init_db():
     """Einmalig beim Start aufrufen, um die Tabellen zu erstellen."""
     Base.metadata.create_all(bind=engine)
+    # create_all legt Indizes nur mit neuen Tabellen an – später hinzugekommene nachziehen
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 
-def get_db():
+def get_db() -> Generator[Session, None, None]:
     """
-    FastAPI-Dependency für DB-Sessions.
+    FastAPI-Dependency für DB-Sessions (auch über routes.deps importierbar).
 
     Nutzung:
         @app.get("/irgendwas")
@@ -32,3 +69,16 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI-Dependency für async DB-Sessions (aiosqlite).
+
+    Nutzung:
+        @app.get("/irgendwas")
+        async def foo(db: AsyncSession = Depends(get_async_db)):
+            rows = (await db.execute(select(...))).all()
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,158 @@
+# backend/durations.py
+"""
+Dauer-Berechnung direkt in SQLite.
+
+Ein Fenster-Event gilt bis zum nächsten Fenster-Event (das letzte bis `end`).
+Statt alle Events nach Python zu holen und next_ts - this_ts in einer
+Schleife zu rechnen, macht das LEAD() über den Index (source, timestamp);
+nach Python kommt nur das Ergebnis pro (app, title) bzw. pro Tag.
+
+Genutzt von /analysis/top-windows, /analysis/daily-usage und den
+Konsolen-Auswertungen in analysis_local.py.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.orm import Session
+
+# Unix-Zeit mit Mikrosekunden aus 'YYYY-MM-DD HH:MM:SS.ffffff'. Die Datumsfunktionen
+# von SQLite rechnen nur auf ms genau (und runden .9996 auf die nächste Sekunde),
+# deshalb Sekunden und Nachkommastellen getrennt.
+EPOCH_SQL = "(strftime('%s', substr({col}, 1, 19)) + CAST(substr({col}, 20) AS REAL))"
+
+_TOP_SQL = """
+    WITH w AS (
+        SELECT timestamp AS ts,
+               LEAD(timestamp) OVER (ORDER BY timestamp, id) AS next_ts,
+               payload
+        FROM events
+        WHERE source = :source
+          {filters}
+    ),
+    d AS (
+        SELECT payload, {next_epoch} - {epoch} AS seconds
+        FROM w
+    )
+    SELECT json_extract(payload, '$.app') AS app,
+           json_extract(payload, '$.title') AS title,
+           SUM(seconds) AS seconds
+    FROM d
+    WHERE seconds > 0
+    GROUP BY app, title
+    ORDER BY seconds DESC
+    LIMIT :limit
+"""
+
+_DAILY_SQL = """
+    SELECT date(timestamp) AS day,
+           MIN(timestamp) AS first_ts,
+           MAX(timestamp) AS last_ts,
+           COUNT(*) AS switches
+    FROM events
+    WHERE source = :source
+      {filters}
+    GROUP BY day
+    ORDER BY day
+"""
+
+
+@dataclass
+class WindowDuration:
+    app: Optional[str]
+    title: Optional[str]
+    seconds: float
+
+
+@dataclass
+class DailySpan:
+    day: date
+    first_ts: datetime
+    last_ts: datetime
+    switches: int
+
+    @property
+    def span_seconds(self) -> float:
+        return (self.last_ts - self.first_ts).total_seconds()
+
+
+def _naive_utc(ts: datetime) -> datetime:
+    # so liegen die Timestamps in der DB (SQLAlchemy speichert ohne Zeitzone)
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def _range(start: Optional[datetime], end: Optional[datetime], params: dict, exclusive_end: bool = False):
+    filters = []
+    binds = [bindparam("source")]
+    if start is not None:
+        filters.append("AND timestamp >= :start")
+        binds.append(bindparam("start", type_=DateTime))
+        params["start"] = _naive_utc(start)
+    if end is not None:
+        filters.append("AND timestamp < :end" if exclusive_end else "AND timestamp <= :end")
+        binds.append(bindparam("end", type_=DateTime))
+        params["end"] = _naive_utc(end)
+    return "\n          ".join(filters), binds
+
+
+def span_end(db: Session, end: datetime, source: str = "window") -> datetime:
+    """
+    Bis wann das letzte Fenster vor `end` läuft: bis zum ersten Fensterwechsel
+    ab `end`, ohne einen solchen höchstens bis jetzt.
+    """
+    following = db.execute(
+        text("SELECT MIN(timestamp) AS ts FROM events WHERE source = :source AND timestamp >= :end")
+        .bindparams(bindparam("end", type_=DateTime))
+        .columns(ts=DateTime),
+        {"source": source, "end": _naive_utc(end)},
+    ).scalar()
+    if following is not None:
+        return following.replace(tzinfo=timezone.utc)
+    end = end if end.tzinfo else end.replace(tzinfo=timezone.utc)
+    return min(end, datetime.now(timezone.utc))
+
+
+def top_windows(
+    db: Session,
+    start: Optional[datetime],
+    end: Optional[datetime],
+    limit: Optional[int] = 20,
+    source: str = "window",
+    until: Optional[datetime] = None,
+    exclusive_end: bool = False,
+) -> List[WindowDuration]:
+    """
+    Summierte Dauer pro (app, title), absteigend. Das letzte Fenster läuft bis
+    `until` (Standard: `end`, ohne `end` bis jetzt). limit=None: alle.
+    exclusive_end: nur Events vor `end` – für aneinandergrenzende Zeiträume.
+    """
+    params = {"source": source, "limit": -1 if limit is None else limit}
+    filters, binds = _range(start, end, params, exclusive_end)
+    params["until"] = _naive_utc(until or end or datetime.now(timezone.utc))
+    sql = _TOP_SQL.format(
+        filters=filters,
+        epoch=EPOCH_SQL.format(col="ts"),
+        next_epoch=EPOCH_SQL.format(col="COALESCE(next_ts, :until)"),
+    )
+    stmt = text(sql).bindparams(*binds, bindparam("until", type_=DateTime), bindparam("limit"))
+    return [WindowDuration(app, title, seconds) for app, title, seconds in db.execute(stmt, params)]
+
+
+def daily_spans(
+    db: Session,
+    start: Optional[datetime],
+    end: Optional[datetime],
+    source: str = "window",
+) -> List[DailySpan]:
+    """Pro Tag (UTC): erstes und letztes Event sowie Anzahl Fensterwechsel."""
+    params = {"source": source}
+    filters, binds = _range(start, end, params)
+    stmt = text(_DAILY_SQL.format(filters=filters)).bindparams(*binds)
+    stmt = stmt.columns(first_ts=DateTime, last_ts=DateTime)
+    return [
+        DailySpan(date.fromisoformat(day), first_ts, last_ts, switches)
+        for day, first_ts, last_ts, switches in db.execute(stmt, params)
+    ]
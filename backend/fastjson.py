@@ -0,0 +1,54 @@
+# backend/fastjson.py
+"""
+Schneller JSON-Pfad für Listen-Endpunkte.
+
+Statt ORM-Objekte zu laden, pro Zeile ein Pydantic-Modell zu bauen und die
+Liste von FastAPI erneut validieren zu lassen, werden Spalten-Tupel direkt
+serialisiert. Nutzt orjson, falls installiert – sonst Standard-json mit
+identischer Ausgabe.
+"""
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, List, Sequence
+
+from fastapi.responses import Response
+
+from backend.models import Event
+
+try:
+    import orjson
+except ImportError:  # optional, nur schneller
+    orjson = None
+
+
+# Spalten in der Reihenfolge, die event_dicts() erwartet
+EVENT_COLUMNS = (Event.id, Event.timestamp, Event.source, Event.type, Event.payload)
+
+
+def _default(obj: Any):
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSONResponse-Ersatz ohne jsonable_encoder/Validierung."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def event_dicts(rows: Iterable[Sequence[Any]]) -> List[dict]:
+    """(id, timestamp, source, type, payload)-Tupel → EventOut-kompatible dicts."""
+    return [
+        {"timestamp": ts, "source": source, "type": type_, "payload": payload, "id": id_}
+        for id_, ts, source, type_, payload in rows
+    ]
@@ -1,16 +1,30 @@
 # backend/main.py
-from fastapi import FastAPI, Depends
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from pydantic import BaseModel
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
 from typing import List, Optional, Dict, Any
 
+from sqlalchemy import insert, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from .db import SessionLocal, init_db
-from .models import Event as EventModel, Setting as SettingModel
-from pathlib import Path
+from .db import async_engine, engine, get_async_db, init_db
+from .models import Event as EventModel
+from . import active_time, assets, day_cache, durations, metrics, retention, search, settings_store, sketches, url_index
+from .analysis_executor import AnalysisBusy, analyze_windows
+from .concurrency import configure_threadpool, run_analysis, run_in_db_thread
+from .fastjson import EVENT_COLUMNS, FastJSONResponse, event_dicts
+from .settings_store import SettingsIn, SettingsOut, get_settings, save_settings
 from routes import export as export_routes
 from routes import browser_events
+from routes import screenshots as screenshot_routes
+from routes import metrics as metrics_routes
+from routes import collectors as collector_routes
+from routes import search as search_routes
+from routes import domains as domain_routes
+from routes import series as series_routes
+from routes import days as day_routes
 
 from backend.db import get_db
 from backend import models
@@ -22,13 +36,21 @@ from backend.models import Event as EventModel, BrowserEvent
 from fastapi import Query
 
 app = FastAPI(title="Local Activity Tracker")
-BASE_DIR = Path(__file__).resolve().parent
-INDEX_PATH = BASE_DIR / "templates" / "index.html"
 
-DEFAULT_RETENTION_DAYS = 7
 
 app.include_router(export_routes.router)
 app.include_router(browser_events.router)
+app.include_router(screenshot_routes.router)
+app.include_router(metrics_routes.router)
+app.include_router(collector_routes.router)
+app.include_router(search_routes.router)
+app.include_router(domain_routes.router)
+app.include_router(series_routes.router)
+app.include_router(day_routes.router)
+
+app.add_middleware(metrics.MetricsMiddleware)
+metrics.instrument_engine(engine)
+metrics.instrument_engine(async_engine.sync_engine)
 
 
 # =========================
@@ -46,12 +68,37 @@ class EventOut(EventIn):
     id: int
 
 
+class EventBatchIn(BaseModel):
+    events: List[EventIn]
+
+
 class TopWindowOut(BaseModel):
     app: Optional[str]
     title: Optional[str]
     total_seconds: float
     total_minutes: float
     total_hours: float
+    # nur mit idle_threshold: total_* ist dann die aktive Zeit
+    idle_seconds: Optional[float] = None
+    # nur mit approx: wahrer Wert liegt in [total_seconds - error_seconds, total_seconds].
+    # Die Schranke deckt den Sketch-Fehler der ganzen Tage ab; angeschnittene
+    # Randtage werden exakt aus den Events gerechnet.
+    error_seconds: Optional[float] = None
+
+
+class DailyUsageOut(BaseModel):
+    day: date
+    first_event: datetime
+    last_event: datetime
+    span_hours: float
+    window_switches: int
+
+
+class DistinctCountsOut(BaseModel):
+    days: int
+    windows: int
+    urls: int
+    relative_error: float
 
 
 class RoutineOut(BaseModel):
@@ -73,26 +120,10 @@ class AutomationCandidateOut(BaseModel):
     potential_savings_per_year: float
 
 
-class SettingsIn(BaseModel):
-    screenshot_retention_days: int = DEFAULT_RETENTION_DAYS
-
-
-class SettingsOut(SettingsIn):
-    pass
-
-
 # =========================
 # DB-Dependency & Helper
 # =========================
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 def _to_utc(dt: datetime) -> datetime:
     """Sorgt dafür, dass alle Datumswerte als UTC-aware vorliegen."""
     if dt.tzinfo is None:
@@ -100,49 +131,66 @@ def _to_utc(dt: datetime) -> datetime:
     return dt.astimezone(timezone.utc)
 
 
-def get_settings(db: Session) -> SettingsOut:
-    row = db.query(SettingModel).filter(SettingModel.key == "screenshot_retention_days").first()
-    if row is None:
-        return SettingsOut(screenshot_retention_days=DEFAULT_RETENTION_DAYS)
-    try:
-        days = int(row.value)
-    except ValueError:
-        days = DEFAULT_RETENTION_DAYS
-    if days < 1:
-        days = 1
-    return SettingsOut(screenshot_retention_days=days)
-
-
-def save_settings(db: Session, settings: SettingsIn) -> SettingsOut:
-    days = settings.screenshot_retention_days
-    if days < 1:
-        days = 1
-    s = db.query(SettingModel).filter(SettingModel.key == "screenshot_retention_days").first()
-    if s is None:
-        s = SettingModel(key="screenshot_retention_days", value=str(days))
-        db.add(s)
-    else:
-        s.value = str(days)
-    db.commit()
-    return SettingsOut(screenshot_retention_days=days)
-
-
 # =========================
 # Startup
 # =========================
 
 @app.on_event("startup")
-def startup():
+async def startup():
+    configure_threadpool()
+    assets.bundle.load()
     init_db()
+    search.init_search()
+    retention.start_retention_worker(get_settings)
+    # neue Aufbewahrung / neues Budget sofort anwenden, nicht erst im nächsten Intervall
+    settings_store.store.subscribe(lambda settings: retention.wake())
+    search.start_backfill()
+    url_index.start_backfill()
+    day_cache.start_day_worker()
+
+
+@app.exception_handler(OperationalError)
+async def sqlite_operational_error(request: Request, exc: OperationalError):
+    # Schreib-Lock länger als busy_timeout belegt → Client soll mit Backoff erneut senden
+    if "database is locked" in str(exc.orig):
+        return JSONResponse({"detail": "database is locked"}, status_code=503, headers={"Retry-After": "1"})
+    raise exc
+
+
+@app.get("/healthz")
+async def healthz(db: AsyncSession = Depends(get_async_db)):
+    """Readiness: Startup abgeschlossen und DB erreichbar (start_all.py --supervise wartet darauf)."""
+    await db.execute(text("SELECT 1"))
+    return {"status": "ok"}
 
 
 # =========================
 # Root: Dashboard-HTML
 # =========================
 
+def _asset_response(request: Request, asset: "assets.Asset", cache_control: str) -> Response:
+    headers = {"Cache-Control": cache_control, "ETag": asset.etag, "Vary": "Accept-Encoding"}
+    if request.headers.get("if-none-match") == asset.etag:
+        return Response(status_code=304, headers=headers)
+    body, encoding = asset.encoded(request.headers.get("accept-encoding", ""))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=asset.content_type, headers=headers)
+
+
 @app.get("/", response_class=HTMLResponse)
-def index():
-    return HTMLResponse(INDEX_PATH.read_text(encoding="utf-8"))
+def index(request: Request):
+    assets.bundle.refresh_if_changed()
+    return _asset_response(request, assets.bundle.index, assets.REVALIDATE_CACHE)
+
+
+@app.get("/assets/{name}", include_in_schema=False)
+def static_asset(name: str, request: Request):
+    """CSS/JS des Dashboards unter Namen mit Inhalts-Hash (siehe backend/assets.py)."""
+    asset = assets.bundle.get(name)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Asset nicht gefunden.")
+    return _asset_response(request, asset, assets.IMMUTABLE_CACHE)
 
 
 # =========================
@@ -159,12 +207,26 @@ def api_set_settings(settings: SettingsIn, db: Session = Depends(get_db)):
     return save_settings(db, settings)
 
 
+@app.get("/settings/watch", response_model=SettingsOut)
+async def api_watch_settings(
+    version: int = Query(-1, description="Zuletzt bekannte Version des Clients"),
+    timeout: float = Query(25.0, ge=0, le=60, description="Max. Wartezeit in Sekunden"),
+):
+    """
+    Long-Poll: antwortet sofort, wenn `version` nicht aktuell ist, sonst bei der
+    nächsten Änderung oder nach `timeout` mit dem unveränderten Stand.
+    Der Client fragt danach mit der gelieferten Version erneut an.
+    """
+    current = await run_in_db_thread(get_settings)
+    return await settings_store.store.wait_for_change(current, version, timeout)
+
+
 # =========================
 # Event-API
 # =========================
 
 @app.post("/events", response_model=EventOut)
-def create_event(event: EventIn, db: Session = Depends(get_db)):
+async def create_event(event: EventIn, db: AsyncSession = Depends(get_async_db)):
     db_event = EventModel(
         timestamp=event.timestamp,
         source=event.source,
@@ -172,8 +234,14 @@ def create_event(event: EventIn, db: Session = Depends(get_db)):
         payload=event.payload,
     )
     db.add(db_event)
-    db.commit()
-    db.refresh(db_event)
+    await db.flush()
+    retention.index_screenshot_events(db, [db_event])
+    await db.run_sync(search.index_events, [db_event])
+    await db.run_sync(url_index.index_events, [db_event])
+    await db.run_sync(sketches.invalidate_days, [db_event.timestamp])
+    await db.commit()
+    day_cache.note_events([db_event.timestamp])
+    metrics.count_ingest(1)
     return EventOut(
         id=db_event.id,
         timestamp=db_event.timestamp,
@@ -184,48 +252,36 @@ def create_event(event: EventIn, db: Session = Depends(get_db)):
 
 
 @app.post("/events/batch")
-def create_events_batch(data: Dict[str, Any], db: Session = Depends(get_db)):
-    events = data.get("events", [])
-    created = 0
-
-    for e in events:
-        ts = e["timestamp"]
-        if isinstance(ts, str):
-            ts = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-
-        db_event = EventModel(
-            timestamp=ts,
-            source=e["source"],
-            type=e["type"],
-            payload=e["payload"],
-        )
-        db.add(db_event)
-        created += 1
-
-    db.commit()
-    return {"inserted": created}
+async def create_events_batch(batch: EventBatchIn, db: AsyncSession = Depends(get_async_db)):
+    """Mehrere Events in einem INSERT (executemany mit RETURNING für die Index-Hooks)."""
+    if not batch.events:
+        return {"inserted": 0}
+    db_events = (await db.scalars(
+        insert(EventModel).returning(EventModel),
+        [event.model_dump() for event in batch.events],
+    )).all()
+    retention.index_screenshot_events(db, db_events)
+    await db.run_sync(search.index_events, db_events)
+    await db.run_sync(url_index.index_events, db_events)
+    await db.run_sync(sketches.invalidate_days, [e.timestamp for e in db_events])
+    await db.commit()
+    day_cache.note_events(e.timestamp for e in db_events)
+    metrics.count_ingest(len(db_events))
+    return {"inserted": len(db_events)}
 
 
 @app.get("/events", response_model=List[EventOut])
-def list_events(
+async def list_events(
     source: Optional[str] = None,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    q = db.query(EventModel).order_by(EventModel.timestamp.desc())
+    q = select(*EVENT_COLUMNS).order_by(EventModel.timestamp.desc())
     if source:
-        q = q.filter(EventModel.source == source)
-    rows = q.limit(limit).all()
-    return [
-        EventOut(
-            id=r.id,
-            timestamp=r.timestamp,
-            source=r.source,
-            type=r.type,
-            payload=r.payload,
-        )
-        for r in rows
-    ]
+        q = q.where(EventModel.source == source)
+    rows = (await db.execute(q.limit(limit))).all()
+    # Spalten-Tupel direkt serialisieren (Schema wie EventOut, ohne Validierung)
+    return FastJSONResponse(event_dicts(rows))
 
 
 # =========================
@@ -233,103 +289,169 @@ def list_events(
 # =========================
 
 @app.get("/analysis/timeline", response_model=List[EventOut])
-def analysis_timeline(
+async def analysis_timeline(
     start: Optional[datetime] = None,
     end: Optional[datetime] = None,
     source: Optional[str] = None,
     limit: int = 500,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Liefert Events, standardmäßig mit den NEUESTEN zuerst (desc).
     Wird für Timeline, Input- und Dokument-Anzeige genutzt.
     """
-    q = db.query(EventModel)
+    q = select(*EVENT_COLUMNS)
 
     if start:
-        q = q.filter(EventModel.timestamp >= start)
+        q = q.where(EventModel.timestamp >= start)
     if end:
-        q = q.filter(EventModel.timestamp <= end)
+        q = q.where(EventModel.timestamp <= end)
     if source:
-        q = q.filter(EventModel.source == source)
+        q = q.where(EventModel.source == source)
 
     # Wichtig: neueste zuerst
-    rows = q.order_by(EventModel.timestamp.desc()).limit(limit).all()
+    rows = (await db.execute(q.order_by(EventModel.timestamp.desc()).limit(limit))).all()
 
-    return [
-        EventOut(
-            id=r.id,
-            timestamp=r.timestamp,
-            source=r.source,
-            type=r.type,
-            payload=r.payload,
-        )
-        for r in rows
-    ]
+    return FastJSONResponse(event_dicts(rows))
+
+
+IDLE_THRESHOLD_QUERY = Query(
+    None, gt=0, description="Sekunden ohne Input, ab denen ein Fenster nicht mehr als aktiv zählt"
+)
 
 
 @app.get("/analysis/top-windows", response_model=List[TopWindowOut])
-def analysis_top_windows(
+async def analysis_top_windows(
     start: Optional[datetime] = None,
     end: Optional[datetime] = None,
     limit: int = 20,
-    db: Session = Depends(get_db),
+    idle_threshold: Optional[float] = IDLE_THRESHOLD_QUERY,
+    approx: bool = Query(
+        False, description="Näherung aus Tages-Sketches (angeschnittene Randtage exakt), für lange Zeiträume"
+    ),
 ):
-    q = db.query(EventModel).filter(EventModel.source == "window")
+    if approx:
+        if idle_threshold is not None:
+            raise HTTPException(status_code=422, detail="approx und idle_threshold lassen sich nicht kombinieren.")
+        return await run_in_db_thread(_top_windows_approx, start, end, limit)
+    if idle_threshold is not None:
+        return await run_in_db_thread(_top_windows_active, start, end, limit, idle_threshold)
+    return await run_in_db_thread(_top_windows, start, end, limit)
+
+
+def _sketch_range(db: Session, start: Optional[datetime], end: Optional[datetime]):
+    end = end or datetime.now(timezone.utc)
+    if start is None:
+        first = db.query(func.min(EventModel.timestamp)).filter(EventModel.source == "window").scalar()
+        start = first or end
+    return start, end
+
+
+def _top_windows_approx(
+    db: Session, start: Optional[datetime], end: Optional[datetime], limit: int
+) -> List[TopWindowOut]:
+    start, end = _sketch_range(db, start, end)
+    return [
+        TopWindowOut(
+            app=row.app,
+            title=row.title,
+            total_seconds=row.seconds,
+            total_minutes=row.seconds / 60.0,
+            total_hours=row.seconds / 3600.0,
+            error_seconds=row.error_seconds,
+        )
+        for row in sketches.approx_top_windows(db, start, end, limit)
+    ]
 
-    if start:
-        q = q.filter(EventModel.timestamp >= start)
-    if end:
-        q = q.filter(EventModel.timestamp <= end)
 
-    rows = q.order_by(EventModel.timestamp.asc()).all()
+def _top_windows_active(
+    db: Session, start: Optional[datetime], end: Optional[datetime], limit: int, idle_threshold: float
+) -> List[TopWindowOut]:
+    activity = active_time.window_activity(db, start, end, idle_threshold)
+    ranked = sorted(activity.items(), key=lambda kv: kv[1][0], reverse=True)
+    return [
+        TopWindowOut(
+            app=app,
+            title=title,
+            total_seconds=active,
+            total_minutes=active / 60.0,
+            total_hours=active / 3600.0,
+            idle_seconds=idle,
+        )
+        for (app, title), (active, idle) in ranked[:limit]
+        if active > 0
+    ]
 
-    if not rows:
-        return []
 
-    durations: Dict[tuple, float] = {}
+def _top_windows(db: Session, start: Optional[datetime], end: Optional[datetime], limit: int) -> List[TopWindowOut]:
+    # Dauer pro Fenster rechnet SQLite (LEAD über source/timestamp), hier kommen nur die Summen an
+    return [
+        TopWindowOut(
+            app=row.app,
+            title=row.title,
+            total_seconds=row.seconds,
+            total_minutes=row.seconds / 60.0,
+            total_hours=row.seconds / 3600.0,
+        )
+        for row in durations.top_windows(db, start, end, limit)
+    ]
 
-    for idx, row in enumerate(rows):
-        this_ts = _to_utc(row.timestamp)
-        payload = row.payload or {}
-        app = payload.get("app")
-        title = payload.get("title")
 
-        if idx < len(rows) - 1:
-            next_ts = _to_utc(rows[idx + 1].timestamp)
-        else:
-            next_ts = _to_utc(end) if end else datetime.now(timezone.utc)
+@app.get("/analysis/daily-usage", response_model=List[DailyUsageOut])
+async def analysis_daily_usage(
+    days: int = Query(7, ge=1, le=366),
+    end: Optional[datetime] = None,
+):
+    """
+    Pro Tag (UTC): erster und letzter Fensterwechsel und die Spanne dazwischen.
+    HTTP-Gegenstück zu analysis_local.summarize_daily_usage.
+    """
+    end = end or datetime.now(timezone.utc)
+    return await run_in_db_thread(_daily_usage, end - timedelta(days=days), end)
 
-        delta = (next_ts - this_ts).total_seconds()
-        if delta <= 0:
-            continue
 
-        key = (app, title)
-        durations[key] = durations.get(key, 0.0) + delta
+@app.get("/analysis/distinct-counts", response_model=DistinctCountsOut)
+async def analysis_distinct_counts(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """
+    Geschätzte Anzahl verschiedener Fenster (app, title) und URLs im Zeitraum
+    (ganze UTC-Tage), per HyperLogLog aus den Tages-Sketches.
+    """
+    return await run_in_db_thread(_distinct_counts, start, end)
 
-    result: List[TopWindowOut] = []
-    for (app, title), secs in durations.items():
-        result.append(
-            TopWindowOut(
-                app=app,
-                title=title,
-                total_seconds=secs,
-                total_minutes=secs / 60.0,
-                total_hours=secs / 3600.0,
-            )
-        )
 
-    result.sort(key=lambda x: x.total_seconds, reverse=True)
-    return result[:limit]
+def _distinct_counts(db: Session, start: Optional[datetime], end: Optional[datetime]) -> DistinctCountsOut:
+    start, end = _sketch_range(db, start, end)
+    counts = sketches.approx_distinct(db, start, end)
+    return DistinctCountsOut(
+        days=len(sketches.days_in_range(start, end)),
+        windows=round(counts.windows),
+        urls=round(counts.urls),
+        relative_error=round(counts.relative_error, 4),
+    )
+
+
+def _daily_usage(db: Session, start: datetime, end: datetime) -> List[DailyUsageOut]:
+    return [
+        DailyUsageOut(
+            day=row.day,
+            first_event=row.first_ts,
+            last_event=row.last_ts,
+            span_hours=round(row.span_seconds / 3600.0, 2),
+            window_switches=row.switches,
+        )
+        for row in durations.daily_spans(db, start, end)
+    ]
 
 
 @app.get("/analysis/routines", response_model=List[RoutineOut])
-def analysis_routines(
+async def analysis_routines(
     n: int = 3,
     min_count: int = 3,
     days: int = 3,
     limit: int = 20,
-    db: Session = Depends(get_db),
 ):
     if n < 2:
         n = 2
@@ -337,64 +459,26 @@ def analysis_routines(
     end = datetime.now(timezone.utc)
     start = end - timedelta(days=days)
 
-    q = (
-        db.query(EventModel)
-        .filter(EventModel.source == "window")
-        .filter(EventModel.timestamp >= start)
-        .filter(EventModel.timestamp <= end)
-        .order_by(EventModel.timestamp.asc())
-    )
-    rows = q.all()
-    if not rows:
-        return []
-
-    events = []
-    for r in rows:
-        ts = _to_utc(r.timestamp)
-        payload = r.payload or {}
-        app = payload.get("app")
-        title = payload.get("title")
-        events.append((app, title, ts))
-
-    if len(events) < n:
-        return []
-
-    durations = []
-    for i, (_, _, ts) in enumerate(events):
-        if i < len(events) - 1:
-            next_ts = events[i + 1][2]
-        else:
-            next_ts = end
-        delta = (next_ts - ts).total_seconds()
-        if delta < 0:
-            delta = 0
-        durations.append(delta)
-
-    from collections import defaultdict
-    seq_stats = defaultdict(lambda: {"count": 0, "total_seconds": 0.0})
-
-    for i in range(len(events) - n + 1):
-        seq = tuple((events[i + j][0], events[i + j][1]) for j in range(n))
-        seq_dur = sum(durations[i : i + n])
-        stats = seq_stats[seq]
-        stats["count"] += 1
-        stats["total_seconds"] += seq_dur
+    # Tages-Partitionen, bei langen Zeiträumen parallel im Prozess-Pool
+    try:
+        _, seq_stats = await run_analysis(analyze_windows, start, end, n)
+    except AnalysisBusy:
+        raise HTTPException(status_code=503, detail="Analyse ausgelastet, bitte später erneut versuchen.")
 
     filtered = [
-        (seq, stats)
-        for seq, stats in seq_stats.items()
-        if stats["count"] >= min_count
+        (seq, (count, total_sec))
+        for seq, (count, total_sec) in seq_stats.items()
+        if count >= min_count
     ]
 
-    filtered.sort(key=lambda x: x[1]["total_seconds"], reverse=True)
+    filtered.sort(key=lambda x: x[1][1], reverse=True)
 
     result: List[RoutineOut] = []
-    for seq, stats in filtered[:limit]:
-        total_sec = stats["total_seconds"]
+    for seq, (count, total_sec) in filtered[:limit]:
         result.append(
             RoutineOut(
                 sequence=[{"app": a, "title": t} for (a, t) in seq],
-                count=stats["count"],
+                count=count,
                 total_seconds=total_sec,
                 total_minutes=total_sec / 60.0,
                 total_hours=total_sec / 3600.0,
@@ -405,48 +489,27 @@ def analysis_routines(
 
 
 @app.get("/analysis/automation-candidates", response_model=List[AutomationCandidateOut])
-def analysis_automation_candidates(
+async def analysis_automation_candidates(
     days: int = 7,
     limit: int = 20,
     hourly_rate: float = 60.0,
     automation_factor: float = 0.7,
     working_days_per_year: int = 220,
     min_minutes_per_day: float = 5.0,
-    db: Session = Depends(get_db),
+    idle_threshold: Optional[float] = IDLE_THRESHOLD_QUERY,
 ):
     end = datetime.now(timezone.utc)
     start = end - timedelta(days=days)
 
-    q = (
-        db.query(EventModel)
-        .filter(EventModel.source == "window")
-        .filter(EventModel.timestamp >= start)
-        .filter(EventModel.timestamp <= end)
-        .order_by(EventModel.timestamp.asc())
-    )
-    rows = q.all()
-    if not rows:
-        return []
-
-    durations: Dict[tuple, float] = {}
-
-    for idx, row in enumerate(rows):
-        this_ts = _to_utc(row.timestamp)
-        payload = row.payload or {}
-        app = payload.get("app")
-        title = payload.get("title")
-
-        if idx < len(rows) - 1:
-            next_ts = _to_utc(rows[idx + 1].timestamp)
-        else:
-            next_ts = end
-
-        delta = (next_ts - this_ts).total_seconds()
-        if delta <= 0:
-            continue
-
-        key = (app, title)
-        durations[key] = durations.get(key, 0.0) + delta
+    if idle_threshold is not None:
+        # nur aktive Zeit zählt – Fenster, die im Leerlauf offen standen, verteuern nichts
+        activity = await run_in_db_thread(active_time.window_activity, start, end, idle_threshold)
+        durations = {key: active for key, (active, _) in activity.items()}
+    else:
+        try:
+            durations, _ = await run_analysis(analyze_windows, start, end)
+        except AnalysisBusy:
+            raise HTTPException(status_code=503, detail="Analyse ausgelastet, bitte später erneut versuchen.")
 
     if not durations:
         return []
@@ -483,42 +546,45 @@ def analysis_automation_candidates(
     return result[:limit]
 
 @app.get("/browser")
-def get_browser_timeline(limit: int = 200, db: Session = Depends(get_db)):
+async def get_browser_timeline(limit: int = 200, db: AsyncSession = Depends(get_async_db)):
     """
     Liefert die letzten Browser-Events (source='browser'),
     neueste zuerst, für die Browser-Timeline im Dashboard.
     """
     rows = (
-        db.query(EventModel)
-        .filter(EventModel.source == "browser")
-        .order_by(EventModel.timestamp.desc())
-        .limit(limit)
-        .all()
-    )
+        await db.execute(
+            select(EventModel.id, EventModel.timestamp, EventModel.type, EventModel.payload)
+            .where(EventModel.source == "browser")
+            .order_by(EventModel.timestamp.desc())
+            .limit(limit)
+        )
+    ).all()
 
     result = []
-    for e in rows:
-        payload = e.payload or {}
+    for id_, ts, type_, payload in rows:
+        payload = payload or {}
         result.append(
             {
-                "id": e.id,
-                "timestamp": e.timestamp.isoformat(),
+                "id": id_,
+                "timestamp": ts.isoformat(),
                 "title": payload.get("title"),
                 "url": payload.get("url"),
-                "event_type": e.type,
+                "event_type": type_,
             }
         )
-    return result
+    return FastJSONResponse(result)
 
 @app.get("/collectors/browser/status", response_model=BrowserCollectorStatus)
-def get_browser_status(db: Session = Depends(get_db)):
+async def get_browser_status(db: AsyncSession = Depends(get_async_db)):
     # letztes Event der Quelle "browser" holen
     last_event = (
-        db.query(models.Event)
-        .filter(models.Event.source == "browser")
-        .order_by(models.Event.timestamp.desc())
-        .first()
-    )
+        await db.execute(
+            select(models.Event)
+            .where(models.Event.source == "browser")
+            .order_by(models.Event.timestamp.desc())
+            .limit(1)
+        )
+    ).scalars().first()
 
     if not last_event:
         return BrowserCollectorStatus(
@@ -550,22 +616,22 @@ def get_browser_status(db: Session = Depends(get_db)):
     )
 
 @app.get("/events/browser/recent", response_model=list[BrowserEventOut])
-def get_recent_browser_events(limit: int = 100, db: Session = Depends(get_db)):
+async def get_recent_browser_events(limit: int = 100, db: AsyncSession = Depends(get_async_db)):
     events = (
-        db.query(models.Event)
-        .filter(models.Event.source == "browser")
-        .order_by(models.Event.timestamp.desc())
-        .limit(limit)
-        .all()
-    )
+        await db.execute(
+            select(models.Event)
+            .where(models.Event.source == "browser")
+            .order_by(models.Event.timestamp.desc())
+            .limit(limit)
+        )
+    ).scalars().all()
     return events
 
 
 @app.get("/analysis/dashboard/summary")
-def analysis_dashboard_summary(
+async def analysis_dashboard_summary(
     from_: str | None = Query(None, alias="from"),
     to_: str | None = Query(None, alias="to"),
-    db: Session = Depends(get_db)
 ):
     """
     Liefert die KPI-Summary fürs Dashboard.
@@ -581,6 +647,10 @@ def analysis_dashboard_summary(
     except:
         pass
 
+    return await run_in_db_thread(_dashboard_summary, start, end)
+
+
+def _dashboard_summary(db: Session, start: Optional[datetime], end: Optional[datetime]) -> Dict[str, Any]:
     # Prepare base query
     q = db.query(EventModel)
     if start:
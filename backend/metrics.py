@@ -0,0 +1,340 @@
+# backend/metrics.py
+"""
+Leichtgewichtige Laufzeit-Metriken für das Backend.
+
+- MetricsMiddleware (reines ASGI, kein BaseHTTPMiddleware): Latenz-Histogramm,
+  Request-/Response-Größe und Statuscodes je Route-Template
+- instrument_engine(): zählt SQL-Statements und deren Zeit pro Request
+  (über einen ContextVar) und merkt sich die langsamsten Statements
+- count_ingest(): eingefügte Events, daraus Events/s der letzten Minute
+
+Pro Request fallen nur ein paar perf_counter()-Aufrufe und Zähler-Updates
+an, daher bleibt das auch im Normalbetrieb an. Abschalten mit
+TRACKER_METRICS=0.
+"""
+import bisect
+import heapq
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+METRICS_ENABLED = os.environ.get("TRACKER_METRICS", "1") != "0"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+SLOW_QUERY_KEEP = 20          # so viele langsamste Statements merken
+SLOW_QUERY_MIN_SECONDS = 0.01  # schnellere gar nicht erst betrachten
+INGEST_WINDOW_SECONDS = 60
+
+
+class Histogram:
+    """Festes Bucket-Histogramm (Prometheus-kompatibel, nicht kumulativ gespeichert)."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # letzter = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Schätzung per linearer Interpolation innerhalb des Buckets."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if seen + c >= rank and c:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / c
+            seen += c
+        return self.buckets[-1]
+
+
+class RouteStats:
+    __slots__ = ("latency", "response_size", "request_bytes", "statuses", "db_queries", "db_seconds")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.response_size = Histogram(SIZE_BUCKETS)
+        self.request_bytes = 0
+        self.statuses: Dict[int, int] = {}
+        self.db_queries = 0
+        self.db_seconds = 0.0
+
+
+class RequestDB:
+    """SQL-Statistik des laufenden Requests (über ContextVar, auch in Worker-Threads sichtbar)."""
+
+    __slots__ = ("queries", "seconds", "route")
+
+    def __init__(self, route: str):
+        self.queries = 0
+        self.seconds = 0.0
+        self.route = route
+
+
+_current: ContextVar[Optional[RequestDB]] = ContextVar("tracker_request_db", default=None)
+_lock = threading.Lock()
+_routes: Dict[Tuple[str, str], RouteStats] = {}
+_db_latency = Histogram(LATENCY_BUCKETS)
+_db_queries_total = 0
+_slow: List[Tuple[float, int, dict]] = []  # Min-Heap über die Dauer
+_slow_seq = 0
+_ingest_total = 0
+_ingest_seconds: Dict[int, int] = {}  # Unix-Sekunde -> Events
+_started = time.time()
+
+
+# =========================
+# Erfassung
+# =========================
+
+def _route_name(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    # ungematchte Pfade zusammenfassen, sonst wächst die Tabelle mit jedem 404
+    return path or "<unmatched>"
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        request_db = RequestDB("")
+        token = _current.set(request_db)
+        status = 500
+        sent = 0
+
+        async def send_wrapper(message):
+            nonlocal status, sent
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - start
+            route = _route_name(scope)
+            received = 0
+            for name, value in scope.get("headers", ()):
+                if name == b"content-length":
+                    received = int(value or 0)
+                    break
+            key = (scope.get("method", ""), route)
+            with _lock:
+                stats = _routes.get(key)
+                if stats is None:
+                    stats = _routes[key] = RouteStats()
+                stats.latency.observe(elapsed)
+                stats.response_size.observe(sent)
+                stats.request_bytes += received
+                stats.statuses[status] = stats.statuses.get(status, 0) + 1
+                stats.db_queries += request_db.queries
+                stats.db_seconds += request_db.seconds
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("tracker_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    global _db_queries_total, _slow_seq
+    starts = conn.info.get("tracker_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+
+    request_db = _current.get()
+    if request_db is not None:
+        request_db.queries += 1
+        request_db.seconds += elapsed
+
+    with _lock:
+        _db_queries_total += 1
+        _db_latency.observe(elapsed)
+        if elapsed >= SLOW_QUERY_MIN_SECONDS and (len(_slow) < SLOW_QUERY_KEEP or elapsed > _slow[0][0]):
+            _slow_seq += 1
+            entry = (elapsed, _slow_seq, {
+                "ms": round(elapsed * 1e3, 2),
+                "statement": " ".join(statement.split())[:500],
+                "rows": cursor.rowcount if cursor.rowcount >= 0 else None,
+                "executemany": executemany,
+                "at": time.time(),
+            })
+            if len(_slow) < SLOW_QUERY_KEEP:
+                heapq.heappush(_slow, entry)
+            else:
+                heapq.heapreplace(_slow, entry)
+
+
+def instrument_engine(engine):
+    """Hängt die Zähler an eine (sync) Engine; für AsyncEngine deren .sync_engine übergeben."""
+    if not METRICS_ENABLED:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def count_ingest(n: int):
+    global _ingest_total
+    if not METRICS_ENABLED or n <= 0:
+        return
+    now = int(time.time())
+    with _lock:
+        _ingest_total += n
+        _ingest_seconds[now] = _ingest_seconds.get(now, 0) + n
+        if len(_ingest_seconds) > INGEST_WINDOW_SECONDS * 2:
+            for sec in [s for s in _ingest_seconds if s <= now - INGEST_WINDOW_SECONDS]:
+                del _ingest_seconds[sec]
+
+
+def _ingest_rate(now: float) -> float:
+    cutoff = int(now) - INGEST_WINDOW_SECONDS
+    return sum(n for sec, n in _ingest_seconds.items() if sec > cutoff) / INGEST_WINDOW_SECONDS
+
+
+# =========================
+# Ausgabe
+# =========================
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1e3, 2)
+
+
+def snapshot() -> dict:
+    """JSON-Sicht für /debug/perf."""
+    now = time.time()
+    with _lock:
+        routes = []
+        for (method, route), s in _routes.items():
+            n = s.latency.count
+            routes.append({
+                "method": method,
+                "route": route,
+                "count": n,
+                "errors": sum(c for code, c in s.statuses.items() if code >= 500),
+                "statuses": dict(s.statuses),
+                "mean_ms": _ms(s.latency.sum / n) if n else None,
+                "p50_ms": _ms(s.latency.quantile(0.5)),
+                "p95_ms": _ms(s.latency.quantile(0.95)),
+                "p99_ms": _ms(s.latency.quantile(0.99)),
+                "avg_request_bytes": round(s.request_bytes / n) if n else 0,
+                "avg_response_bytes": round(s.response_size.sum / n) if n else 0,
+                "avg_db_queries": round(s.db_queries / n, 2) if n else 0,
+                "avg_db_ms": _ms(s.db_seconds / n) if n else None,
+            })
+        slow = [entry for _, _, entry in sorted(_slow, reverse=True)]
+        result = {
+            "enabled": METRICS_ENABLED,
+            "uptime_seconds": round(now - _started),
+            "routes": sorted(routes, key=lambda r: r["count"] * (r["mean_ms"] or 0), reverse=True),
+            "db": {
+                "queries": _db_queries_total,
+                "p50_ms": _ms(_db_latency.quantile(0.5)),
+                "p95_ms": _ms(_db_latency.quantile(0.95)),
+                "total_ms": _ms(_db_latency.sum),
+            },
+            "ingest": {
+                "events_total": _ingest_total,
+                "events_per_second_1m": round(_ingest_rate(now), 2),
+            },
+            "slow_queries": slow,
+        }
+    return result
+
+
+def _labels(**labels) -> str:
+    parts = []
+    for k, v in labels.items():
+        v = str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _histogram_lines(name: str, h: Histogram, **labels) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, c in zip(h.buckets, h.counts):
+        cumulative += c
+        lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {h.count}")
+    lines.append(f"{name}_sum{_labels(**labels)} {h.sum}")
+    lines.append(f"{name}_count{_labels(**labels)} {h.count}")
+    return lines
+
+
+def prometheus_text() -> str:
+    """Prometheus-Textformat (0.0.4) für /metrics."""
+    now = time.time()
+    out = [
+        "# HELP tracker_http_requests_total HTTP-Requests nach Route und Status.",
+        "# TYPE tracker_http_requests_total counter",
+    ]
+    with _lock:
+        items = sorted(_routes.items())
+        for (method, route), s in items:
+            for code, c in sorted(s.statuses.items()):
+                out.append(f"tracker_http_requests_total{_labels(method=method, route=route, status=code)} {c}")
+
+        out += ["# HELP tracker_http_request_duration_seconds Latenz je Route.",
+                "# TYPE tracker_http_request_duration_seconds histogram"]
+        for (method, route), s in items:
+            out += _histogram_lines("tracker_http_request_duration_seconds", s.latency, method=method, route=route)
+
+        out += ["# HELP tracker_http_response_size_bytes Antwortgröße je Route.",
+                "# TYPE tracker_http_response_size_bytes histogram"]
+        for (method, route), s in items:
+            out += _histogram_lines("tracker_http_response_size_bytes", s.response_size, method=method, route=route)
+
+        out += ["# HELP tracker_http_request_size_bytes_total Summe der Request-Bodies (Content-Length).",
+                "# TYPE tracker_http_request_size_bytes_total counter"]
+        for (method, route), s in items:
+            out.append(f"tracker_http_request_size_bytes_total{_labels(method=method, route=route)} {s.request_bytes}")
+
+        out += ["# HELP tracker_db_queries_by_route_total SQL-Statements je Route.",
+                "# TYPE tracker_db_queries_by_route_total counter"]
+        for (method, route), s in items:
+            out.append(f"tracker_db_queries_by_route_total{_labels(method=method, route=route)} {s.db_queries}")
+
+        out += ["# HELP tracker_db_seconds_by_route_total SQL-Zeit je Route.",
+                "# TYPE tracker_db_seconds_by_route_total counter"]
+        for (method, route), s in items:
+            out.append(f"tracker_db_seconds_by_route_total{_labels(method=method, route=route)} {s.db_seconds}")
+
+        out += ["# HELP tracker_db_query_duration_seconds Dauer aller SQL-Statements.",
+                "# TYPE tracker_db_query_duration_seconds histogram"]
+        out += _histogram_lines("tracker_db_query_duration_seconds", _db_latency)
+
+        out += ["# HELP tracker_ingest_events_total Eingefügte Events.",
+                "# TYPE tracker_ingest_events_total counter",
+                f"tracker_ingest_events_total {_ingest_total}",
+                "# HELP tracker_ingest_events_per_second Eingefügte Events/s (Mittel der letzten Minute).",
+                "# TYPE tracker_ingest_events_per_second gauge",
+                f"tracker_ingest_events_per_second {_ingest_rate(now)}"]
+
+    out += ["# HELP tracker_uptime_seconds Laufzeit des Backends.",
+            "# TYPE tracker_uptime_seconds gauge",
+            f"tracker_uptime_seconds {now - _started}"]
+    return "\n".join(out) + "\n"
@@ -1,5 +1,5 @@
 # backend/models.py
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Text
+from sqlalchemy import Column, Float, Index, Integer, String, DateTime, JSON, Text, UniqueConstraint
 from sqlalchemy.dialects.sqlite import JSON
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.ext.declarative import declarative_base
@@ -9,6 +9,8 @@ Base = declarative_base()
 
 class Event(Base):
     __tablename__ = "events"
+    # Zeitraum-Abfragen je Quelle (LEAD() in backend/durations.py) laufen über diesen Index
+    __table_args__ = (Index("ix_events_source_timestamp", "source", "timestamp"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     timestamp = Column(DateTime, index=True, default=datetime.utcnow)
@@ -46,3 +48,66 @@ class BrowserEvent(Base):
     # Lesbarer Kontext
     element_label = Column(Text, nullable=True)       # Label-Text / Button-Beschriftung
     value_preview = Column(Text, nullable=True)       # Anonymisierte/gekürzte Eingabewerte
+
+class ScreenshotFile(Base):
+    """
+    Index der gespeicherten Screenshot-Dateien (für Retention nach Alter/Größe).
+    Wird beim Ingest von screenshot-Events gepflegt – kein Verzeichnis-Scan nötig.
+    """
+    __tablename__ = "screenshot_files"
+
+    event_id = Column(Integer, primary_key=True)
+    timestamp = Column(DateTime, index=True, nullable=False)
+    path = Column(Text, nullable=False)
+    size_bytes = Column(Integer, nullable=False, default=0)
+
+class SearchDoc(Base):
+    """
+    Suchbare Texte (Fenstertitel, URLs, Dokumentpfade), einmal pro Text und Tag.
+    Der FTS5-Index search_fts verweist per rowid hierauf (siehe backend/search.py).
+    """
+    __tablename__ = "search_docs"
+    __table_args__ = (UniqueConstraint("kind", "text", "day", name="uq_search_docs_kind_text_day"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String, nullable=False)           # window, url, document
+    text = Column(Text, nullable=False)
+    day = Column(String(10), index=True, nullable=False)  # YYYY-MM-DD (UTC)
+    first_ts = Column(DateTime, nullable=False)
+    last_ts = Column(DateTime, index=True, nullable=False)
+    hits = Column(Integer, nullable=False, default=1)
+    source = Column(String, nullable=False)         # events / browser_events
+    ref_id = Column(Integer, nullable=True)         # erstes Event des Tages
+
+class UrlDomain(Base):
+    """Wörterbuch der registrierbaren Domains (browser_visits verweist per ID)."""
+    __tablename__ = "url_domains"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    domain = Column(String, unique=True, nullable=False)
+
+class BrowserVisit(Base):
+    """
+    Normalisierte Navigation (tab_activated / page_loaded aus events), eine Zeile
+    je Event. Zeit als Epoch-Sekunden, damit Dauer-Abfragen ohne Datums-Parsing
+    auskommen (siehe backend/url_index.py).
+    """
+    __tablename__ = "browser_visits"
+    # deckt die Zeitraum-Abfrage in /analysis/top-domains ohne Tabellenzugriff ab
+    __table_args__ = (Index("ix_browser_visits_ts_nav", "ts", "domain_id", "type", "tab_id"),)
+
+    event_id = Column(Integer, primary_key=True)
+    ts = Column(Float, nullable=False)               # Unix-Zeit (UTC)
+    type = Column(String(20), nullable=False)
+    tab_id = Column(Integer, nullable=True)
+    domain_id = Column(Integer, nullable=False)
+    scheme = Column(String(10), nullable=False)
+    path = Column(Text, nullable=False)              # Pfad-Template, z.B. /issues/:num
+
+class DailySketch(Base):
+    """Serialisierte Tages-Sketches (Top-K-Zeit, HyperLogLog) – siehe backend/sketches.py."""
+    __tablename__ = "daily_sketches"
+
+    day = Column(String(10), primary_key=True)   # YYYY-MM-DD (UTC)
+    kind = Column(String(20), primary_key=True)  # window_time, titles, urls
+    data = Column(Text, nullable=False)
@@ -0,0 +1,340 @@
+# backend/retention.py
+"""
+Screenshot-Retention nach Alter und Byte-Budget.
+
+Grundlage ist der Datei-Index `screenshot_files` (ScreenshotFile), der beim
+Ingest von screenshot-Events mitgeschrieben wird. Aufgeräumt wird immer
+ältestes-zuerst in kleinen Batches – ohne Verzeichnis-Scan. Die zugehörigen
+Events werden im selben Schritt markiert (payload.deleted = true) oder gelöscht.
+
+Größen kommen beim Ingest nur aus dem Payload (size_bytes) – kein stat()
+auf dem Event-Loop. Fehlt sie, steht 0 im Index und fill_missing_sizes()
+trägt sie im Retention-Thread nach.
+
+Dateien, deren Event nie angekommen ist (Backend beim Senden nicht
+erreichbar), stehen nicht im Index. Sie räumt sweep_orphans() auf – ein
+Verzeichnis-Scan, aber nur alle ORPHAN_SWEEP_INTERVAL_SECONDS.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend.db import SessionLocal
+from backend.models import Event, ScreenshotFile
+
+# Muss zu BASE_DIR in collectors/screenshot_collector.py passen
+SCREENSHOT_DIR = Path.home() / ".tracker" / "screenshots"
+
+RETENTION_INTERVAL_SECONDS = 60   # regulärer Lauf (Alter)
+EVICT_BATCH_SIZE = 200            # Dateien pro Lösch-Batch / Commit
+ORPHAN_SWEEP_INTERVAL_SECONDS = 3600
+ORPHAN_GRACE_SECONDS = 600        # jüngere Dateien: Event ist evtl. noch unterwegs
+
+# "mark":   Event bleibt für die Timeline erhalten, payload.deleted = true
+# "delete": Event wird zusammen mit der Datei entfernt
+EVICTED_EVENT_MODE = "mark"
+
+_lock = threading.Lock()
+_wake = threading.Event()
+_last_total_bytes = 0   # Stand nach dem letzten Retention-Lauf
+_pending_bytes = 0      # seitdem per Ingest hinzugekommen
+_budget_bytes = 0       # zuletzt gültiges Budget (0 = unbegrenzt)
+_sized_through = 0      # fill_missing_sizes: bis zu dieser event_id geprüft
+
+
+# =========================
+# Index-Pflege beim Ingest
+# =========================
+
+def index_screenshot_events(db: Session, events: Iterable[Event]):
+    """
+    Trägt screenshot-Events in den Datei-Index ein.
+    Die Events müssen bereits eine ID haben (nach flush/commit aufrufen).
+    """
+    global _pending_bytes
+
+    added = 0
+    for ev in events:
+        if ev.source != "screenshot":
+            continue
+        payload = ev.payload or {}
+        path = payload.get("path")
+        if not path:
+            continue
+        size = payload.get("size_bytes")
+        if not isinstance(size, int):
+            size = 0  # fill_missing_sizes() im Retention-Thread
+
+        db.add(ScreenshotFile(event_id=ev.id, timestamp=ev.timestamp, path=path, size_bytes=size))
+        added += size
+
+    if not added:
+        return
+
+    with _lock:
+        _pending_bytes += added
+        over_budget = _budget_bytes and _last_total_bytes + _pending_bytes > _budget_bytes
+    if over_budget:
+        _wake.set()
+
+
+def wake():
+    """Nächsten Retention-Lauf sofort starten (z.B. nach geänderten Einstellungen)."""
+    _wake.set()
+
+
+def rebuild_index_if_empty(db: Session) -> int:
+    """
+    Einmalige Übernahme bestehender screenshot-Events in den Index
+    (Datenbanken von vor Einführung des Index). Events, deren Datei schon
+    fehlt, werden direkt als gelöscht markiert.
+    """
+    if db.query(ScreenshotFile.event_id).first() is not None:
+        return 0
+
+    q = db.query(Event).filter(Event.source == "screenshot").yield_per(1000)
+    indexed = 0
+    dangling: List[int] = []
+    for ev in q:
+        payload = ev.payload or {}
+        path = payload.get("path")
+        if not path or payload.get("deleted"):
+            continue
+        try:
+            size = Path(path).stat().st_size
+        except OSError:
+            dangling.append(ev.id)
+            continue
+        db.add(ScreenshotFile(event_id=ev.id, timestamp=ev.timestamp, path=path, size_bytes=size))
+        indexed += 1
+
+    _mark_events(db, dangling)
+    db.commit()
+    if indexed or dangling:
+        print(f"[INFO] Screenshot-Index aufgebaut: {indexed} Dateien, {len(dangling)} verwaiste Events")
+    return indexed
+
+
+# =========================
+# Retention
+# =========================
+
+def enforce_retention(db: Session, retention_days: int, max_bytes: int = 0) -> Dict[str, int]:
+    """
+    Löscht Screenshots ältestes-zuerst, solange sie älter als retention_days
+    sind oder das Byte-Budget (max_bytes, 0 = unbegrenzt) überschritten ist.
+    """
+    global _last_total_bytes, _pending_bytes, _budget_bytes
+
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=retention_days)
+    total = db.query(func.coalesce(func.sum(ScreenshotFile.size_bytes), 0)).scalar()
+
+    removed = 0
+    freed = 0
+    while True:
+        batch = (
+            db.query(ScreenshotFile)
+            .order_by(ScreenshotFile.timestamp.asc())
+            .limit(EVICT_BATCH_SIZE)
+            .all()
+        )
+
+        victims: List[ScreenshotFile] = []
+        for f in batch:
+            if f.timestamp < cutoff or (max_bytes and total > max_bytes):
+                victims.append(f)
+                total -= f.size_bytes
+            else:
+                break
+
+        if not victims:
+            break
+
+        removed += len(victims)
+        freed += sum(f.size_bytes for f in victims)
+        _evict(db, victims)
+        db.commit()
+
+        if len(victims) < len(batch):
+            break
+
+    with _lock:
+        _last_total_bytes = total
+        _pending_bytes = 0
+        _budget_bytes = max_bytes
+
+    return {"removed_files": removed, "freed_bytes": freed, "total_bytes": total}
+
+
+def _file_size(path: str) -> int:
+    try:
+        return Path(path).stat().st_size
+    except OSError:
+        return 0
+
+
+def fill_missing_sizes(db: Session) -> int:
+    """
+    Größe für Index-Einträge ohne size_bytes (ältere Collector) per stat()
+    nachtragen. Jeder Eintrag wird pro Prozess nur einmal geprüft.
+    """
+    global _sized_through
+
+    filled = 0
+    while True:
+        batch = (
+            db.query(ScreenshotFile)
+            .filter(ScreenshotFile.size_bytes == 0, ScreenshotFile.event_id > _sized_through)
+            .order_by(ScreenshotFile.event_id.asc())
+            .limit(EVICT_BATCH_SIZE)
+            .all()
+        )
+        if not batch:
+            return filled
+        for f in batch:
+            size = _file_size(f.path)
+            if size:
+                f.size_bytes = size
+                filled += 1
+        db.commit()
+        _sized_through = batch[-1].event_id
+
+
+def sweep_orphans(db: Session, base_dir: Path = SCREENSHOT_DIR) -> Dict[str, int]:
+    """
+    Löscht Screenshot-Dateien ohne Eintrag im Index, die älter als
+    ORPHAN_GRACE_SECONDS sind. Ohne Event tauchen sie nirgends auf und würden
+    weder nach Alter noch nach Budget je entfernt.
+    """
+    if not base_dir.is_dir():
+        return {"removed_files": 0, "freed_bytes": 0}
+
+    settled = time.time() - ORPHAN_GRACE_SECONDS
+    removed = 0
+    freed = 0
+    for day_dir in sorted(p for p in base_dir.iterdir() if p.is_dir()):
+        candidates: Dict[str, int] = {}
+        for path in day_dir.iterdir():
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            if path.is_file() and st.st_mtime < settled:
+                candidates[str(path)] = st.st_size
+
+        paths = list(candidates)
+        for i in range(0, len(paths), EVICT_BATCH_SIZE):
+            chunk = paths[i:i + EVICT_BATCH_SIZE]
+            known = {p for (p,) in db.query(ScreenshotFile.path).filter(ScreenshotFile.path.in_(chunk))}
+            for path in chunk:
+                if path in known:
+                    continue
+                try:
+                    Path(path).unlink(missing_ok=True)
+                except OSError as e:
+                    print(f"[WARN] Konnte Screenshot {path} nicht löschen: {e}")
+                    continue
+                removed += 1
+                freed += candidates[path]
+
+        try:
+            day_dir.rmdir()
+        except OSError:
+            pass
+
+    return {"removed_files": removed, "freed_bytes": freed}
+
+
+def _evict(db: Session, files: List[ScreenshotFile]):
+    dirs = set()
+    for f in files:
+        p = Path(f.path)
+        try:
+            p.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"[WARN] Konnte Screenshot {p} nicht löschen: {e}")
+        dirs.add(p.parent)
+        db.delete(f)
+
+    # leere Tagesordner mit entfernen (rmdir schlägt fehl, wenn nicht leer)
+    for d in dirs:
+        try:
+            d.rmdir()
+        except OSError:
+            pass
+
+    ids = [f.event_id for f in files]
+    if EVICTED_EVENT_MODE == "delete":
+        db.query(Event).filter(Event.id.in_(ids)).delete(synchronize_session=False)
+    else:
+        _mark_events(db, ids)
+
+
+def _mark_events(db: Session, ids: List[int]):
+    if not ids:
+        return
+    for ev in db.query(Event).filter(Event.id.in_(ids)):
+        # neues dict zuweisen, damit SQLAlchemy die Änderung am JSON erkennt
+        ev.payload = {**(ev.payload or {}), "deleted": True}
+
+
+# =========================
+# Hintergrund-Worker
+# =========================
+
+def start_retention_worker(load_settings: Callable[[Session], object]):
+    """
+    Startet den Retention-Thread. `load_settings(db)` muss ein Objekt mit
+    screenshot_retention_days und screenshot_max_mb liefern.
+    Läuft alle RETENTION_INTERVAL_SECONDS, bei Budget-Überschreitung sofort;
+    verwaiste Dateien werden beim Start und dann stündlich entfernt.
+    """
+    def loop():
+        db = SessionLocal()
+        try:
+            rebuild_index_if_empty(db)
+        except Exception as e:
+            print(f"[ERROR] Screenshot-Index konnte nicht aufgebaut werden: {e}")
+        finally:
+            db.close()
+
+        last_sweep = None
+        while True:
+            db = SessionLocal()
+            try:
+                if last_sweep is None or time.monotonic() - last_sweep >= ORPHAN_SWEEP_INTERVAL_SECONDS:
+                    last_sweep = time.monotonic()
+                    orphans = sweep_orphans(db)
+                    if orphans["removed_files"]:
+                        print(
+                            f"[INFO] Retention: {orphans['removed_files']} Screenshots ohne Event gelöscht "
+                            f"({orphans['freed_bytes'] / (1024 * 1024):.1f} MB frei)"
+                        )
+
+                fill_missing_sizes(db)
+                settings = load_settings(db)
+                stats = enforce_retention(
+                    db,
+                    settings.screenshot_retention_days,
+                    settings.screenshot_max_mb * 1024 * 1024,
+                )
+                if stats["removed_files"]:
+                    print(
+                        f"[INFO] Retention: {stats['removed_files']} Screenshots gelöscht "
+                        f"({stats['freed_bytes'] / (1024 * 1024):.1f} MB frei)"
+                    )
+            except Exception as e:
+                db.rollback()
+                print(f"[ERROR] Fehler im Retention-Lauf: {e}")
+            finally:
+                db.close()
+
+            _wake.wait(RETENTION_INTERVAL_SECONDS)
+            _wake.clear()
+
+    threading.Thread(target=loop, name="screenshot-retention", daemon=True).start()
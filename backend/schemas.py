@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Optional, Literal, Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class BrowserEventBase(BaseModel):
@@ -26,6 +26,10 @@ class BrowserEventCreate(BrowserEventBase):
     pass
 
 
+class BrowserEventBatch(BaseModel):
+    events: list[BrowserEventCreate]
+
+
 class BrowserEventRead(BrowserEventBase):
     id: int
 
@@ -45,3 +49,49 @@ class BrowserEventOut(BaseModel):
 
     class Config:
         from_attributes = True  # falls du SQLAlchemy benutzt (Pydantic v2)
+
+
+class CollectorTelemetryIn(BaseModel):
+    """Periodischer Bericht eines Collectors (collectors/telemetry.py)."""
+    collector: str
+    pid: Optional[int] = None
+    started: Optional[datetime] = None
+    interval_seconds: float = 30.0
+    counters: dict[str, float] = {}
+    gauges: dict[str, float] = {}
+    timings: dict[str, dict[str, float]] = {}
+    cpu_percent: Optional[float] = None
+    rss_bytes: Optional[int] = None
+    threads: Optional[int] = None
+
+
+class CollectorTelemetryOut(CollectorTelemetryIn):
+    received_at: datetime
+    seconds_since_report: float
+    status: Literal["ok", "warn", "offline"]
+
+
+class TopDomainOut(BaseModel):
+    domain: str
+    path: Optional[str] = None
+    visits: int
+    total_seconds: float
+    total_minutes: float
+    share: float
+
+
+class SeriesOut(BaseModel):
+    key: str
+    total: float
+    points: list[tuple[int, float]]  # [Unix-ms, Wert]
+
+
+class SeriesResponse(BaseModel):
+    from_: datetime = Field(alias="from")
+    to: datetime
+    metric: Literal["count", "duration"]
+    bucket_seconds: int
+    downsampled: bool
+    series: list[SeriesOut]
+
+    model_config = {"populate_by_name": True}
@@ -0,0 +1,294 @@
+# backend/search.py
+"""
+Volltextsuche (SQLite FTS5) über Fenstertitel, URLs und Dokumentpfade.
+
+Statt jedes Event einzeln zu indexieren, wird jeder Text einmal pro Tag in
+search_docs abgelegt (mit erstem/letztem Zeitpunkt und Anzahl). Das hält
+den Index klein – ein Fenstertitel taucht sonst hunderte Male am Tag auf –
+und beantwortet trotzdem "wann habe ich an X gearbeitet". search_fts ist
+eine External-Content-Tabelle auf search_docs, gepflegt per Trigger.
+
+Gefüllt wird beim Ingest (index_events / index_browser_events); bestehende
+Daten übernimmt einmalig ein Hintergrund-Thread (start_backfill).
+"""
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, bindparam, func, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from backend.db import SessionLocal, engine
+from backend.models import BrowserEvent, Event, SearchDoc, Setting
+
+INDEXED_SOURCES = ("window", "browser", "document")
+KINDS = ("window", "url", "document")
+BACKFILL_CHUNK = 5000
+
+FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+        text,
+        content='search_docs',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_docs_ai AFTER INSERT ON search_docs BEGIN
+        INSERT INTO search_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_docs_ad AFTER DELETE ON search_docs BEGIN
+        INSERT INTO search_fts(search_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    END
+    """,
+)
+
+_docs = SearchDoc.__table__
+_upsert = sqlite_insert(_docs)
+_upsert = _upsert.on_conflict_do_update(
+    index_elements=["kind", "text", "day"],
+    set_={
+        "hits": _docs.c.hits + _upsert.excluded.hits,
+        "first_ts": func.min(_docs.c.first_ts, _upsert.excluded.first_ts),
+        "last_ts": func.max(_docs.c.last_ts, _upsert.excluded.last_ts),
+    },
+)
+
+
+def init_search():
+    """FTS5-Tabelle und Trigger anlegen (nach Base.metadata.create_all)."""
+    with engine.begin() as conn:
+        for ddl in FTS_DDL:
+            conn.exec_driver_sql(ddl)
+
+
+# =========================
+# Indexieren
+# =========================
+
+def _naive_utc(ts: datetime) -> datetime:
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def _join(*parts: Optional[str]) -> str:
+    return " – ".join(p.strip() for p in parts if isinstance(p, str) and p.strip())
+
+
+def extract(source: str, payload: Optional[dict]) -> Optional[Tuple[str, str]]:
+    """(kind, text) für ein Event oder None, wenn es nichts Suchbares enthält."""
+    payload = payload or {}
+    if source == "window":
+        value = _join(payload.get("app"), payload.get("title"))
+        kind = "window"
+    elif source == "browser":
+        value = _join(payload.get("url"), payload.get("title"))
+        kind = "url"
+    elif source == "document":
+        value = _join(payload.get("path"))
+        kind = "document"
+    else:
+        return None
+    return (kind, value) if value else None
+
+
+def _index(db: Session, items: Iterable[Tuple[str, str, datetime, str, Optional[int]]]) -> int:
+    """items: (kind, text, timestamp, source, ref_id) → ein Upsert je (kind, text, Tag)."""
+    rows: "OrderedDict[tuple, dict]" = OrderedDict()
+    for kind, value, ts, source, ref_id in items:
+        ts = _naive_utc(ts)
+        key = (kind, value, ts.strftime("%Y-%m-%d"))
+        row = rows.get(key)
+        if row is None:
+            rows[key] = {
+                "kind": kind, "text": value, "day": key[2], "first_ts": ts, "last_ts": ts,
+                "hits": 1, "source": source, "ref_id": ref_id,
+            }
+        else:
+            row["hits"] += 1
+            row["first_ts"] = min(row["first_ts"], ts)
+            row["last_ts"] = max(row["last_ts"], ts)
+    if rows:
+        db.execute(_upsert, list(rows.values()))
+    return len(rows)
+
+
+def index_events(db: Session, events: Sequence[Event]) -> int:
+    """Beim Ingest aufrufen (vor dem Commit, Events mit ID)."""
+    items = []
+    for ev in events:
+        found = extract(ev.source, ev.payload)
+        if found and ev.timestamp is not None:
+            items.append((found[0], found[1], ev.timestamp, "events", ev.id))
+    return _index(db, items)
+
+
+def index_browser_events(db: Session, rows: Sequence[BrowserEvent]) -> int:
+    items = []
+    for row in rows:
+        value = _join(row.url, row.title)
+        if value and row.timestamp is not None:
+            items.append(("url", value, row.timestamp, "browser_events", row.id))
+    return _index(db, items)
+
+
+# =========================
+# Einmalige Übernahme bestehender Daten
+# =========================
+
+def _backfill_state(db: Session, model):
+    key = f"search_backfill_{model.__tablename__}"
+    setting = db.get(Setting, key)
+    if setting is None:
+        # nur bis zur heutigen max. ID – alles danach indexiert der Ingest selbst
+        state = {"next_id": 1, "until": db.query(func.max(model.id)).scalar() or 0}
+        setting = Setting(key=key, value=json.dumps(state))
+        db.add(setting)
+        db.commit()
+    else:
+        state = json.loads(setting.value)
+    return setting, state
+
+
+def prepare_backfill(db: Session):
+    """
+    Obergrenzen festhalten, bevor der Server Events annimmt – sonst landen
+    Events zwischen Start und Backfill-Thread doppelt im Index.
+    """
+    _backfill_state(db, Event)
+    _backfill_state(db, BrowserEvent)
+
+
+def _backfill_table(db: Session, model, base_filter, to_items) -> int:
+    setting, state = _backfill_state(db, model)
+    done = 0
+    while state["next_id"] <= state["until"]:
+        q = db.query(model).filter(model.id >= state["next_id"], model.id <= state["until"])
+        if base_filter is not None:
+            q = q.filter(base_filter)
+        rows = q.order_by(model.id.asc()).limit(BACKFILL_CHUNK).all()
+        if rows:
+            _index(db, to_items(rows))
+            done += len(rows)
+            state["next_id"] = rows[-1].id + 1
+        else:
+            state["next_id"] = state["until"] + 1
+        setting.value = json.dumps(state)
+        db.commit()
+    return done
+
+
+def backfill(db: Session) -> int:
+    def event_items(rows):
+        for ev in rows:
+            found = extract(ev.source, ev.payload)
+            if found and ev.timestamp is not None:
+                yield found[0], found[1], ev.timestamp, "events", ev.id
+
+    def browser_items(rows):
+        for row in rows:
+            value = _join(row.url, row.title)
+            if value and row.timestamp is not None:
+                yield "url", value, row.timestamp, "browser_events", row.id
+
+    done = _backfill_table(db, Event, Event.source.in_(INDEXED_SOURCES), event_items)
+    done += _backfill_table(db, BrowserEvent, None, browser_items)
+    return done
+
+
+def start_backfill():
+    """Beim Start aufrufen: legt die Obergrenzen synchron fest, indexiert dann im Hintergrund."""
+    db = SessionLocal()
+    try:
+        prepare_backfill(db)
+    finally:
+        db.close()
+
+    def run():
+        t0 = time.perf_counter()
+        db = SessionLocal()
+        try:
+            done = backfill(db)
+            if done:
+                print(f"[INFO] Suchindex aufgebaut: {done} Events in {time.perf_counter() - t0:.1f} s")
+        except Exception as e:
+            db.rollback()
+            print(f"[ERROR] Suchindex konnte nicht aufgebaut werden: {e}")
+        finally:
+            db.close()
+
+    threading.Thread(target=run, name="search-backfill", daemon=True).start()
+
+
+# =========================
+# Suche
+# =========================
+
+_TERM = re.compile(r'"([^"]+)"|(\S+)')
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match(query: str) -> Optional[str]:
+    """
+    Nutzereingabe → FTS5-MATCH-Ausdruck. Wörter werden als Präfix gesucht
+    ("rech" findet "Rechnung"), "in Anführungszeichen" als exakte Phrase;
+    alle Teile müssen vorkommen. FTS5-Operatoren werden nicht durchgereicht.
+    """
+    parts = []
+    for phrase, word in _TERM.findall(query):
+        if phrase:
+            tokens = _WORD.findall(phrase)
+            if tokens:
+                parts.append('"' + " ".join(tokens) + '"')
+        else:
+            parts.extend(f'"{t}"*' for t in _WORD.findall(word))
+    return " ".join(parts) or None
+
+
+_SEARCH_SQL = """
+    SELECT d.id, d.kind, d.text, d.day, d.first_ts, d.last_ts, d.hits, d.source, d.ref_id,
+           bm25(search_fts) AS score
+    FROM search_fts
+    JOIN search_docs AS d ON d.id = search_fts.rowid
+    WHERE search_fts MATCH :match
+      {filters}
+    ORDER BY score, d.last_ts DESC
+    LIMIT :limit
+"""
+
+
+def search_statement(start: Optional[datetime], end: Optional[datetime], kinds: Optional[List[str]]):
+    filters = []
+    params = [bindparam("match"), bindparam("limit")]
+    if start is not None:
+        filters.append("AND d.last_ts >= :start")
+        params.append(bindparam("start", type_=DateTime))
+    if end is not None:
+        filters.append("AND d.first_ts <= :end")
+        params.append(bindparam("end", type_=DateTime))
+    if kinds:
+        filters.append("AND d.kind IN :kinds")
+        params.append(bindparam("kinds", expanding=True))
+    stmt = text(_SEARCH_SQL.format(filters="\n      ".join(filters))).bindparams(*params)
+    return stmt.columns(first_ts=DateTime, last_ts=DateTime)
+
+
+def search_params(match: str, start, end, kinds, limit: int) -> Dict[str, Any]:
+    params: Dict[str, Any] = {"match": match, "limit": limit}
+    if start is not None:
+        params["start"] = _naive_utc(start)
+    if end is not None:
+        params["end"] = _naive_utc(end)
+    if kinds:
+        params["kinds"] = list(kinds)
+    return params
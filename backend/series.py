@@ -0,0 +1,191 @@
+# backend/series.py
+"""
+Zeitreihen für Dashboard-Diagramme.
+
+Events werden in SQLite zu Buckets verdichtet (Anzahl oder Dauer je
+Bucket und Typ). Die Bucket-Größe richtet sich nach dem Zeitraum: höchstens
+OVERSAMPLE × width Buckets, auf "runde" Schritte (1 min, 15 min, 1 h …)
+gerundet. Sind es mehr Buckets als Pixel, reduziert LTTB (Largest Triangle
+Three Buckets) auf `width` Punkte und behält dabei Spitzen und Täler.
+
+Die Antwort hat damit höchstens width Punkte je Reihe – egal ob der
+Zeitraum eine Stunde oder ein Jahr umfasst.
+"""
+import math
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.orm import Session
+
+from backend.durations import EPOCH_SQL
+
+OVERSAMPLE = 4
+MAX_SERIES = 12  # weitere Typen landen in "(andere)"
+OTHER = "(andere)"
+
+BUCKET_STEPS = (
+    1, 5, 10, 30,
+    60, 5 * 60, 10 * 60, 15 * 60, 30 * 60,
+    3600, 2 * 3600, 3 * 3600, 6 * 3600, 12 * 3600,
+    86400, 7 * 86400, 30 * 86400,
+)
+
+# ms-genaue Unix-Zeit reicht für die Bucket-Zuordnung und ist billiger als EPOCH_SQL
+_EPOCH = "((julianday(timestamp) - 2440587.5) * 86400.0)"
+
+_COUNT_SQL = f"""
+    SELECT CAST(({_EPOCH} - :t0) / :bucket AS INTEGER) AS b, {{key}} AS k, COUNT(*) AS v
+    FROM events
+    WHERE {{where}} AND timestamp >= :start AND timestamp < :end
+    GROUP BY b, k
+"""
+
+# Dauer: jedes Event gilt bis zum nächsten derselben Quelle (das letzte bis :until) und
+# zählt komplett im Bucket seines Beginns. Der Typ-Filter greift erst nach LEAD(), damit
+# ein ausgeblendeter Typ die Dauer des vorherigen Events trotzdem beendet.
+_DURATION_SQL = f"""
+    WITH w AS (
+        SELECT timestamp, type, {{key}} AS k,
+               LEAD(timestamp) OVER (PARTITION BY source ORDER BY timestamp, id) AS next_ts
+        FROM events
+        WHERE {{where}} AND timestamp >= :start AND timestamp < :end
+    )
+    SELECT CAST(({_EPOCH} - :t0) / :bucket AS INTEGER) AS b, k,
+           SUM({EPOCH_SQL.format(col="COALESCE(next_ts, :until)")} - {EPOCH_SQL.format(col="timestamp")}) AS v
+    FROM w
+    WHERE {{type_filter}}
+    GROUP BY b, k
+"""
+
+
+def _utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _naive(dt: datetime) -> datetime:
+    # so liegen die Timestamps in der DB
+    return dt.replace(tzinfo=None)
+
+
+def choose_bucket(span_seconds: float, width: int) -> int:
+    """Kleinster runde Schritt mit höchstens OVERSAMPLE × width Buckets."""
+    for step in BUCKET_STEPS:
+        if span_seconds / step <= OVERSAMPLE * width:
+            return step
+    return BUCKET_STEPS[-1]
+
+
+def lttb(points: Sequence[Tuple[float, float]], threshold: int) -> List[Tuple[float, float]]:
+    """Largest Triangle Three Buckets (Steinarsson 2013): behält die Form mit `threshold` Punkten."""
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Mittelwert des nächsten Buckets als dritter Eckpunkt
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = avg_y = 0.0
+        for x, y in points[avg_start:avg_end]:
+            avg_x += x
+            avg_y += y
+        count = max(avg_end - avg_start, 1)
+        avg_x /= count
+        avg_y /= count
+
+        ax, ay = points[a]
+        best, best_area = a + 1, -1.0
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        a = best
+    sampled.append(points[-1])
+    return sampled
+
+
+def build_series(
+    db: Session,
+    start: datetime,
+    end: datetime,
+    source: Optional[str],
+    types: Optional[List[str]],
+    metric: str,
+    width: int,
+) -> dict:
+    """Reihen für [start, end) mit höchstens `width` Punkten, absteigend nach Summe."""
+    start, end = _utc(start), _utc(end)
+    span = max((end - start).total_seconds(), 1.0)
+    bucket = choose_bucket(span, width)
+    n_buckets = math.ceil(span / bucket)
+
+    # ohne source: eine Reihe je Quelle, sonst je Typ
+    key = "type" if source else "source"
+    where = ["1 = 1"]
+    binds = [bindparam(name, type_=DateTime) for name in ("start", "end", "until")]
+    params = {
+        "start": _naive(start),
+        "end": _naive(end),
+        "until": _naive(min(end, datetime.now(timezone.utc))),
+        "t0": start.timestamp(),
+        "bucket": bucket,
+    }
+    if source:
+        where.append("source = :source")
+        params["source"] = source
+    type_filter = "1 = 1"
+    if types:
+        type_filter = "type IN :types"
+        binds.append(bindparam("types", expanding=True))
+        params["types"] = list(types)
+
+    if metric == "duration":
+        sql = _DURATION_SQL.format(key=key, where=" AND ".join(where), type_filter=type_filter)
+    else:
+        sql = _COUNT_SQL.format(key=key, where=" AND ".join(where + [type_filter]))
+    stmt = text(sql).bindparams(*[b for b in binds if f":{b.key}" in sql])
+
+    buckets: Dict[str, Dict[int, float]] = {}
+    for b, k, v in db.execute(stmt, params):
+        if v:
+            series = buckets.setdefault(k if k is not None else "(ohne)", {})
+            series[b] = series.get(b, 0.0) + v
+
+    totals = {k: sum(s.values()) for k, s in buckets.items()}
+    ranked = sorted(totals, key=totals.__getitem__, reverse=True)
+    if len(ranked) > MAX_SERIES:
+        other: Dict[int, float] = {}
+        for k in ranked[MAX_SERIES - 1:]:
+            for b, v in buckets.pop(k).items():
+                other[b] = other.get(b, 0.0) + v
+        buckets[OTHER] = other
+        totals[OTHER] = sum(other.values())
+        ranked = ranked[:MAX_SERIES - 1] + [OTHER]
+
+    t0_ms = int(start.timestamp() * 1000)
+    out = []
+    for k in ranked:
+        dense = [(t0_ms + i * bucket * 1000, buckets[k].get(i, 0.0)) for i in range(n_buckets)]
+        points = lttb(dense, width)
+        out.append({
+            "key": k,
+            "total": round(totals[k], 3),
+            "points": [[int(x), round(y, 3)] for x, y in points],
+        })
+
+    return {
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "metric": metric,
+        "bucket_seconds": bucket,
+        "downsampled": n_buckets > width,
+        "series": out,
+    }
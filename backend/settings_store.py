@@ -0,0 +1,168 @@
+# backend/settings_store.py
+"""
+Einstellungen: typisierter Cache im Speicher, versioniert, mit Push an Clients.
+
+- get_settings(db) liefert das gecachte SettingsOut – die settings-Tabelle
+  wird nur nach dem Start und nach einem Schreibzugriff gelesen.
+- save_settings(db, ...) schreibt, erhöht `settings_version` (in derselben
+  Transaktion, überlebt also Neustarts), verwirft den Cache und weckt alle
+  Wartenden.
+- wait_for_change(version, timeout) ist die Grundlage für den Long-Poll
+  GET /settings/watch: kehrt sofort zurück, wenn der Client eine andere
+  Version kennt, sonst bei der nächsten Änderung oder nach `timeout`.
+  Wartende belegen dabei weder einen Thread noch eine DB-Session.
+
+In-Process-Abnehmer (z.B. der Retention-Worker) hängen sich per subscribe() an.
+"""
+import asyncio
+import threading
+from typing import Callable, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from backend.models import Setting
+
+DEFAULT_RETENTION_DAYS = 7
+DEFAULT_SCREENSHOT_MAX_MB = 0  # 0 = kein Größenlimit, nur Alter zählt
+DEFAULT_SCREENSHOT_INTERVAL_SECONDS = 10
+
+VERSION_KEY = "settings_version"
+
+
+class SettingsIn(BaseModel):
+    screenshot_retention_days: int = DEFAULT_RETENTION_DAYS
+    # None = unverändert lassen (ältere Clients schicken nur die Tage)
+    screenshot_max_mb: Optional[int] = None
+    screenshot_interval_seconds: Optional[int] = None
+
+
+class SettingsOut(BaseModel):
+    version: int = 0
+    screenshot_retention_days: int = DEFAULT_RETENTION_DAYS
+    screenshot_max_mb: int = DEFAULT_SCREENSHOT_MAX_MB
+    screenshot_interval_seconds: int = DEFAULT_SCREENSHOT_INTERVAL_SECONDS
+
+
+def _get_int_setting(db: Session, key: str, default: int) -> int:
+    row = db.query(Setting).filter(Setting.key == key).first()
+    if row is None:
+        return default
+    try:
+        return int(row.value)
+    except ValueError:
+        return default
+
+
+def _set_setting(db: Session, key: str, value: str):
+    s = db.query(Setting).filter(Setting.key == key).first()
+    if s is None:
+        db.add(Setting(key=key, value=value))
+    else:
+        s.value = value
+
+
+def _load(db: Session) -> SettingsOut:
+    return SettingsOut(
+        version=_get_int_setting(db, VERSION_KEY, 0),
+        screenshot_retention_days=max(_get_int_setting(db, "screenshot_retention_days", DEFAULT_RETENTION_DAYS), 1),
+        screenshot_max_mb=max(_get_int_setting(db, "screenshot_max_mb", DEFAULT_SCREENSHOT_MAX_MB), 0),
+        screenshot_interval_seconds=max(
+            _get_int_setting(db, "screenshot_interval_seconds", DEFAULT_SCREENSHOT_INTERVAL_SECONDS), 1
+        ),
+    )
+
+
+class SettingsStore:
+    """
+    _lock schützt nur _cached und _waiters und wird auch auf dem Event-Loop
+    genommen (wait_for_change) – daher nie während DB-Zugriffen halten.
+    Schreiber serialisiert _write_lock (nur Worker-Threads).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._cached: Optional[SettingsOut] = None
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = set()
+        self._listeners: List[Callable[[SettingsOut], None]] = []
+
+    def get(self, db: Session) -> SettingsOut:
+        cached = self._cached
+        if cached is not None:
+            return cached
+        loaded = _load(db)
+        with self._lock:
+            # ein paralleles save() kann inzwischen einen neueren Stand gesetzt haben
+            if self._cached is None or self._cached.version < loaded.version:
+                self._cached = loaded
+            return self._cached
+
+    def invalidate(self):
+        with self._lock:
+            self._cached = None
+
+    def save(self, db: Session, settings: SettingsIn) -> SettingsOut:
+        with self._write_lock:
+            _set_setting(db, "screenshot_retention_days", str(max(settings.screenshot_retention_days, 1)))
+            if settings.screenshot_max_mb is not None:
+                _set_setting(db, "screenshot_max_mb", str(max(settings.screenshot_max_mb, 0)))
+            if settings.screenshot_interval_seconds is not None:
+                _set_setting(db, "screenshot_interval_seconds", str(max(settings.screenshot_interval_seconds, 1)))
+            _set_setting(db, VERSION_KEY, str(_get_int_setting(db, VERSION_KEY, 0) + 1))
+            db.commit()
+            current = _load(db)
+
+        with self._lock:
+            self._cached = current
+            waiters, self._waiters = self._waiters, set()
+
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future, current)
+        for listener in list(self._listeners):
+            try:
+                listener(current)
+            except Exception as e:
+                print(f"[ERROR] Settings-Listener fehlgeschlagen: {e}")
+        return current
+
+    def subscribe(self, listener: Callable[[SettingsOut], None]):
+        """listener(settings) wird nach jedem Speichern aufgerufen (im Thread des Schreibers)."""
+        self._listeners.append(listener)
+
+    async def wait_for_change(self, current: SettingsOut, known_version: int, timeout: float) -> SettingsOut:
+        """
+        `current` ist der aktuelle Stand (get()), `known_version` die Version des
+        Clients. Liefert den neuen Stand oder nach `timeout` den unveränderten.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        entry = (loop, future)
+        with self._lock:
+            latest = self._cached or current
+            if latest.version != known_version:
+                return latest
+            self._waiters.add(entry)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return self._cached or current
+        finally:
+            with self._lock:
+                self._waiters.discard(entry)
+
+
+def _resolve(future: asyncio.Future, settings: SettingsOut):
+    if not future.done():
+        future.set_result(settings)
+
+
+store = SettingsStore()
+
+
+def get_settings(db: Session) -> SettingsOut:
+    return store.get(db)
+
+
+def save_settings(db: Session, settings: SettingsIn) -> SettingsOut:
+    return store.save(db, settings)
@@ -0,0 +1,344 @@
+# backend/sketches.py
+"""
+Mergebare Sketches für Auswertungen über lange Zeiträume.
+
+Pro UTC-Tag werden in daily_sketches abgelegt:
+
+- window_time: Space-Saving über (app, title), gewichtet mit Sekunden –
+  die SKETCH_CAPACITY zeitintensivsten Fenster mit Fehlerschranke
+- titles:      HyperLogLog über (app, title) – Anzahl verschiedener Fenster
+- urls:        HyperLogLog über besuchte URLs
+
+Für einen beliebigen Zeitraum werden nur die Tages-Sketches zusammengeführt.
+Speicher und Rechenzeit hängen damit von Kapazität und Anzahl Tage ab, nicht
+von der Anzahl Events oder verschiedener Titel.
+
+Ein Tag wird erst gespeichert, wenn er SETTLE_SECONDS vorbei ist (späte
+Events der Collector-Puffer); der laufende Tag wird bei Bedarf frisch gebaut.
+Kommen danach noch Events für einen Tag, verwirft der Ingest dessen
+gespeicherte Sketches (invalidate_days).
+"""
+import base64
+import hashlib
+import json
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.orm import Session
+
+from backend import durations
+from backend.models import DailySketch
+
+SKETCH_CAPACITY = 500
+HLL_PRECISION = 12  # 4096 Register, Standardfehler ~1,6 %
+SETTLE_SECONDS = 3600
+KINDS = ("window_time", "titles", "urls")
+
+Key = Tuple[Optional[str], Optional[str]]
+
+
+# =========================
+# Space-Saving (gewichtet)
+# =========================
+
+class SpaceSaving:
+    """
+    Top-K nach Gewicht mit höchstens `capacity` Zählern. counts[key] ist eine
+    Obergrenze, counts[key] - errors[key] eine Untergrenze des wahren Werts;
+    jeder Schlüssel ohne Zähler liegt höchstens bei `floor`.
+    """
+
+    def __init__(self, capacity: int = SKETCH_CAPACITY, floor: float = 0.0):
+        self.capacity = capacity
+        self.counts: Dict[str, float] = {}
+        self.errors: Dict[str, float] = {}
+        self._floor = floor
+
+    @property
+    def floor(self) -> float:
+        if len(self.counts) >= self.capacity:
+            return max(self._floor, min(self.counts.values()))
+        return self._floor
+
+    @classmethod
+    def from_sorted(cls, items: Iterable[Tuple[str, float]], capacity: int = SKETCH_CAPACITY) -> "SpaceSaving":
+        """
+        Aus bereits exakt aggregierten (key, Gewicht), absteigend sortiert: die
+        ersten `capacity` sind exakt, der nächste Wert begrenzt alle übrigen.
+        """
+        s = cls(capacity)
+        for key, weight in items:
+            if len(s.counts) >= capacity:
+                s._floor = weight
+                break
+            s.counts[key] = weight
+            s.errors[key] = 0.0
+        return s
+
+    @classmethod
+    def merge(cls, sketches: Iterable["SpaceSaving"], capacity: int = SKETCH_CAPACITY) -> "SpaceSaving":
+        sketches = list(sketches)
+        floors = [s.floor for s in sketches]
+        total_floor = sum(floors)
+        # Schlüssel, die in einem Sketch fehlen, zählen dort mit dessen floor:
+        # count = Summe vorhandener Zähler + total_floor - floors der Sketches mit Schlüssel.
+        # So wird jeder Sketch nur einmal durchlaufen, statt Schlüssel × Sketches.
+        counts: Dict[str, float] = {}
+        errors: Dict[str, float] = {}
+        for s, floor in zip(sketches, floors):
+            for key, count in s.counts.items():
+                counts[key] = counts.get(key, total_floor) + count - floor
+                errors[key] = errors.get(key, total_floor) + s.errors[key] - floor
+
+        ranked = sorted(counts, key=counts.__getitem__, reverse=True)
+        merged = cls(capacity, floor=sum(floors))
+        for key in ranked[:capacity]:
+            merged.counts[key] = counts[key]
+            merged.errors[key] = errors[key]
+        if len(ranked) > capacity:
+            merged._floor = max(merged._floor, counts[ranked[capacity]])
+        return merged
+
+    def top(self, n: int) -> List[Tuple[str, float, float]]:
+        """(key, Schätzwert, Fehlerschranke), nach Schätzwert absteigend."""
+        ranked = sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)[:n]
+        return [(key, count, self.errors[key]) for key, count in ranked]
+
+    def dumps(self) -> str:
+        return json.dumps({
+            "c": self.capacity,
+            "f": self._floor,
+            "k": [[k, v, self.errors[k]] for k, v in self.counts.items()],
+        }, ensure_ascii=False)
+
+    @classmethod
+    def loads(cls, data: str) -> "SpaceSaving":
+        raw = json.loads(data)
+        s = cls(raw["c"], raw["f"])
+        for key, count, err in raw["k"]:
+            s.counts[key] = count
+            s.errors[key] = err
+        return s
+
+
+# =========================
+# HyperLogLog
+# =========================
+
+class HyperLogLog:
+    def __init__(self, precision: int = HLL_PRECISION, registers: Optional[bytearray] = None):
+        self.p = precision
+        self.m = 1 << precision
+        self.registers = registers if registers is not None else bytearray(self.m)
+
+    def add(self, value: str):
+        h = int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+        idx = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def merge(self, other: "HyperLogLog"):
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> float:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            return self.m * math.log(self.m / zeros)  # Linear Counting für kleine Mengen
+        return estimate
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self.m)
+
+    def dumps(self) -> str:
+        return json.dumps({"p": self.p, "r": base64.b64encode(bytes(self.registers)).decode("ascii")})
+
+    @classmethod
+    def loads(cls, data: str) -> "HyperLogLog":
+        raw = json.loads(data)
+        return cls(raw["p"], bytearray(base64.b64decode(raw["r"])))
+
+
+# =========================
+# Tages-Sketches bauen und laden
+# =========================
+
+def window_key(app: Optional[str], title: Optional[str]) -> str:
+    return json.dumps([app, title], ensure_ascii=False)
+
+
+def parse_window_key(key: str) -> Key:
+    app, title = json.loads(key)
+    return app, title
+
+
+def _day_bounds(day: date) -> Tuple[datetime, datetime]:
+    start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+_URL_SQL = text("""
+    SELECT json_extract(payload, '$.url') FROM events
+    WHERE source = 'browser' AND timestamp >= :start AND timestamp < :end
+    UNION
+    SELECT url FROM browser_events
+    WHERE timestamp >= :start AND timestamp < :end
+""").bindparams(bindparam("start", type_=DateTime), bindparam("end", type_=DateTime))
+
+
+def _window_rows(db: Session, start: datetime, end: datetime, until: datetime) -> List[Tuple[str, float]]:
+    # [start, end) wie bei den URLs: ein Wechsel um 00:00 gehört zum Folgetag.
+    # SQLite aggregiert exakt und sortiert absteigend – Python sieht jede (app, title) einmal
+    return [
+        (window_key(row.app, row.title), row.seconds)
+        for row in durations.top_windows(db, start, end, limit=None, until=until, exclusive_end=True)
+    ]
+
+
+def build_day(db: Session, day: date) -> Dict[str, str]:
+    """Sketches eines Tages aus den Events bauen (serialisiert, je kind)."""
+    start, end = _day_bounds(day)
+    # das letzte Fenster des Tages läuft bis zum ersten Fensterwechsel danach
+    rows = _window_rows(db, start, end, durations.span_end(db, end))
+    space = SpaceSaving.from_sorted(rows)
+    titles = HyperLogLog()
+    for key, _ in rows:
+        titles.add(key)
+
+    urls = HyperLogLog()
+    for (url,) in db.execute(_URL_SQL, {"start": start, "end": end}):
+        if url:
+            urls.add(url)
+
+    return {"window_time": space.dumps(), "titles": titles.dumps(), "urls": urls.dumps()}
+
+
+def load_days(db: Session, days: List[date]) -> Dict[date, Dict[str, str]]:
+    """Gespeicherte Sketches laden, fehlende bauen (und speichern, wenn der Tag abgeschlossen ist)."""
+    keys = [d.isoformat() for d in days]
+    stored: Dict[date, Dict[str, str]] = {}
+    for row in db.query(DailySketch).filter(DailySketch.day.in_(keys)):
+        stored.setdefault(date.fromisoformat(row.day), {})[row.kind] = row.data
+
+    settled = datetime.now(timezone.utc) - timedelta(seconds=SETTLE_SECONDS)
+    dirty = False
+    for day in days:
+        if day in stored and set(stored[day]) == set(KINDS):
+            continue
+        stored[day] = build_day(db, day)
+        if _day_bounds(day)[1] <= settled:
+            for kind, data in stored[day].items():
+                db.merge(DailySketch(day=day.isoformat(), kind=kind, data=data))
+            dirty = True
+    if dirty:
+        db.commit()
+    return stored
+
+
+def invalidate_days(db: Session, timestamps: Iterable[Optional[datetime]]):
+    """
+    Beim Ingest vor dem Commit: gespeicherte Sketches der Tage verwerfen, für
+    die Events nachkamen – sie werden beim nächsten Abruf neu gebaut. Der
+    Vortag zählt mit, weil sein letztes Fenster bis zum ersten Wechsel danach läuft.
+    Events des laufenden Tages kosten keine Abfrage.
+    """
+    today = datetime.now(timezone.utc).date()
+    days = set()
+    for ts in timestamps:
+        if ts is None:
+            continue
+        day = _utc(ts).date()
+        if day < today:
+            days.update((day.isoformat(), (day - timedelta(days=1)).isoformat()))
+    if days:
+        db.query(DailySketch).filter(DailySketch.day.in_(days)).delete(synchronize_session=False)
+
+
+@dataclass
+class ApproxWindow:
+    app: Optional[str]
+    title: Optional[str]
+    seconds: float
+    error_seconds: float
+
+
+@dataclass
+class ApproxDistinct:
+    windows: float
+    urls: float
+    relative_error: float
+
+
+def _utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def days_in_range(start: datetime, end: datetime) -> List[date]:
+    """Alle UTC-Tage, die [start, end) berühren."""
+    first = _utc(start).date()
+    last = (_utc(end) - timedelta(microseconds=1)).date()
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+def _split_range(start: datetime, end: datetime):
+    """
+    [start, end) → (angeschnittener Anfang, ganze UTC-Tage, angeschnittenes Ende);
+    die Ränder als (von, bis) oder None.
+    """
+    start, end = _utc(start), _utc(end)
+    first_full = _day_bounds(start.date())[0]
+    if first_full < start:
+        first_full += timedelta(days=1)
+    last_full = _day_bounds(end.date())[0]
+    if first_full >= last_full:
+        # kein ganzer Tag dazwischen: alles ist Rand
+        return (start, end), [], None
+    head = (start, first_full) if start < first_full else None
+    tail = (last_full, end) if last_full < end else None
+    days = [first_full.date() + timedelta(days=i) for i in range((last_full - first_full).days)]
+    return head, days, tail
+
+
+def approx_top_windows(db: Session, start: datetime, end: datetime, limit: int) -> List[ApproxWindow]:
+    """
+    Top-Fenster in [start, end): ganze UTC-Tage aus den Tages-Sketches, die
+    angeschnittenen Randtage exakt aus den Events. seconds ist eine Obergrenze,
+    seconds - error_seconds eine Untergrenze (nur Space-Saving-Fehler).
+    """
+    head, days, tail = _split_range(start, end)
+    end = _utc(end)
+    rows = _window_rows(db, tail[0], end, end) if tail else []
+    # Das letzte Fenster eines gespeicherten Tages läuft bis zum nächsten
+    # Wechsel. Damit das nicht über `end` hinausgeht, muss das exakte Ende
+    # einen Wechsel enthalten – notfalls ganze Tage vom Ende her dazunehmen.
+    while days and not rows:
+        rows = _window_rows(db, _day_bounds(days.pop())[0], end, end)
+    parts = [SpaceSaving.loads(s["window_time"]) for s in load_days(db, days).values()]
+    parts.append(SpaceSaving.from_sorted(rows))
+    if head is not None:
+        # läuft wie ein ganzer Tag bis zum ersten Wechsel danach weiter
+        until = durations.span_end(db, head[1]) if rows else end
+        parts.append(SpaceSaving.from_sorted(_window_rows(db, head[0], head[1], until)))
+    merged = SpaceSaving.merge(parts)
+    return [
+        ApproxWindow(*parse_window_key(key), seconds=count, error_seconds=err)
+        for key, count, err in merged.top(limit)
+    ]
+
+
+def approx_distinct(db: Session, start: datetime, end: datetime) -> ApproxDistinct:
+    sketches = load_days(db, days_in_range(start, end))
+    windows, urls = HyperLogLog(), HyperLogLog()
+    for s in sketches.values():
+        windows.merge(HyperLogLog.loads(s["titles"]))
+        urls.merge(HyperLogLog.loads(s["urls"]))
+    return ApproxDistinct(windows=windows.count(), urls=urls.count(), relative_error=windows.relative_error)
@@ -0,0 +1,1070 @@
+// --- Theme-Handling ---
+function applyTheme(theme) {
+    const html = document.documentElement;
+    const btnIcon = document.querySelector(".theme-toggle-icon");
+    html.setAttribute("data-theme", theme);
+    localStorage.setItem("lat-theme", theme);
+    if (btnIcon) {
+        btnIcon.textContent = theme === "light" ? "☀" : "🌙";
+    }
+}
+
+function initTheme() {
+    const saved = localStorage.getItem("lat-theme");
+    const prefersDark = window.matchMedia && window.matchMedia("(prefers-color-scheme: dark)").matches;
+    let theme = "dark";
+
+    if (saved === "dark" || saved === "light") {
+        theme = saved;
+    } else {
+        theme = prefersDark ? "dark" : "light";
+    }
+    applyTheme(theme);
+}
+
+// --- Helpers ---
+async function fetchJSON(url) {
+    const res = await fetch(url);
+    if (!res.ok) throw new Error("HTTP " + res.status);
+    return res.json();
+}
+
+function formatTimestamp(ts) {
+    try {
+        const d = new Date(ts);
+        return d.toLocaleString("de-DE");
+    } catch {
+        return ts;
+    }
+}
+
+function shortPayload(payload) {
+    if (!payload) return "";
+    if (payload.app || payload.title) {
+        return [payload.app, payload.title].filter(Boolean).join(" – ");
+    }
+    if (payload.path) {
+        return payload.path;
+    }
+    if (payload.key) {
+        return "Key: " + payload.key;
+    }
+    if (payload.button) {
+        return "Mouse " + payload.button + " @ (" + payload.x + "," + payload.y + ")";
+    }
+    return JSON.stringify(payload).slice(0, 80) + (JSON.stringify(payload).length > 80 ? "…" : "");
+}
+
+// --- Renderer generisch ---
+function renderTopWindows(data, tableId) {
+    const tbody = document.querySelector("#" + tableId + " tbody");
+    if (!tbody) return;
+    tbody.innerHTML = "";
+
+    if (!data || data.length === 0) {
+        const tr = document.createElement("tr");
+        tr.innerHTML = '<td colspan="4" class="muted">Keine Daten verfügbar.</td>';
+        tbody.appendChild(tr);
+        return;
+    }
+
+    data.forEach(row => {
+        const tr = document.createElement("tr");
+        const app = row.app || "(unbekannt)";
+        const title = row.title || "";
+        const minutes = typeof row.total_minutes === "number" ? row.total_minutes.toFixed(1) : "–";
+        const hours = typeof row.total_hours === "number" ? row.total_hours.toFixed(2) : "–";
+        tr.innerHTML = `
+            <td>${app}</td>
+            <td>${title}</td>
+            <td>${minutes}</td>
+            <td>${hours}</td>
+        `;
+        tbody.appendChild(tr);
+    });
+}
+
+function renderTimeline(data, tableId, sourceOverride) {
+    const tbody = document.querySelector("#" + tableId + " tbody");
+    if (!tbody) return;
+    tbody.innerHTML = "";
+
+    if (!data || data.length === 0) {
+        const tr = document.createElement("tr");
+        tr.innerHTML = '<td colspan="4" class="muted">Keine Daten verfügbar.</td>';
+        tbody.appendChild(tr);
+        return;
+    }
+
+    data.forEach(ev => {
+        const tr = document.createElement("tr");
+        const source = sourceOverride || ev.source;
+        tr.innerHTML = `
+            <td><span class="timestamp">${formatTimestamp(ev.timestamp)}</span></td>
+            <td><span class="source-pill" data-source="${source}">${source}</span></td>
+            <td>${ev.type}</td>
+            <td class="details-cell">${shortPayload(ev.payload)}</td>
+        `;
+        tbody.appendChild(tr);
+    });
+}
+
+function renderRoutines(data, tableId) {
+    const tbody = document.querySelector("#" + tableId + " tbody");
+    if (!tbody) return;
+    tbody.innerHTML = "";
+
+    if (!data || data.length === 0) {
+        const tr = document.createElement("tr");
+        tr.innerHTML = '<td colspan="3" class="muted">Noch keine Routinen gefunden.</td>';
+        tbody.appendChild(tr);
+        return;
+    }
+
+    data.forEach(r => {
+        const tr = document.createElement("tr");
+        const seqText = (r.sequence || [])
+            .map(s => (s.app || "??") + " – " + (s.title || ""))
+            .join("  →  ");
+        tr.innerHTML = `
+            <td>${seqText}</td>
+            <td>${r.count}</td>
+            <td>${(r.total_hours || 0).toFixed(2)}</td>
+        `;
+        tbody.appendChild(tr);
+    });
+}
+
+function renderAutomation(data, tableId) {
+    const tbody = document.querySelector("#" + tableId + " tbody");
+    if (!tbody) return;
+    tbody.innerHTML = "";
+
+    if (!data || data.length === 0) {
+        const tr = document.createElement("tr");
+        tr.innerHTML = '<td colspan="5" class="muted">Noch keine Kandidaten gefunden.</td>';
+        tbody.appendChild(tr);
+        return;
+    }
+
+    data.forEach(c => {
+        const tr = document.createElement("tr");
+        tr.innerHTML = `
+            <td>${c.app || "??"}</td>
+            <td>${c.title || ""}</td>
+            <td>${(c.avg_minutes_per_day || 0).toFixed(1)}</td>
+            <td>${(c.yearly_hours || 0).toFixed(1)}</td>
+            <td>${(c.potential_savings_per_year || 0).toFixed(0)}</td>
+        `;
+        tbody.appendChild(tr);
+    });
+}
+
+function renderInput(data, tableId) {
+    const tbody = document.querySelector("#" + tableId + " tbody");
+    if (!tbody) return;
+    tbody.innerHTML = "";
+
+    if (!data || data.length === 0) {
+        const tr = document.createElement("tr");
+        tr.innerHTML = '<td colspan="4" class="muted">Keine Input-Daten gefunden.</td>';
+        tbody.appendChild(tr);
+        return;
+    }
+
+    data.forEach(ev => {
+        const p = ev.payload || {};
+        const appTitle = [p.app, p.title].filter(Boolean).join(" – ");
+        let detail = "";
+        if (p.key) {
+            detail = "Key: " + p.key;
+        } else if (p.button) {
+            detail = "Mouse " + p.button + " @ (" + p.x + "," + p.y + ")";
+        } else if (typeof p.x === "number" && typeof p.y === "number") {
+            detail = "Move @ (" + p.x + "," + p.y + ")";
+        } else {
+            detail = shortPayload(p);
+        }
+
+        const tr = document.createElement("tr");
+        tr.innerHTML = `
+            <td><span class="timestamp">${formatTimestamp(ev.timestamp)}</span></td>
+            <td>${ev.type}</td>
+            <td>${appTitle}</td>
+            <td class="details-cell">${detail}</td>
+        `;
+        tbody.appendChild(tr);
+    });
+}
+
+function renderDocuments(data, tableId) {
+    const tbody = document.querySelector("#" + tableId + " tbody");
+    if (!tbody) return;
+    tbody.innerHTML = "";
+
+    if (!data || data.length === 0) {
+        const tr = document.createElement("tr");
+        tr.innerHTML = '<td colspan="4" class="muted">Keine Dokument-Events gefunden.</td>';
+        tbody.appendChild(tr);
+        return;
+    }
+
+    data.forEach(ev => {
+        const p = ev.payload || {};
+        const path = p.path || "(kein Pfad)";
+        const detail = shortPayload(p);
+
+        const tr = document.createElement("tr");
+        tr.innerHTML = `
+            <td><span class="timestamp">${formatTimestamp(ev.timestamp)}</span></td>
+            <td>${ev.type}</td>
+            <td>${path}</td>
+            <td class="details-cell">${detail}</td>
+        `;
+        tbody.appendChild(tr);
+    });
+}
+
+function renderScreenshots(data) {
+    const tbody = document.querySelector("#screenshot-table tbody");
+    if (!tbody) return;
+    tbody.innerHTML = "";
+
+    if (!data || data.length === 0) {
+        const tr = document.createElement("tr");
+        tr.innerHTML = '<td colspan="5" class="muted">Noch keine Screenshots im Zeitraum.</td>';
+        tbody.appendChild(tr);
+        return;
+    }
+
+    data.forEach(item => {
+        const tr = document.createElement("tr");
+        const sizeMb = item.size_bytes ? (item.size_bytes / (1024 * 1024)).toFixed(2) + " MB" : "–";
+        const thumb = item.thumb_url
+            ? `<a href="${item.url}" target="_blank"><img src="${item.thumb_url}" loading="lazy" width="160" alt=""></a>`
+            : "";
+        tr.innerHTML = `
+            <td>${thumb}</td>
+            <td><span class="timestamp">${formatTimestamp(item.timestamp)}</span></td>
+            <td>${item.filename || ""}</td>
+            <td>${item.path || ""}</td>
+            <td>${sizeMb}</td>
+        `;
+        tbody.appendChild(tr);
+    });
+}
+
+// --- Date Range / Filter ---
+const pageState = {};
+
+function getPresetRange(preset) {
+    const now = new Date();
+    const end = new Date(now);
+    let start = new Date(now);
+
+    function startOfDay(d) {
+        return new Date(d.getFullYear(), d.getMonth(), d.getDate(), 0, 0, 0, 0);
+    }
+
+    switch (preset) {
+        case "today":
+            start = startOfDay(now);
+            break;
+        case "week":
+            start = new Date(now);
+            start.setDate(start.getDate() - 6);
+            start = startOfDay(start);
+            break;
+        case "month":
+            start = new Date(now);
+            start.setDate(start.getDate() - 29);
+            start = startOfDay(start);
+            break;
+        case "quarter":
+            start = new Date(now);
+            start.setDate(start.getDate() - 89);
+            start = startOfDay(start);
+            break;
+        case "year":
+            start = new Date(now);
+            start.setDate(start.getDate() - 364);
+            start = startOfDay(start);
+            break;
+        default:
+            start = startOfDay(now);
+    }
+    return { from: start, to: end };
+}
+
+function getCustomRange(page) {
+    const fromEl = document.getElementById("filter-from-" + page);
+    const toEl = document.getElementById("filter-to-" + page);
+    if (!fromEl || !toEl || !fromEl.value || !toEl.value) return null;
+
+    const from = new Date(fromEl.value + "T00:00:00");
+    const to = new Date(toEl.value + "T23:59:59");
+    if (isNaN(from.getTime()) || isNaN(to.getTime()) || from > to) {
+        return null;
+    }
+    return { from, to };
+}
+
+function formatRangeLabel(range, presetLabel) {
+    if (!range) return "";
+    const fromStr = range.from.toLocaleDateString("de-DE");
+    const toStr = range.to.toLocaleDateString("de-DE");
+    return `Zeitraum: ${fromStr} – ${toStr}` + (presetLabel ? ` (${presetLabel})` : "");
+}
+
+function updateFilterSummary(page) {
+    const state = pageState[page];
+    const el = document.getElementById("filter-summary-" + page);
+    if (!el || !state || !state.range) return;
+    el.textContent = formatRangeLabel(state.range, state.presetLabel);
+}
+
+function rangeToQuery(range) {
+    if (!range) return "";
+    const params = new URLSearchParams();
+    params.set("from", range.from.toISOString());
+    params.set("to", range.to.toISOString());
+    return params.toString();
+}
+
+// --- Page Loader ---
+async function loadDashboard(range) {
+    const statusEl = document.getElementById("status");
+    try {
+        const qs = rangeToQuery(range);
+        statusEl.textContent = "Lade Dashboard…";
+
+        // Optional: Dashboard-Summary (kannst du im Backend nachrüsten)
+        try {
+            const summary = await fetchJSON("/analysis/dashboard/summary?" + qs);
+            if (summary) {
+                document.getElementById("kpi-active-time").textContent =
+                    (summary.total_active_hours || 0).toFixed(1) + " h";
+                document.getElementById("kpi-keystrokes").textContent =
+                    summary.total_keystrokes ?? "–";
+                document.getElementById("kpi-clicks").textContent =
+                    summary.total_clicks ?? "–";
+                document.getElementById("kpi-doc-events").textContent =
+                    summary.document_events ?? "–";
+                document.getElementById("kpi-browser-events").textContent =
+                    summary.browser_events ?? "–";
+                document.getElementById("kpi-screenshots").textContent =
+                    summary.screenshot_count ?? "–";
+                document.getElementById("kpi-coverage-sub").textContent =
+                    "Coverage: " + (summary.coverage_percent != null ? summary.coverage_percent.toFixed(0) + "%" : "n/a");
+            }
+        } catch (e) {
+            // Wenn Endpoint noch nicht existiert, einfach ignorieren
+            console.warn("Dashboard summary not available:", e);
+        }
+
+        const top = await fetchJSON("/analysis/top-windows?limit=10&" + qs);
+        renderTopWindows(top, "top-windows-table");
+
+        const timeline = await fetchJSON("/analysis/timeline?limit=200&" + qs);
+        renderTimeline(timeline, "timeline-table");
+
+        const routines = await fetchJSON("/analysis/routines?limit=10&" + qs);
+        renderRoutines(routines, "routines-table");
+
+        const automation = await fetchJSON("/analysis/automation-candidates?limit=10&" + qs);
+        renderAutomation(automation, "automation-table");
+
+        // Dashboard eigene kompakte "Letzte Activities"
+        renderTimeline(timeline.slice(0, 50), "dashboard-latest-table");
+
+        // Top Fenster nach Input (Client-seitig aus Timeline ableitbar, wenn Payload.app/title gesetzt)
+        const inputEvents = timeline.filter(ev => ev.source === "input");
+        const topMap = {};
+        inputEvents.forEach(ev => {
+            const p = ev.payload || {};
+            const key = [p.app, p.title].filter(Boolean).join(" – ") || "Unbekannt";
+            topMap[key] = (topMap[key] || 0) + 1;
+        });
+        const topSorted = Object.entries(topMap).sort((a, b) => b[1] - a[1]).slice(0, 10);
+        const tiBody = document.querySelector("#dashboard-top-input-windows tbody");
+        if (tiBody) {
+            tiBody.innerHTML = "";
+            if (topSorted.length === 0) {
+                const tr = document.createElement("tr");
+                tr.innerHTML = '<td colspan="3" class="muted">Keine Input-Daten verfügbar.</td>';
+                tiBody.appendChild(tr);
+            } else {
+                topSorted.forEach(([key, count]) => {
+                    const tr = document.createElement("tr");
+                    tr.innerHTML = `
+                        <td>${key}</td>
+                        <td></td>
+                        <td>${count}</td>
+                    `;
+                    tiBody.appendChild(tr);
+                });
+            }
+        }
+
+        statusEl.textContent = "Letzte Aktualisierung: " + new Date().toLocaleTimeString("de-DE");
+    } catch (e) {
+        console.error(e);
+        if (statusEl) statusEl.textContent = "Fehler beim Laden der Dashboard-Daten: " + e.message;
+    }
+}
+
+async function loadWindows(range) {
+    const statusEl = document.getElementById("status");
+    try {
+        const qs = rangeToQuery(range);
+        statusEl.textContent = "Lade Fenster-Daten…";
+
+        const top = await fetchJSON("/analysis/top-windows?limit=20&" + qs);
+        renderTopWindows(top, "windows-top-table");
+
+        const timeline = await fetchJSON("/analysis/timeline?source=window&limit=500&" + qs);
+        renderTimeline(timeline, "windows-timeline-table", "window");
+
+        // KPI-Berechnung
+        let totalMinutes = 0;
+        let appCount = 0;
+        let topApp = "-";
+        let switches = 0;
+
+        if (Array.isArray(top) && top.length > 0) {
+            appCount = top.length;
+            totalMinutes = top.reduce((sum, r) => sum + (r.total_minutes || 0), 0);
+            const sorted = [...top].sort((a, b) => (b.total_minutes || 0) - (a.total_minutes || 0));
+            const best = sorted[0] || {};
+            topApp = (best.app || "") + (best.title ? " – " + best.title : "");
+        }
+
+        switches = Array.isArray(timeline) ? timeline.length : 0;
+
+        const hr = totalMinutes / 60;
+        const activeTimeEl = document.getElementById("win-kpi-active-time");
+        if (activeTimeEl) activeTimeEl.textContent = hr ? hr.toFixed(1) + " h" : "–";
+        const appCountEl = document.getElementById("win-kpi-app-count");
+        if (appCountEl) appCountEl.textContent = appCount || "–";
+        const topAppEl = document.getElementById("win-kpi-top-app");
+        if (topAppEl) topAppEl.textContent = topApp || "–";
+        const switchesEl = document.getElementById("win-kpi-switches");
+        if (switchesEl) switchesEl.textContent = switches || "–";
+
+        statusEl.textContent = "Letzte Aktualisierung: " + new Date().toLocaleTimeString("de-DE");
+    } catch (e) {
+        console.error(e);
+        if (statusEl) statusEl.textContent = "Fehler beim Laden der Fenster-Daten: " + e.message;
+    }
+}
+
+const SERIES_COLORS = ["#60a5fa", "#f59e0b", "#34d399", "#f472b6", "#a78bfa"];
+
+function renderSeriesChart(data, elementId) {
+    const el = document.getElementById(elementId);
+    if (!el) return;
+    const series = (data && data.series) || [];
+    if (!series.length) {
+        el.classList.add("muted");
+        el.textContent = "Keine Input-Daten gefunden.";
+        return;
+    }
+    el.classList.remove("muted");
+
+    const t0 = Date.parse(data.from);
+    const t1 = Date.parse(data.to);
+    let max = 1;
+    series.forEach(s => s.points.forEach(([, v]) => { if (v > max) max = v; }));
+
+    const W = 1000, H = 160;
+    const lines = series.map((s, i) => {
+        const pts = s.points.map(([t, v]) =>
+            ((t - t0) / (t1 - t0) * W).toFixed(1) + "," + (H - v / max * (H - 4)).toFixed(1)
+        ).join(" ");
+        return `<polyline fill="none" stroke="${SERIES_COLORS[i % SERIES_COLORS.length]}"
+            stroke-width="1.5" vector-effect="non-scaling-stroke" points="${pts}"></polyline>`;
+    }).join("");
+    const legend = series.map((s, i) =>
+        `<span style="color:${SERIES_COLORS[i % SERIES_COLORS.length]}">● ${s.key} (${s.total})</span>`
+    ).join("");
+
+    el.innerHTML = `<svg viewBox="0 0 ${W} ${H}" preserveAspectRatio="none">${lines}</svg>
+        <div class="series-legend">${legend}</div>`;
+    const sub = document.getElementById(elementId.replace("-chart", "-sub"));
+    const b = data.bucket_seconds;
+    const bucket = b >= 86400 ? (b / 86400) + " Tag(e)" : b >= 3600 ? (b / 3600) + " h" : b >= 60 ? (b / 60) + " min" : b + " s";
+    if (sub) sub.textContent = "Events pro " + bucket + (data.downsampled ? " (auf Diagrammbreite reduziert)" : "");
+}
+
+async function loadInputPage(range) {
+    const statusEl = document.getElementById("status");
+    try {
+        const qs = rangeToQuery(range);
+        statusEl.textContent = "Lade Input-Daten…";
+        const chartEl = document.getElementById("input-series-chart");
+        const width = Math.max(100, Math.min(2000, Math.round(chartEl ? chartEl.clientWidth : 600)));
+        const [data, series] = await Promise.all([
+            fetchJSON("/analysis/timeline?source=input&limit=1000&" + qs),
+            fetchJSON("/analysis/series?source=input&type=mouse_click_down&type=key_down&type=mouse_scroll"
+                + "&width=" + width + "&" + qs),
+        ]);
+        renderInput(data, "input-table");
+        renderSeriesChart(series, "input-series-chart");
+
+        // KPIs aus den exakten Summen der Zeitreihe, nicht aus den letzten 1000 Events
+        const totals = {};
+        (series.series || []).forEach(s => { totals[s.key] = s.total; });
+        const appCounts = {};
+        (data || []).forEach(ev => {
+            const p = ev.payload || {};
+            const key = [p.app, p.title].filter(Boolean).join(" – ") || "Unbekannt";
+            appCounts[key] = (appCounts[key] || 0) + 1;
+        });
+
+        const clicksEl = document.getElementById("input-kpi-clicks");
+        if (clicksEl) clicksEl.textContent = totals.mouse_click_down || "–";
+        const keysEl = document.getElementById("input-kpi-keystrokes");
+        if (keysEl) keysEl.textContent = totals.key_down || "–";
+        const scrollEl = document.getElementById("input-kpi-scrolls");
+        if (scrollEl) scrollEl.textContent = totals.mouse_scroll || "–";
+
+        const topEntry = Object.entries(appCounts).sort((a, b) => b[1] - a[1])[0];
+        const topAppEl = document.getElementById("input-kpi-top-app");
+        if (topAppEl) topAppEl.textContent = topEntry ? topEntry[0] : "–";
+
+        statusEl.textContent = "Letzte Aktualisierung: " + new Date().toLocaleTimeString("de-DE");
+    } catch (e) {
+        console.error(e);
+        if (statusEl) statusEl.textContent = "Fehler beim Laden der Input-Daten: " + e.message;
+    }
+}
+
+async function loadDocumentsPage(range) {
+    const statusEl = document.getElementById("status");
+    try {
+        const qs = rangeToQuery(range);
+        statusEl.textContent = "Lade Dokument-Daten…";
+        const data = await fetchJSON("/analysis/timeline?source=document&limit=1000&" + qs);
+        renderDocuments(data, "document-table");
+
+        let total = 0, created = 0, deleted = 0;
+        const extCounts = {};
+
+        (data || []).forEach(ev => {
+            total++;
+            if (ev.type === "created") created++;
+            if (ev.type === "deleted") deleted++;
+            const p = ev.payload || {};
+            const path = p.path || "";
+            const match = path.match(/\.[^\.\\\/]+$/);
+            const ext = match ? match[0].toLowerCase() : "(ohne)";
+            extCounts[ext] = (extCounts[ext] || 0) + 1;
+        });
+
+        const totalEl = document.getElementById("doc-kpi-total");
+        if (totalEl) totalEl.textContent = total || "–";
+        const createdEl = document.getElementById("doc-kpi-created");
+        if (createdEl) createdEl.textContent = created || "–";
+        const deletedEl = document.getElementById("doc-kpi-deleted");
+        if (deletedEl) deletedEl.textContent = deleted || "–";
+
+        const topExt = Object.entries(extCounts).sort((a, b) => b[1] - a[1])[0];
+        const extEl = document.getElementById("doc-kpi-top-ext");
+        if (extEl) extEl.textContent = topExt ? `${topExt[0]} (${topExt[1]})` : "–";
+
+        statusEl.textContent = "Letzte Aktualisierung: " + new Date().toLocaleTimeString("de-DE");
+    } catch (e) {
+        console.error(e);
+        if (statusEl) statusEl.textContent = "Fehler beim Laden der Dokument-Daten: " + e.message;
+    }
+}
+
+async function loadScreenshotsPage(range) {
+    const statusEl = document.getElementById("status");
+    try {
+        const qs = rangeToQuery(range);
+        statusEl.textContent = "Lade Screenshot-Daten…";
+        // Diese Endpoints kannst du im Backend ergänzen:
+        const summaryPromise = fetchJSON("/analysis/screenshots/summary?" + qs).catch(() => null);
+        const listPromise = fetchJSON("/analysis/screenshots/list?limit=200&" + qs).catch(() => []);
+
+        const summary = await summaryPromise;
+        const list = await listPromise;
+
+        renderScreenshots(list);
+
+        if (summary) {
+            const countEl = document.getElementById("ss-kpi-count");
+            if (countEl) countEl.textContent = summary.count ?? "–";
+
+            const intervalEl = document.getElementById("ss-kpi-interval");
+            if (intervalEl) intervalEl.textContent =
+                summary.avg_interval_seconds != null ? summary.avg_interval_seconds.toFixed(0) + " s" : "–";
+
+            const sizeEl = document.getElementById("ss-kpi-size");
+            if (sizeEl) {
+                const mb = summary.total_size_bytes ? summary.total_size_bytes / (1024 * 1024) : 0;
+                sizeEl.textContent = mb ? mb.toFixed(2) + " MB" : "–";
+            }
+
+            const covEl = document.getElementById("ss-kpi-coverage");
+            if (covEl) covEl.textContent =
+                summary.coverage_percent != null ? summary.coverage_percent.toFixed(0) + "%" : "–";
+        }
+
+        statusEl.textContent = "Letzte Aktualisierung: " + new Date().toLocaleTimeString("de-DE");
+    } catch (e) {
+        console.error(e);
+        if (statusEl) statusEl.textContent = "Fehler beim Laden der Screenshot-Daten: " + e.message;
+    }
+}
+
+async function loadBrowserPage(range) {
+    const statusEl = document.getElementById("status");
+    try {
+        const qs = rangeToQuery(range);
+        statusEl.textContent = "Lade Browser-Daten…";
+
+        // Status & letzte Events
+        await refreshBrowserCollector();
+
+        // Browser-spezifische Summary (Endpoint optional)
+        try {
+            const summary = await fetchJSON("/analysis/browser/summary?" + qs);
+            if (summary) {
+                const tabsEl = document.getElementById("br-kpi-tabs");
+                if (tabsEl) tabsEl.textContent = summary.tab_count ?? "–";
+                const plEl = document.getElementById("br-kpi-page-loads");
+                if (plEl) plEl.textContent = summary.page_loads ?? "–";
+                const clicksEl = document.getElementById("br-kpi-clicks");
+                if (clicksEl) clicksEl.textContent = summary.clicks ?? "–";
+                const domEl = document.getElementById("br-kpi-domains");
+                if (domEl) domEl.textContent = summary.domain_count ?? "–";
+            }
+        } catch (e) {
+            console.warn("Browser summary not available:", e);
+        }
+
+        statusEl.textContent = "Letzte Aktualisierung: " + new Date().toLocaleTimeString("de-DE");
+    } catch (e) {
+        console.error(e);
+        if (statusEl) statusEl.textContent = "Fehler beim Laden der Browser-Daten: " + e.message;
+    }
+}
+
+const pageLoaders = {
+    dashboard: loadDashboard,
+    windows: loadWindows,
+    input: loadInputPage,
+    documents: loadDocumentsPage,
+    screenshots: loadScreenshotsPage,
+    browser: loadBrowserPage
+    // settings braucht keinen Loader
+};
+
+// --- Browser Collector spezifisch ---
+function formatTime(dateStr) {
+    const d = new Date(dateStr);
+    return d.toLocaleTimeString("de-DE", {
+        hour: "2-digit",
+        minute: "2-digit",
+        second: "2-digit",
+    });
+}
+
+function formatRelativeSeconds(seconds) {
+    if (seconds == null) return "–";
+    if (seconds < 60) return `${Math.round(seconds)} s`;
+    const mins = Math.floor(seconds / 60);
+    const secs = Math.round(seconds % 60);
+    return `${mins} min ${secs} s`;
+}
+
+function updateBrowserStatusUI(statusData) {
+    const pill = document.getElementById("browser-status-pill");
+    const lastEventEl = document.getElementById("browser-last-event");
+    const lastDiffEl = document.getElementById("browser-last-diff");
+
+    if (!pill || !lastEventEl || !lastDiffEl) return;
+
+    pill.classList.remove("status-ok", "status-warn", "status-offline");
+    pill.classList.add(`status-${statusData.status || "offline"}`);
+    pill.textContent =
+        statusData.status === "ok"
+            ? "OK"
+            : statusData.status === "warn"
+                ? "Verzögert"
+                : "Offline";
+
+    lastEventEl.textContent = statusData.last_event
+        ? new Date(statusData.last_event).toLocaleString("de-DE")
+        : "–";
+
+    lastDiffEl.textContent = formatRelativeSeconds(
+        statusData.seconds_since_last_event
+    );
+}
+
+function renderBrowserCollectorTimeline(events) {
+    const container = document.getElementById("browser-timeline");
+    const countEl = document.getElementById("browser-event-count");
+    if (!container || !countEl) return;
+
+    container.innerHTML = "";
+    countEl.textContent = `${events.length} Einträge`;
+
+    if (!events || events.length === 0) {
+        container.innerHTML = '<div class="muted" style="padding:8px 10px;">Noch keine Browser-Aktivitäten erfasst.</div>';
+        return;
+    }
+
+    for (const ev of events) {
+        const time = formatTime(ev.timestamp);
+        const type = ev.type || "event";
+        const url = ev.payload?.url || "";
+        const title = ev.payload?.title || "";
+        const dom = ev.payload?.dom_event || null;
+
+        const item = document.createElement("div");
+        item.className = "timeline-item";
+
+        const timeEl = document.createElement("div");
+        timeEl.className = "timeline-item-time";
+        timeEl.textContent = time;
+
+        const mainEl = document.createElement("div");
+        mainEl.className = "timeline-item-main";
+
+        const firstLine = document.createElement("div");
+
+        const tag = document.createElement("span");
+        tag.className = "timeline-item-tag";
+        tag.textContent = type;
+
+        const titleSpan = document.createElement("span");
+        titleSpan.textContent = title || "(kein Titel)";
+
+        firstLine.appendChild(tag);
+        firstLine.appendChild(titleSpan);
+
+        const urlLine = document.createElement("div");
+        urlLine.className = "timeline-item-url";
+        urlLine.textContent = url;
+
+        mainEl.appendChild(firstLine);
+        mainEl.appendChild(urlLine);
+
+        if (dom && dom.event_type) {
+            const domLine = document.createElement("div");
+            domLine.className = "timeline-item-url";
+            domLine.textContent = `DOM: ${dom.event_type} – ${dom.element_tag || ""}#${dom.element_id || ""}`;
+            mainEl.appendChild(domLine);
+        }
+
+        item.appendChild(timeEl);
+        item.appendChild(mainEl);
+        container.appendChild(item);
+    }
+}
+
+async function refreshBrowserCollector() {
+    try {
+        const [status, events] = await Promise.all([
+            fetchJSON("/collectors/browser/status"),
+            fetchJSON("/events/browser/recent?limit=50"),
+        ]);
+        updateBrowserStatusUI(status);
+        renderBrowserCollectorTimeline(events);
+    } catch (e) {
+        console.warn("Browser Collector UI Refresh failed", e);
+    }
+}
+
+// --- Collector-Telemetrie ---
+function formatMs(timing, key) {
+    if (!timing || !timing.count) return "–";
+    return `${timing[key].toFixed(1)} ms`;
+}
+
+function renderCollectorTelemetry(reports) {
+    const tbody = document.querySelector("#collector-telemetry-table tbody");
+    if (!tbody) return;
+    tbody.innerHTML = "";
+    if (!reports || reports.length === 0) {
+        const tr = document.createElement("tr");
+        tr.innerHTML = '<td colspan="9" class="muted">Noch keine Berichte…</td>';
+        tbody.appendChild(tr);
+        return;
+    }
+    reports.forEach(r => {
+        const values = Object.assign({}, r.counters || {}, r.gauges || {});
+        const timings = r.timings || {};
+        const loop = timings.loop;
+        const statusText = r.status === "ok" ? "OK" : r.status === "warn" ? "Verzögert" : "Offline";
+        const buffer = values.buffer_depth == null
+            ? "–"
+            : values.buffer_capacity
+                ? `${values.buffer_depth} / ${values.buffer_capacity}`
+                : `${values.buffer_depth}`;
+        const overruns = values.overruns ? ` (${values.overruns}× überzogen)` : "";
+        const restarts = values.restarts ? ` <small class="muted">(${values.restarts}× neu gestartet)</small>` : "";
+
+        const tr = document.createElement("tr");
+        tr.innerHTML = `
+            <td>${r.collector}${restarts}</td>
+            <td><span class="collector-status-pill status-${r.status}"
+                      title="letzter Bericht vor ${formatRelativeSeconds(r.seconds_since_report)}">${statusText}</span></td>
+            <td>${loop && loop.count ? `${loop.avg_ms.toFixed(1)} / ${loop.max_ms.toFixed(1)} ms` : "–"}${overruns}</td>
+            <td>${formatMs(timings.send, "p95_ms")}</td>
+            <td>${values.events != null ? values.events.toLocaleString("de-DE") : "–"}</td>
+            <td>${values.dropped != null ? values.dropped.toLocaleString("de-DE") : "0"}</td>
+            <td>${buffer}</td>
+            <td>${r.cpu_percent != null ? r.cpu_percent.toFixed(1) + " %" : "–"}</td>
+            <td>${r.rss_bytes != null ? (r.rss_bytes / 1048576).toFixed(1) + " MB" : "–"}</td>
+        `;
+        tbody.appendChild(tr);
+    });
+}
+
+async function refreshCollectorTelemetry() {
+    try {
+        renderCollectorTelemetry(await fetchJSON("/collectors/telemetry"));
+    } catch (e) {
+        console.warn("Collector-Telemetrie konnte nicht geladen werden", e);
+    }
+}
+
+// --- Einstellungen ---
+async function loadSettings() {
+    const status = document.getElementById("settings-status");
+    if (!status) return;
+    try {
+        const data = await fetchJSON("/settings");
+        const retentionInput = document.getElementById("retention-input");
+        if (data && typeof data.screenshot_retention_days === "number" && retentionInput) {
+            retentionInput.value = data.screenshot_retention_days;
+        }
+        const maxMbInput = document.getElementById("max-mb-input");
+        if (data && typeof data.screenshot_max_mb === "number" && maxMbInput) {
+            maxMbInput.value = data.screenshot_max_mb;
+        }
+        const intervalInput = document.getElementById("interval-input");
+        if (data && typeof data.screenshot_interval_seconds === "number" && intervalInput) {
+            intervalInput.value = data.screenshot_interval_seconds;
+        }
+        status.textContent = "";
+    } catch (e) {
+        console.error(e);
+        status.textContent = "Konnte Einstellungen nicht laden: " + e.message;
+    }
+}
+
+async function saveSettings() {
+    const status = document.getElementById("settings-status");
+    const retentionInput = document.getElementById("retention-input");
+    if (!retentionInput || !status) return;
+
+    const days = parseInt(retentionInput.value, 10);
+    if (isNaN(days) || days <= 0) {
+        status.textContent = "Bitte eine gültige Anzahl Tage eingeben.";
+        return;
+    }
+    const maxMbInput = document.getElementById("max-mb-input");
+    const maxMb = maxMbInput ? parseInt(maxMbInput.value, 10) : 0;
+    if (isNaN(maxMb) || maxMb < 0) {
+        status.textContent = "Bitte ein gültiges Speicherlimit eingeben.";
+        return;
+    }
+    const intervalInput = document.getElementById("interval-input");
+    const interval = intervalInput ? parseInt(intervalInput.value, 10) : null;
+    if (interval !== null && (isNaN(interval) || interval <= 0)) {
+        status.textContent = "Bitte ein gültiges Intervall eingeben.";
+        return;
+    }
+
+    try {
+        status.textContent = "Speichere Einstellungen…";
+        const res = await fetch("/settings", {
+            method: "POST",
+            headers: {"Content-Type": "application/json"},
+            body: JSON.stringify({
+                screenshot_retention_days: days,
+                screenshot_max_mb: maxMb,
+                screenshot_interval_seconds: interval
+            })
+        });
+        if (!res.ok) throw new Error("HTTP " + res.status);
+        status.textContent = "Einstellungen gespeichert.";
+        setTimeout(() => status.textContent = "", 3000);
+    } catch (e) {
+        console.error(e);
+        status.textContent = "Fehler beim Speichern: " + e.message;
+    }
+}
+
+function buildExportUrl() {
+    const fromEl = document.getElementById("date-from");
+    const toEl = document.getElementById("date-to");
+    const sourceEl = document.getElementById("source-filter");
+
+    const params = new URLSearchParams();
+    if (fromEl && fromEl.value) params.set("from", fromEl.value);
+    if (toEl && toEl.value) params.set("to", toEl.value);
+    if (sourceEl && sourceEl.value) params.set("source", sourceEl.value);
+
+    return "/export?" + params.toString();
+}
+
+function triggerExport() {
+    const status = document.getElementById("export-status");
+    try {
+        const url = buildExportUrl();
+        if (status) status.textContent = "Export wird vorbereitet…";
+        window.open(url, "_blank");
+        setTimeout(() => {
+            if (status) status.textContent = "";
+        }, 3000);
+    } catch (e) {
+        console.error(e);
+        if (status) status.textContent = "Fehler beim Starten des Exports: " + e.message;
+    }
+}
+
+// --- Navigation & Filter-Init ---
+function setActivePage(page) {
+    document.querySelectorAll(".page").forEach(p => p.classList.remove("active"));
+    const targetEl = document.getElementById("page-" + page);
+    if (targetEl) targetEl.classList.add("active");
+
+    document.querySelectorAll(".nav-link").forEach(btn => {
+        btn.classList.toggle("active", btn.getAttribute("data-target") === page);
+    });
+
+    // Beim Wechsel keine automatische Neuladung erzwingen – Nutzer ändert Filter nach Bedarf
+}
+
+function initFilters() {
+    // Preset-Klicks
+    document.querySelectorAll(".filter-btn").forEach(btn => {
+        btn.addEventListener("click", () => {
+            const page = btn.getAttribute("data-page");
+            const preset = btn.getAttribute("data-preset");
+            if (!page || !preset) return;
+
+            // Aktiv-Status in der Button-Gruppe
+            document.querySelectorAll(`.filter-btn[data-page="${page}"]`).forEach(b => {
+                b.classList.toggle("active", b === btn);
+            });
+
+            let range;
+            let label = "";
+
+            if (preset === "custom") {
+                // Nutzer soll Custom über "Anwenden" setzen
+                return;
+            } else {
+                const mapping = {
+                    today: "Heute",
+                    week: "Woche",
+                    month: "Monat",
+                    quarter: "Quartal",
+                    year: "Jahr"
+                };
+                label = mapping[preset] || preset;
+                range = getPresetRange(preset);
+            }
+
+            pageState[page] = { range, presetLabel: label };
+            updateFilterSummary(page);
+
+            const loader = pageLoaders[page];
+            if (typeof loader === "function") {
+                loader(range);
+            }
+        });
+    });
+
+    // Custom-Apply
+    document.querySelectorAll(".filter-apply").forEach(btn => {
+        btn.addEventListener("click", () => {
+            const page = btn.getAttribute("data-page");
+            if (!page) return;
+            const range = getCustomRange(page);
+            if (!range) {
+                alert("Bitte gültigen benutzerdefinierten Zeitraum wählen.");
+                return;
+            }
+            pageState[page] = { range, presetLabel: "Custom" };
+            updateFilterSummary(page);
+
+            // Buttons entmarkieren + Custom markieren
+            document.querySelectorAll(`.filter-btn[data-page="${page}"]`).forEach(b => {
+                const isCustom = b.getAttribute("data-preset") === "custom";
+                b.classList.toggle("active", isCustom);
+            });
+
+            const loader = pageLoaders[page];
+            if (typeof loader === "function") {
+                loader(range);
+            }
+        });
+    });
+
+    // Standard: alle Seiten auf "Heute" initialisieren (wo es Filter gibt)
+    const pagesWithFilter = ["dashboard", "windows", "input", "documents", "screenshots", "browser"];
+    pagesWithFilter.forEach(page => {
+        const range = getPresetRange("today");
+        pageState[page] = { range, presetLabel: "Heute" };
+        updateFilterSummary(page);
+        const loader = pageLoaders[page];
+        if (typeof loader === "function") {
+            loader(range);
+        }
+    });
+}
+
+document.addEventListener("DOMContentLoaded", () => {
+    initTheme();
+
+    const themeBtn = document.getElementById("theme-toggle");
+    if (themeBtn) {
+        themeBtn.addEventListener("click", () => {
+            const current = document.documentElement.getAttribute("data-theme") || "dark";
+            const next = current === "dark" ? "light" : "dark";
+            applyTheme(next);
+        });
+    }
+
+    // Navigation
+    document.querySelectorAll(".nav-link").forEach(btn => {
+        btn.addEventListener("click", () => {
+            const target = btn.getAttribute("data-target");
+            if (!target) return;
+            setActivePage(target);
+            // Settings: bei Wechsel Einstellungen nachladen
+            if (target === "settings") {
+                loadSettings();
+            }
+        });
+    });
+
+    // Settings-Buttons
+    const saveBtn = document.getElementById("save-settings-btn");
+    if (saveBtn) saveBtn.addEventListener("click", saveSettings);
+    const exportBtn = document.getElementById("export-button");
+    if (exportBtn) exportBtn.addEventListener("click", (e) => {
+        e.preventDefault();
+        triggerExport();
+    });
+
+    // Filter & erste Ladung
+    initFilters();
+
+    // Browser Collector regelmäßig aktualisieren (Timeline & Status)
+    refreshBrowserCollector();
+    setInterval(refreshBrowserCollector, 10000);
+
+    // Collector-Telemetrie
+    refreshCollectorTelemetry();
+    setInterval(refreshCollectorTelemetry, 10000);
+});
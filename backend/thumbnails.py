@@ -0,0 +1,181 @@
+# backend/thumbnails.py
+"""
+Thumbnails für Screenshots, on demand erzeugt.
+
+Zweistufiger LRU-Cache:
+- RAM:    fertige WebP-Bytes, begrenzt über MEMORY_MAX_BYTES
+- Platte: THUMB_DIR, begrenzt über DISK_MAX_BYTES
+
+Der Cache-Key enthält Pfad, mtime, Dateigröße und Breite – ändert sich das
+Original, entsteht automatisch ein neuer Key (alte Einträge altern raus).
+"""
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+THUMB_DIR = Path.home() / ".tracker" / "thumbs"
+
+# Erlaubte Breiten – angefragte Breiten werden auf den nächstgrößeren Wert
+# gerundet, damit sich Dashboard-Varianten denselben Cache-Eintrag teilen.
+THUMB_WIDTHS = (80, 160, 240, 320, 480, 640)
+
+MEMORY_MAX_BYTES = 32 * 1024 * 1024    # 32 MB im RAM
+DISK_MAX_BYTES = 256 * 1024 * 1024     # 256 MB auf Platte
+
+WEBP_QUALITY = 70
+
+
+def snap_width(width: int) -> int:
+    """Rundet eine angefragte Breite auf die nächste erlaubte Thumbnail-Breite."""
+    for w in THUMB_WIDTHS:
+        if width <= w:
+            return w
+    return THUMB_WIDTHS[-1]
+
+
+class ThumbnailCache:
+    def __init__(
+        self,
+        directory: Path = THUMB_DIR,
+        memory_max_bytes: int = MEMORY_MAX_BYTES,
+        disk_max_bytes: int = DISK_MAX_BYTES,
+    ):
+        self.directory = directory
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()  # key -> Dateigröße
+        self._disk_bytes = 0
+        self._disk_loaded = False
+
+    # ---------- Keys & Pfade ----------
+
+    @staticmethod
+    def make_key(source: Path, width: int) -> str:
+        st = source.stat()
+        raw = f"{source}|{st.st_mtime_ns}|{st.st_size}|{width}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def disk_path(self, key: str) -> Path:
+        return self.directory / f"{key}.webp"
+
+    # ---------- Public API ----------
+
+    def get(self, source: Path, width: int) -> Tuple[str, Optional[bytes], Optional[Path]]:
+        """
+        Liefert (key, bytes, path) für das Thumbnail von `source`.
+
+        Genau eines von bytes/path ist gesetzt: bytes bei RAM-Treffer oder
+        frisch erzeugtem Thumbnail, path bei Treffer im Platten-Cache (kann
+        dann ohne Umweg über Python-Speicher ausgeliefert werden).
+        """
+        width = snap_width(width)
+        key = self.make_key(source, width)
+
+        with self._lock:
+            self._load_disk_index_locked()
+
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return key, data, None
+
+            if key in self._disk:
+                self._disk.move_to_end(key)
+                path = self.disk_path(key)
+                if path.exists():
+                    return key, None, path
+                # Datei wurde extern gelöscht
+                self._disk_bytes -= self._disk.pop(key)
+
+        # Rendern außerhalb des Locks – doppelte Arbeit bei parallelen
+        # Anfragen ist harmlos (atomares Schreiben via os.replace).
+        data = render_thumbnail(source, width)
+        self._store(key, data)
+        return key, data, None
+
+    # ---------- intern ----------
+
+    def _store(self, key: str, data: bytes):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.disk_path(key)
+        tmp = path.with_suffix(".tmp")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[WARN] Konnte Thumbnail nicht speichern: {e}")
+            path = None
+
+        with self._lock:
+            if path is not None and key not in self._disk:
+                self._disk[key] = len(data)
+                self._disk_bytes += len(data)
+                self._evict_disk_locked()
+
+            if key not in self._memory and len(data) <= self.memory_max_bytes:
+                self._memory[key] = data
+                self._memory_bytes += len(data)
+                while self._memory_bytes > self.memory_max_bytes:
+                    _, old = self._memory.popitem(last=False)
+                    self._memory_bytes -= len(old)
+
+    def _evict_disk_locked(self):
+        while self._disk_bytes > self.disk_max_bytes and self._disk:
+            old_key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                self.disk_path(old_key).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"[WARN] Konnte Thumbnail {old_key} nicht löschen: {e}")
+
+    def _load_disk_index_locked(self):
+        """Liest den Platten-Cache einmalig ein (älteste Zugriffe zuerst)."""
+        if self._disk_loaded:
+            return
+        self._disk_loaded = True
+        if not self.directory.exists():
+            return
+
+        entries = []
+        for p in self.directory.glob("*.webp"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, p.stem, st.st_size))
+
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._evict_disk_locked()
+
+
+def render_thumbnail(source: Path, width: int) -> bytes:
+    """Skaliert `source` auf `width` Pixel Breite und liefert WebP-Bytes."""
+    from PIL import Image  # optional: nur nötig, wenn Thumbnails angefragt werden
+
+    with Image.open(source) as img:
+        if img.width > width:
+            height = max(1, round(img.height * width / img.width))
+            # draft() beschleunigt JPEG-Decoding, reduce() via thumbnail()
+            img.draft("RGB", (width, height))
+            img.thumbnail((width, height), Image.Resampling.LANCZOS)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGB")
+
+        buf = io.BytesIO()
+        img.save(buf, format="WEBP", quality=WEBP_QUALITY, method=4)
+        return buf.getvalue()
+
+
+thumbnail_cache = ThumbnailCache()
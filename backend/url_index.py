@@ -0,0 +1,301 @@
+# backend/url_index.py
+"""
+Normalisierter URL-Index für Browser-Navigation.
+
+Die Extension schickt tab_activated / page_loaded als Events mit der vollen
+URL im Payload. Für Auswertungen pro Website wird jede URL beim Ingest einmal
+zerlegt in (Schema, registrierbare Domain, Pfad-Template) und in
+browser_visits abgelegt; die Domain steht nur als ID drin (url_domains).
+/analysis/top-domains rechnet dann mit LEAD() direkt in SQLite, ohne eine
+einzige URL zu parsen.
+
+Die registrierbare Domain wird ohne Public-Suffix-Liste bestimmt: die
+letzten zwei Labels, bei bekannten zweiteiligen Endungen (co.uk, com.au …)
+die letzten drei.
+"""
+import ipaddress
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from sqlalchemy import Float, bindparam, event, func, select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from backend.db import SessionLocal
+from backend.models import BrowserVisit, Event, Setting, UrlDomain
+
+NAV_TYPES = ("tab_activated", "page_loaded")
+BACKFILL_CHUNK = 5000
+BACKFILL_KEY = "url_index_backfill"
+
+# Zeit bis zum nächsten Navigations-Event, die höchstens einer Seite gutgeschrieben wird
+DEFAULT_MAX_GAP_SECONDS = 600
+
+MULTI_PART_SUFFIXES = {
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "me.uk", "co.at", "or.at", "gv.at",
+    "com.au", "net.au", "org.au", "co.nz", "co.jp", "ne.jp", "or.jp", "co.za",
+    "com.br", "com.cn", "com.tr", "com.mx", "co.in", "co.kr", "com.sg", "com.hk",
+}
+
+_NUM = re.compile(r"^\d+$")
+_UUID = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.I)
+_HEX = re.compile(r"^[0-9a-f]{16,}$", re.I)
+_TOKEN = re.compile(r"^(?=.*\d)[\w-]{20,}$")
+MAX_PATH_SEGMENTS = 6
+
+
+# =========================
+# Normalisierung
+# =========================
+
+def registrable_domain(host: str) -> str:
+    host = host.lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+        return host
+    except ValueError:
+        pass
+    labels = host.split(".")
+    if len(labels) <= 2:
+        return host
+    if ".".join(labels[-2:]) in MULTI_PART_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def _segment(seg: str) -> str:
+    if _NUM.match(seg):
+        return ":num"
+    if _UUID.match(seg) or _HEX.match(seg) or _TOKEN.match(seg):
+        return ":id"
+    return seg
+
+
+def path_template(path: str) -> str:
+    """/issues/4711/comments/9f86d081884c7d65 → /issues/:num/comments/:id"""
+    segments = [s for s in path.split("/") if s][:MAX_PATH_SEGMENTS]
+    return "/" + "/".join(_segment(s) for s in segments)
+
+
+def normalize(url: Optional[str]) -> Optional[Tuple[str, str, str]]:
+    """(scheme, domain, path_template) oder None für nicht auswertbare URLs."""
+    if not url:
+        return None
+    try:
+        parts = urlsplit(url)
+        host = parts.hostname
+    except ValueError:
+        return None
+    if parts.scheme in ("http", "https") and host:
+        return parts.scheme, registrable_domain(host), path_template(parts.path)
+    if parts.scheme == "file":
+        return "file", "(lokal)", path_template(parts.path)
+    if parts.scheme:
+        # about:, chrome:// … – beendet die Zeit der vorherigen Seite
+        return parts.scheme[:10], f"({parts.scheme})", "/"
+    return None
+
+
+def _epoch(ts: datetime) -> float:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+# =========================
+# Domain-Wörterbuch
+# =========================
+
+# nur committete IDs; neue liegen bis zum Commit in session.info
+_domain_ids: Dict[str, int] = {}
+_PENDING = "url_index_domains"
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_domains(session: Session):
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        _domain_ids.update(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_domains(session: Session):
+    session.info.pop(_PENDING, None)
+
+
+def _domain_id_map(db: Session, domains: Iterable[str]) -> Dict[str, int]:
+    pending: Dict[str, int] = db.info.setdefault(_PENDING, {})
+    result: Dict[str, int] = {}
+    missing = []
+    for domain in set(domains):
+        known = _domain_ids.get(domain) or pending.get(domain)
+        if known is None:
+            missing.append(domain)
+        else:
+            result[domain] = known
+    if missing:
+        db.execute(
+            sqlite_insert(UrlDomain).on_conflict_do_nothing(index_elements=["domain"]),
+            [{"domain": d} for d in missing],
+        )
+        for domain, id_ in db.execute(select(UrlDomain.domain, UrlDomain.id).where(UrlDomain.domain.in_(missing))):
+            pending[domain] = result[domain] = id_
+    return result
+
+
+# =========================
+# Indexieren
+# =========================
+
+def _visit_rows(db: Session, events: Iterable[Event]) -> List[dict]:
+    parsed = []
+    for ev in events:
+        if ev.source != "browser" or ev.type not in NAV_TYPES or ev.timestamp is None:
+            continue
+        payload = ev.payload or {}
+        norm = normalize(payload.get("url"))
+        if norm is None:
+            continue
+        tab_id = payload.get("tab_id")
+        parsed.append((ev, norm, tab_id if isinstance(tab_id, int) else None))
+    if not parsed:
+        return []
+
+    ids = _domain_id_map(db, (norm[1] for _, norm, _ in parsed))
+    return [
+        {
+            "event_id": ev.id, "ts": _epoch(ev.timestamp), "type": ev.type, "tab_id": tab_id,
+            "domain_id": ids[norm[1]], "scheme": norm[0], "path": norm[2],
+        }
+        for ev, norm, tab_id in parsed
+    ]
+
+
+def index_events(db: Session, events: Sequence[Event]) -> int:
+    """Beim Ingest aufrufen (vor dem Commit, Events mit ID)."""
+    rows = _visit_rows(db, events)
+    if rows:
+        db.execute(sqlite_insert(BrowserVisit).on_conflict_do_nothing(index_elements=["event_id"]), rows)
+    return len(rows)
+
+
+def _backfill_state(db: Session):
+    setting = db.get(Setting, BACKFILL_KEY)
+    if setting is None:
+        state = {"next_id": 1, "until": db.query(func.max(Event.id)).scalar() or 0}
+        setting = Setting(key=BACKFILL_KEY, value=json.dumps(state))
+        db.add(setting)
+        db.commit()
+    else:
+        state = json.loads(setting.value)
+    return setting, state
+
+
+def backfill(db: Session) -> int:
+    """Bestehende Navigations-Events übernehmen; Fortschritt in settings, fortsetzbar."""
+    setting, state = _backfill_state(db)
+    done = 0
+    while state["next_id"] <= state["until"]:
+        upper = state["next_id"] + BACKFILL_CHUNK * 10
+        rows = (
+            db.query(Event)
+            .filter(Event.id >= state["next_id"], Event.id <= min(upper, state["until"]))
+            .filter(Event.source == "browser", Event.type.in_(NAV_TYPES))
+            .order_by(Event.id.asc())
+            .limit(BACKFILL_CHUNK)
+            .all()
+        )
+        if rows:
+            done += index_events(db, rows)
+            state["next_id"] = rows[-1].id + 1 if len(rows) == BACKFILL_CHUNK else upper + 1
+        else:
+            state["next_id"] = upper + 1
+        setting.value = json.dumps(state)
+        db.commit()
+    return done
+
+
+def start_backfill():
+    """Beim Start aufrufen: Obergrenze synchron festlegen (wie search.start_backfill), Rest im Hintergrund."""
+    db = SessionLocal()
+    try:
+        _backfill_state(db)
+    finally:
+        db.close()
+
+    def run():
+        t0 = time.perf_counter()
+        db = SessionLocal()
+        try:
+            done = backfill(db)
+            if done:
+                print(f"[INFO] URL-Index aufgebaut: {done} Seitenaufrufe in {time.perf_counter() - t0:.1f} s")
+        except Exception as e:
+            db.rollback()
+            print(f"[ERROR] URL-Index konnte nicht aufgebaut werden: {e}")
+        finally:
+            db.close()
+
+    threading.Thread(target=run, name="url-index-backfill", daemon=True).start()
+
+
+# =========================
+# Auswertung
+# =========================
+
+# Fokus: tab_activated legt den aktiven Tab fest (grp = Anzahl Aktivierungen
+# bis hier, active_tab = Tab der letzten). page_loaded zählt nur im aktiven
+# Tab – Ladevorgänge in Hintergrund-Tabs beenden die Zeit der sichtbaren Seite
+# nicht. Vor der ersten Aktivierung im Zeitraum (grp = 0) und ohne tab_id ist
+# der aktive Tab unbekannt, dann zählt jedes page_loaded.
+_TOP_SQL = """
+    WITH nav AS (
+        SELECT event_id, domain_id, {path} AS path, ts, type, tab_id,
+               SUM(type = 'tab_activated') OVER (ORDER BY ts, event_id) AS grp
+        FROM browser_visits
+        WHERE ts >= :start AND ts < :end
+    ),
+    focus AS (
+        SELECT *, FIRST_VALUE(tab_id) OVER (PARTITION BY grp ORDER BY ts, event_id) AS active_tab
+        FROM nav
+    ),
+    v AS (
+        SELECT domain_id, path, ts, LEAD(ts) OVER (ORDER BY ts, event_id) AS next_ts
+        FROM focus
+        WHERE type = 'tab_activated' OR grp = 0 OR tab_id IS NULL OR active_tab IS NULL
+           OR tab_id = active_tab
+    ),
+    agg AS (
+        SELECT domain_id, path, COUNT(*) AS visits,
+               SUM(MIN(COALESCE(next_ts, :end), ts + :max_gap) - ts) AS seconds,
+               -- Fensterfunktion läuft vor LIMIT: Summe über alle Gruppen
+               SUM(SUM(MIN(COALESCE(next_ts, :end), ts + :max_gap) - ts)) OVER () AS total
+        FROM v
+        GROUP BY domain_id, path
+        ORDER BY seconds DESC
+        LIMIT :limit
+    )
+    SELECT d.domain, agg.path, agg.visits, agg.seconds, agg.total
+    FROM agg
+    JOIN url_domains AS d ON d.id = agg.domain_id
+    ORDER BY agg.seconds DESC
+"""
+
+
+def top_statement(by_path: bool):
+    # ohne Pfad bleibt die Abfrage im Index (ts, domain_id, type, tab_id)
+    return text(_TOP_SQL.format(path="path" if by_path else "NULL")).bindparams(
+        bindparam("start", type_=Float), bindparam("end", type_=Float),
+        bindparam("max_gap", type_=Float), bindparam("limit"),
+    )
+
+
+def top_params(start: datetime, end: datetime, max_gap: float, limit: int) -> dict:
+    return {"start": _epoch(start), "end": _epoch(end), "max_gap": max_gap, "limit": limit}
@@ -0,0 +1,104 @@
+# benchmarks/browser_ingest.py
+"""
+Durchsatz der Browser-DOM-Events: POST /browser-events/ (einzeln) gegen
+POST /browser-events/batch.
+
+Die Events ähneln dem, was content.js auf einer Formularseite meldet –
+Klicks auf wechselnde Elemente und Tipp-Folgen, in denen value_preview
+Zeichen für Zeichen wächst. Gemessen wird zweimal je Pfad: mit allen Events
+(Tippen) und nur mit eindeutigen (Klicks), damit der Gewinn durch das
+Set-basierte INSERT getrennt von der Verdichtung sichtbar wird.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.browser_ingest --count 2000 --batch-size 100
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# vor dem ersten DB-Zugriff: tracker.db landet im aktuellen Verzeichnis
+os.chdir(tempfile.mkdtemp(prefix="lat-bench-"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.db import init_db  # noqa: E402
+from backend.main import app  # noqa: E402
+
+
+def dom_events(count: int, typing: bool, seed: int, start: datetime):
+    rnd = random.Random(seed)
+    ts = start
+    out = []
+    while len(out) < count:
+        page = rnd.randrange(40)
+        url = f"https://intranet.example/app/{page}/edit"
+        title = f"Vorgang {page} bearbeiten"
+        field = f"field_{rnd.randrange(12)}"
+        if typing:
+            word = "".join(rnd.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rnd.randint(3, 12)))
+            for i in range(1, len(word) + 1):
+                ts += timedelta(milliseconds=rnd.randint(80, 250))
+                out.append({
+                    "timestamp": ts.isoformat(), "url": url, "title": title, "event_type": "input",
+                    "element_tag": "input", "element_type": "text", "element_id": field,
+                    "element_name": field, "element_label": field.replace("_", " "), "value_preview": word[:i],
+                })
+        else:
+            ts += timedelta(seconds=rnd.uniform(0.5, 4))
+            out.append({
+                "timestamp": ts.isoformat(), "url": url, "title": title, "event_type": "click",
+                "element_tag": "button", "element_type": "submit", "element_id": f"{field}_{len(out)}",
+                "element_name": None, "element_label": "Speichern", "value_preview": None,
+            })
+    return out[:count]
+
+
+def run(client: TestClient, events, batch_size: int) -> dict:
+    half = len(events) // 2
+    single, batch = events[:half], events[half:]
+
+    t0 = time.perf_counter()
+    for e in single:
+        client.post("/browser-events/", json=e)
+    t_single = time.perf_counter() - t0
+
+    inserted = 0
+    t0 = time.perf_counter()
+    for i in range(0, len(batch), batch_size):
+        inserted += client.post("/browser-events/batch", json={"events": batch[i:i + batch_size]}).json()["inserted"]
+    t_batch = time.perf_counter() - t0
+
+    return {
+        "single_events_per_s": round(len(single) / t_single, 1),
+        "batch_events_per_s": round(len(batch) / t_batch, 1),
+        "batch_inserted": inserted,
+        "batch_received": len(batch),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=2000, help="Events je Szenario (je Hälfte einzeln/Batch)")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    init_db()
+    client = TestClient(app)
+    start = datetime(2024, 1, 1, 9)
+    for name, typing in (("klicks", False), ("tippen", True)):
+        events = dom_events(args.count, typing, args.seed, start)
+        r = run(client, events, args.batch_size)
+        print(
+            f"{name:<8} einzeln {r['single_events_per_s']:>9.1f} Events/s   "
+            f"Batch {r['batch_events_per_s']:>9.1f} Events/s "
+            f"({r['batch_inserted']}/{r['batch_received']} gespeichert)"
+        )
+        start += timedelta(days=1)
+
+
+if __name__ == "__main__":
+    main()
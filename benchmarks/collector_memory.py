@@ -0,0 +1,120 @@
+# benchmarks/collector_memory.py
+"""
+Speicherbedarf: Collectoren als einzelne Prozesse gegen den Collector-Host
+(collectors/host.py).
+
+Startet ein Fake-Backend (nimmt jeden POST an), dann
+  1. jeden Collector als eigenen Interpreter (python collectors/<name>_collector.py),
+  2. alle zusammen in einem Prozess (python -m collectors.host --only …)
+und misst nach --warmup Sekunden RSS und USS (psutil) aller Prozesse.
+Collectoren, die hier nicht laufen (z.B. input ohne Desktop-Session,
+screenshot ohne mss), werden in beiden Varianten weggelassen.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.collector_memory --warmup 10
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import psutil
+
+from collectors.runtime import COLLECTOR_NAMES
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class AcceptAll(BaseHTTPRequestHandler):
+    posts = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        AcceptAll.posts += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+def memory(pids):
+    rss = uss = 0
+    for pid in pids:
+        try:
+            info = psutil.Process(pid).memory_full_info()
+        except psutil.Error:
+            continue
+        rss += info.rss
+        uss += getattr(info, "uss", info.rss)
+    return rss, uss
+
+
+def launch(commands, env, warmup):
+    procs = {
+        name: subprocess.Popen(args, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for name, args in commands.items()
+    }
+    time.sleep(warmup)
+    alive = {name: p for name, p in procs.items() if p.poll() is None}
+    rss, uss = memory([p.pid for p in alive.values()])
+    for p in procs.values():
+        p.terminate()
+    for p in procs.values():
+        try:
+            p.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            p.kill()
+    return sorted(alive), rss, uss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--collectors", default=",".join(COLLECTOR_NAMES))
+    parser.add_argument("--warmup", type=float, default=10.0, help="Sekunden bis zur Messung")
+    args = parser.parse_args()
+    names = [n.strip() for n in args.collectors.split(",") if n.strip()]
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), AcceptAll)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    home = tempfile.mkdtemp(prefix="collector-mem-")
+    (Path(home) / "Documents").mkdir()
+    env = {
+        **os.environ,
+        "HOME": home,
+        "USERPROFILE": home,
+        "PYTHONPATH": str(ROOT),
+        "TRACKER_BACKEND_URL": f"http://127.0.0.1:{server.server_address[1]}",
+    }
+
+    separate = {name: [sys.executable, f"collectors/{name}_collector.py"] for name in names}
+    running, rss_sep, uss_sep = launch(separate, env, args.warmup)
+    skipped = sorted(set(names) - set(running))
+    if not running:
+        print(f"Kein Collector lauffähig (beendet: {', '.join(skipped)})")
+        return
+
+    host = {"host": [sys.executable, "-m", "collectors.host", "--only", ",".join(running)]}
+    host_alive, rss_host, uss_host = launch(host, env, args.warmup)
+    server.shutdown()
+
+    mb = 1024 * 1024
+    print(f"Collectoren:  {', '.join(running)}" + (f" (nicht lauffähig: {', '.join(skipped)})" if skipped else ""))
+    print(f"{'Variante':<22} {'Prozesse':>8} {'RSS MB':>9} {'USS MB':>9}")
+    print(f"{'einzelne Prozesse':<22} {len(running):>8} {rss_sep / mb:>9.1f} {uss_sep / mb:>9.1f}")
+    print(f"{'Collector-Host':<22} {len(host_alive):>8} {rss_host / mb:>9.1f} {uss_host / mb:>9.1f}")
+    if host_alive and rss_sep:
+        print(f"Ersparnis:    RSS {(1 - rss_host / rss_sep) * 100:.0f} %, USS {(1 - uss_host / uss_sep) * 100:.0f} %")
+    print(f"POSTs am Fake-Backend: {AcceptAll.posts}")
+
+
+if __name__ == "__main__":
+    main()
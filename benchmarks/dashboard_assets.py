@@ -0,0 +1,100 @@
+# benchmarks/dashboard_assets.py
+"""
+Dashboard-Auslieferung: bisher index.html mit CSS/JS inline, bei jedem
+Aufruf von der Platte gelesen und unkomprimiert gesendet – jetzt index.html
+plus gehashte, vorkomprimierte Assets aus dem Speicher (backend/assets.py).
+
+Gemessen werden übertragene Bytes und Latenz für
+- ersten Aufruf (leerer Browser-Cache): Startseite + alle Assets
+- erneuten Aufruf: Startseite per If-None-Match (304), Assets aus dem
+  Browser-Cache (immutable → keine Requests)
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.dashboard_assets --repeat 50
+"""
+import argparse
+import os
+import re
+import statistics
+import tempfile
+import time
+
+os.chdir(tempfile.mkdtemp(prefix="lat-bench-"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend import assets  # noqa: E402
+from backend.main import app  # noqa: E402
+
+
+def inline_html() -> str:
+    """index.html wie vor der Aufteilung: CSS und JS wieder inline."""
+    html = assets.INDEX_PATH.read_text(encoding="utf-8")
+    for path in sorted(assets.STATIC_DIR.iterdir()):
+        text = path.read_text(encoding="utf-8")
+        if path.suffix == ".css":
+            html = html.replace(f'<link rel="stylesheet" href="/static/{path.name}" />', f"<style>\n{text}</style>")
+        elif path.suffix == ".js":
+            html = html.replace(f'<script src="/static/{path.name}"></script>', f"<script>\n{text}</script>")
+    return html
+
+
+def timed(fn, repeat):
+    samples, result = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - t0) * 1e3)
+    return result, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    # Referenz: alte Variante als Datei, pro Aufruf read_text() wie im alten index()
+    legacy = os.path.abspath("index_inline.html")
+    with open(legacy, "w", encoding="utf-8") as f:
+        f.write(inline_html())
+
+    @app.get("/__legacy_index")
+    def legacy_index():
+        from fastapi.responses import HTMLResponse
+        with open(legacy, encoding="utf-8") as f:
+            return HTMLResponse(f.read())
+
+    client = TestClient(app)
+    client.__enter__()  # Startup: Assets aufbereiten
+
+    r, legacy_ms = timed(lambda: client.get("/__legacy_index", headers={"Accept-Encoding": "identity"}), args.repeat)
+    legacy_bytes = len(r.content)
+
+    print(f"{'Variante':<34} {'Requests':>8} {'Bytes':>9} {'ms':>8}")
+    print(f"{'bisher (inline, unkomprimiert)':<34} {1:>8} {legacy_bytes:>9} {legacy_ms:>8.2f}")
+
+    encodings = ["gzip"] + (["br"] if assets.brotli is not None else [])
+    for encoding in encodings:
+        headers = {"Accept-Encoding": encoding}
+
+        def cold():
+            page = client.get("/", headers=headers)
+            wire = int(page.headers["content-length"])
+            for name in re.findall(r'/assets/([^"]+)', page.text):
+                res = client.get(f"/assets/{name}", headers=headers)
+                wire += int(res.headers["content-length"])
+            return page, wire
+
+        (page, wire), cold_ms = timed(cold, args.repeat)
+        n_assets = len(re.findall(r'/assets/([^"]+)', page.text))
+        print(f"{'neu, erster Aufruf (' + encoding + ')':<34} {1 + n_assets:>8} {wire:>9} {cold_ms:>8.2f}")
+
+        etag = page.headers["etag"]
+        r, warm_ms = timed(lambda: client.get("/", headers={**headers, "If-None-Match": etag}), args.repeat)
+        print(f"{'neu, erneuter Aufruf (304)':<34} {1:>8} {len(r.content):>9} {warm_ms:>8.2f}")
+
+    client.__exit__(None, None, None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# benchmarks/doc_save_storm.py
+"""
+Synthetischer "Save-Storm" für den Document-Collector.
+
+Spielt typische Speichervorgänge (Word, Editor, Git, npm) als watchdog-Events
+gegen DocEventHandler + DocEventCoalescer ab und vergleicht die Anzahl der
+gesendeten Events mit dem alten Verhalten (ein POST pro interessantem Event).
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.doc_save_storm --files 200 --saves 5
+"""
+import argparse
+import time
+
+from watchdog.events import (
+    FileCreatedEvent,
+    FileDeletedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+)
+
+from collectors.document_collector import (
+    DEBOUNCE_SECONDS,
+    INTERESTING_EXTENSIONS,
+    DocEventCoalescer,
+    DocEventHandler,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def word_save(root: str, name: str):
+    doc = f"{root}/Berichte/{name}.docx"
+    lock = f"{root}/Berichte/~${name}.docx"
+    tmp = f"{root}/Berichte/~WRL0001.tmp"
+    return [
+        FileCreatedEvent(lock),
+        FileModifiedEvent(lock),
+        FileCreatedEvent(tmp),
+        FileModifiedEvent(tmp),
+        FileModifiedEvent(tmp),
+        FileMovedEvent(doc, f"{root}/Berichte/~WRD0002.tmp"),
+        FileMovedEvent(tmp, doc),
+        FileModifiedEvent(doc),
+        FileModifiedEvent(doc),
+        FileDeletedEvent(f"{root}/Berichte/~WRD0002.tmp"),
+        FileDeletedEvent(lock),
+    ]
+
+
+def editor_save(root: str, name: str):
+    src = f"{root}/projekt/src/{name}.py"
+    return [FileModifiedEvent(src)] * 4
+
+
+def repo_noise(root: str, name: str):
+    return [
+        FileModifiedEvent(f"{root}/projekt/.git/index"),
+        FileCreatedEvent(f"{root}/projekt/.git/objects/ab/{name}"),
+        FileModifiedEvent(f"{root}/projekt/node_modules/lib/{name}.js"),
+        FileModifiedEvent(f"{root}/projekt/node_modules/lib/{name}.ts"),
+        FileCreatedEvent(f"{root}/projekt/src/__pycache__/{name}.cpython-311.pyc"),
+    ]
+
+
+def old_would_send(event) -> bool:
+    """Altes Verhalten: jedes Event mit interessanter Endung (Existenz angenommen)."""
+    if isinstance(event, FileDeletedEvent):
+        return False
+    path = event.dest_path if isinstance(event, FileMovedEvent) else event.src_path
+    dot = path.rfind(".")
+    return dot > 0 and path[dot:].lower() in INTERESTING_EXTENSIONS
+
+
+def dispatch(handler: DocEventHandler, event):
+    if isinstance(event, FileCreatedEvent):
+        handler.on_created(event)
+    elif isinstance(event, FileModifiedEvent):
+        handler.on_modified(event)
+    elif isinstance(event, FileMovedEvent):
+        handler.on_moved(event)
+    elif isinstance(event, FileDeletedEvent):
+        handler.on_deleted(event)
+
+
+def run(files: int, saves: int, gap: float):
+    clock = FakeClock()
+    coalescer = DocEventCoalescer(clock=clock)
+    handler = DocEventHandler(coalescer)
+
+    raw = 0
+    old_posts = 0
+    emitted = 0
+    handler_time = 0.0
+
+    for save in range(saves):
+        for i in range(files):
+            name = f"datei_{i:04d}"
+            for gen in (word_save, editor_save, repo_noise):
+                for ev in gen("C:/Users/test/Documents", name):
+                    raw += 1
+                    old_posts += old_would_send(ev)
+                    t0 = time.perf_counter()
+                    dispatch(handler, ev)
+                    handler_time += time.perf_counter() - t0
+                    clock.now += 0.001  # Events eines Saves kommen in ms-Abständen
+
+        # Pause zwischen zwei Speichervorgängen
+        clock.now += gap
+        emitted += len(coalescer.pop_due())
+
+    clock.now += coalescer.max_delay
+    emitted += len(coalescer.pop_due())
+
+    print(f"watchdog-Events gesamt:        {raw}")
+    print(f"POSTs altes Verhalten:         {old_posts}")
+    print(f"Events neu (nach Coalescing):  {emitted}")
+    if emitted:
+        print(f"Reduktion:                     {old_posts / emitted:.1f}x")
+    print(f"Handler-Zeit pro Event:        {handler_time / raw * 1e6:.2f} µs")
+    print(f"Debounce-Fenster:              {DEBOUNCE_SECONDS} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--saves", type=int, default=5, help="Speichervorgänge pro Datei")
+    parser.add_argument("--gap", type=float, default=30.0, help="Sekunden zwischen Speichervorgängen")
+    args = parser.parse_args()
+    run(args.files, args.saves, args.gap)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/durations.py
+"""
+Dauer-Berechnung: bisherige Python-Schleife gegen LEAD()/GROUP BY in SQLite
+(backend.durations).
+
+Für Top-Fenster und Tages-Spannen wird je Zeitraum gemessen, wie viele
+Zeilen nach Python wandern und wie lange es dauert; die Ergebnisse beider
+Varianten werden verglichen. Zusätzlich die Latenz der HTTP-Endpunkte
+/analysis/top-windows und /analysis/daily-usage.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.durations --days 30 --rate 2
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+# vor dem ersten DB-Zugriff: tracker.db landet im aktuellen Verzeichnis
+os.chdir(tempfile.mkdtemp(prefix="lat-bench-"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend import durations  # noqa: E402
+from backend.db import SessionLocal, init_db  # noqa: E402
+from backend.main import app  # noqa: E402
+from backend.models import Event  # noqa: E402
+from benchmarks.synthetic import add_workload_args, generate, seed_db, workload_from_args  # noqa: E402
+
+
+# =========================
+# Referenz: bisherige Schleifen aus analysis_local.py
+# =========================
+
+def loop_top_windows(db, start, end, limit):
+    rows = (
+        db.query(Event)
+        .filter(Event.source == "window")
+        .filter(Event.timestamp >= start)
+        .filter(Event.timestamp <= end)
+        .order_by(Event.timestamp.asc())
+        .all()
+    )
+    totals = {}
+    for idx, row in enumerate(rows):
+        next_ts = rows[idx + 1].timestamp if idx < len(rows) - 1 else end
+        delta = (next_ts - row.timestamp).total_seconds()
+        if delta <= 0:
+            continue
+        payload = row.payload or {}
+        key = (payload.get("app"), payload.get("title"))
+        totals[key] = totals.get(key, 0.0) + delta
+    return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[:limit], len(rows)
+
+
+def loop_daily(db, start, end):
+    rows = (
+        db.query(Event)
+        .filter(Event.source == "window")
+        .filter(Event.timestamp >= start)
+        .filter(Event.timestamp <= end)
+        .order_by(Event.timestamp.asc())
+        .all()
+    )
+    by_date = {}
+    for row in rows:
+        span = by_date.setdefault(row.timestamp.date(), [row.timestamp, row.timestamp])
+        span[0] = min(span[0], row.timestamp)
+        span[1] = max(span[1], row.timestamp)
+    return by_date, len(rows)
+
+
+def timed(fn, repeat):
+    samples, result = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - t0) * 1e3)
+    return result, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_workload_args(parser)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    init_db()
+    workload = workload_from_args(args)
+    db = SessionLocal()
+    print("Befülle Datenbank …", flush=True)
+    seed_db(db, generate(workload))
+
+    # naive UTC wie in der DB – sonst vergleicht die Schleife aware mit naive
+    end = workload.end.astimezone(timezone.utc).replace(tzinfo=None)
+    print(f"{'Zeitraum':<10} {'Auswertung':<12} {'Zeilen Schleife':>16} {'Zeilen SQL':>11} "
+          f"{'Schleife ms':>12} {'SQL ms':>9}  gleich")
+    for days in sorted({1, 7, args.days}):
+        start = end - timedelta(days=days)
+
+        (loop_top, loop_rows), loop_ms = timed(lambda: loop_top_windows(db, start, end, 20), args.repeat)
+        sql_top, sql_ms = timed(lambda: durations.top_windows(db, start, end, 20), args.repeat)
+        same = all(
+            (a[0][0], a[0][1]) == (b.app, b.title) and abs(a[1] - b.seconds) < 0.01
+            for a, b in zip(loop_top, sql_top)
+        ) and len(loop_top) == len(sql_top)
+        print(f"{days:>3} Tage   {'top-windows':<12} {loop_rows:>16} {len(sql_top):>11} "
+              f"{loop_ms:>12.1f} {sql_ms:>9.1f}  {'ja' if same else 'NEIN'}")
+
+        (loop_days, loop_rows), loop_ms = timed(lambda: loop_daily(db, start, end), args.repeat)
+        sql_days, sql_ms = timed(lambda: durations.daily_spans(db, start, end), args.repeat)
+        same = {d.day: [d.first_ts, d.last_ts] for d in sql_days} == loop_days
+        print(f"{days:>3} Tage   {'daily-usage':<12} {loop_rows:>16} {len(sql_days):>11} "
+              f"{loop_ms:>12.1f} {sql_ms:>9.1f}  {'ja' if same else 'NEIN'}")
+    db.close()
+
+    client = TestClient(app)
+    frm = (workload.end - timedelta(days=args.days)).isoformat()
+    to = workload.end.isoformat()
+    for url, params in (
+        ("/analysis/top-windows", {"start": frm, "end": to}),
+        ("/analysis/daily-usage", {"days": args.days, "end": to}),
+    ):
+        r, ms = timed(lambda: client.get(url, params=params), args.repeat)
+        print(f"HTTP {url:<26} {ms:>9.1f} ms (HTTP {r.status_code}, {len(r.content)} Bytes)")
+
+
+if __name__ == "__main__":
+    main()
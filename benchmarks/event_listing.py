@@ -0,0 +1,99 @@
+# benchmarks/event_listing.py
+"""
+Latenz der Event-Listen-Endpunkte (/events, /analysis/timeline) in
+Abhängigkeit von der Zeilenzahl: alter Pfad (ORM-Objekte + EventOut +
+response_model-Validierung) gegen den Spalten-Tupel-/orjson-Pfad.
+
+Läuft gegen eine temporäre SQLite-Datenbank.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.event_listing --rows 50 100 500 2000 5000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+# vor dem ersten DB-Zugriff: tracker.db landet im aktuellen Verzeichnis
+os.chdir(tempfile.mkdtemp(prefix="lat-bench-"))
+
+from fastapi import Depends, FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from backend.db import SessionLocal, get_db, init_db  # noqa: E402
+from backend.main import EventOut, app  # noqa: E402
+from backend.models import Event  # noqa: E402
+
+legacy = FastAPI()
+
+
+@legacy.get("/events", response_model=List[EventOut])
+def legacy_list_events(source: Optional[str] = None, limit: int = 100, db: Session = Depends(get_db)):
+    q = db.query(Event).order_by(Event.timestamp.desc())
+    if source:
+        q = q.filter(Event.source == source)
+    rows = q.limit(limit).all()
+    return [
+        EventOut(id=r.id, timestamp=r.timestamp, source=r.source, type=r.type, payload=r.payload)
+        for r in rows
+    ]
+
+
+def seed(n: int):
+    db = SessionLocal()
+    start = datetime.now(timezone.utc) - timedelta(days=1)
+    db.bulk_insert_mappings(
+        Event,
+        [
+            {
+                "timestamp": start + timedelta(seconds=i),
+                "source": "input",
+                "type": "mouse_move",
+                "payload": {"app": "EXCEL.EXE", "title": f"Mappe{i % 50}.xlsx - Excel", "pid": 4242,
+                            "x": i % 1920, "y": i % 1080},
+            }
+            for i in range(n)
+        ],
+    )
+    db.commit()
+    db.close()
+
+
+def timed(client: TestClient, url: str, repeat: int):
+    samples = []
+    size = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        r = client.get(url)
+        samples.append(time.perf_counter() - t0)
+        size = len(r.content)
+    return statistics.median(samples) * 1e3, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[50, 100, 500, 2000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    init_db()
+    seed(max(args.rows))
+
+    new_client = TestClient(app)
+    old_client = TestClient(legacy)
+
+    same = old_client.get("/events?limit=100").json() == new_client.get("/events?limit=100").json()
+    print(f"Antworten identisch: {same}")
+    print(f"{'Zeilen':>7} | {'alt ms':>8} | {'neu ms':>8} | {'Faktor':>6} | {'Bytes':>9}")
+    for n in args.rows:
+        old_ms, _ = timed(old_client, f"/events?limit={n}", args.repeat)
+        new_ms, size = timed(new_client, f"/events?limit={n}", args.repeat)
+        print(f"{n:>7} | {old_ms:8.2f} | {new_ms:8.2f} | {old_ms / new_ms:5.1f}x | {size:>9}")
+
+
+if __name__ == "__main__":
+    main()
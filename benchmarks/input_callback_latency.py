@@ -0,0 +1,102 @@
+# benchmarks/input_callback_latency.py
+"""
+Latenz der pynput-Callbacks im input_collector – ohne Windows.
+
+Ein Fake-Provider simuliert die Kosten der Win32-Aufrufe per Busy-Wait,
+der Prozessname wird echt über psutil (eigene PID) gelesen. Verglichen wird
+das alte Verhalten (Fensterabfrage pro Event) mit dem gecachten WindowContext.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.input_callback_latency --events 50000
+"""
+import argparse
+import os
+import statistics
+import time
+
+import psutil
+
+import collectors.input_collector as ic
+from collectors.window_context import WindowContext
+
+
+def busy_wait(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class FakeWindowProvider:
+    """Simuliert GetForegroundWindow/GetWindowText/GetWindowThreadProcessId."""
+
+    def __init__(self, call_cost: float):
+        self.call_cost = call_cost
+        self.calls = 0
+
+    def foreground(self) -> int:
+        self.calls += 1
+        busy_wait(self.call_cost)
+        return 4242
+
+    def title(self, hwnd: int) -> str:
+        self.calls += 1
+        busy_wait(self.call_cost)
+        return "Bericht.docx - Word"
+
+    def pid(self, hwnd: int) -> int:
+        self.calls += 1
+        busy_wait(self.call_cost)
+        return os.getpid()
+
+
+class UncachedContext:
+    """Altes Verhalten: drei Win32-Aufrufe + psutil pro Event."""
+
+    def __init__(self, provider: FakeWindowProvider):
+        self.provider = provider
+
+    def get(self):
+        hwnd = self.provider.foreground()
+        title = self.provider.title(hwnd)
+        pid = self.provider.pid(hwnd)
+        return psutil.Process(pid).name(), title, pid
+
+
+def measure(label: str, context, events: int):
+    ic.window_context = context
+    ic.ring = ic.EventRing(events)   # Sender läuft nicht, Ring fasst alles
+
+    samples = []
+    for i in range(events):
+        t0 = time.perf_counter()
+        ic.on_move(i % 1920, i % 1080)
+        samples.append(time.perf_counter() - t0)
+
+    samples.sort()
+    p50 = samples[len(samples) // 2] * 1e6
+    p99 = samples[int(len(samples) * 0.99)] * 1e6
+    mean = statistics.fmean(samples) * 1e6
+    print(f"{label:<10} mean {mean:8.2f} µs | p50 {p50:8.2f} µs | p99 {p99:8.2f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--call-cost-us", type=float, default=5.0, help="simulierte Kosten je Win32-Aufruf")
+    args = parser.parse_args()
+
+    cost = args.call_cost_us / 1e6
+
+    old_provider = FakeWindowProvider(cost)
+    measure("alt", UncachedContext(old_provider), args.events)
+
+    new_provider = FakeWindowProvider(cost)
+    cached = WindowContext(new_provider)
+    measure("gecacht", cached, args.events)
+
+    print(f"Provider-Aufrufe alt: {old_provider.calls}, gecacht: {new_provider.calls} "
+          f"({cached.refreshes} Refreshes)")
+
+
+if __name__ == "__main__":
+    main()
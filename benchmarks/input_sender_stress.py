@@ -0,0 +1,113 @@
+# benchmarks/input_sender_stress.py
+"""
+Stresstest für den Sender im input_collector gegen ein absichtlich langsames
+Backend.
+
+Ein lokaler HTTP-Server beantwortet POST /events/batch erst nach --delay
+Sekunden. Mehrere Threads feuern währenddessen Input-Callbacks ab. Gemessen
+wird, ob die Callbacks trotzdem schnell bleiben (sie dürfen nie auf I/O
+warten) und wie viele Events bei vollem Ring verworfen werden.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.input_sender_stress --seconds 10 --delay 1.5
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import collectors.input_collector as ic
+from collectors.window_context import WindowContext, NullWindowProvider
+
+
+class SlowBackend(BaseHTTPRequestHandler):
+    delay = 1.0
+    received = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.delay)
+        n = len(json.loads(body).get("events", []))
+        with SlowBackend.lock:
+            SlowBackend.received += n
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b'{"inserted": %d}' % n)
+
+    def log_message(self, *args):
+        pass
+
+
+def hammer(stop: threading.Event, rate: float, samples: list):
+    interval = 1.0 / rate
+    i = 0
+    next_at = time.perf_counter()
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        ic.on_move(i % 1920, i % 1080)
+        samples.append(time.perf_counter() - t0)
+        i += 1
+        next_at += interval
+        pause = next_at - time.perf_counter()
+        if pause > 0:
+            time.sleep(pause)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--delay", type=float, default=1.5, help="Antwortzeit des Fake-Backends")
+    parser.add_argument("--threads", type=int, default=2)
+    parser.add_argument("--rate", type=float, default=2000.0, help="Events/s pro Thread")
+    parser.add_argument("--ring", type=int, default=ic.RING_CAPACITY)
+    args = parser.parse_args()
+
+    SlowBackend.delay = args.delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowBackend)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    ic.BACKEND_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    ic.window_context = WindowContext(NullWindowProvider())
+    ic.ring = ic.EventRing(args.ring)
+    threading.Thread(target=ic.sender_loop, daemon=True).start()
+
+    stop = threading.Event()
+    per_thread = [[] for _ in range(args.threads)]
+    workers = [
+        threading.Thread(target=hammer, args=(stop, args.rate, per_thread[i]))
+        for i in range(args.threads)
+    ]
+    for w in workers:
+        w.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for w in workers:
+        w.join()
+
+    # Rest ausliefern lassen
+    deadline = time.time() + args.delay * 4 + 2
+    while len(ic.ring) and time.time() < deadline:
+        ic.wakeup.set()
+        time.sleep(0.1)
+    time.sleep(args.delay + 0.5)
+    server.shutdown()
+
+    samples = sorted(s for lst in per_thread for s in lst)
+    p50 = samples[len(samples) // 2] * 1e6
+    p99 = samples[int(len(samples) * 0.99)] * 1e6
+    worst = samples[-1] * 1e3
+
+    print(f"Callbacks:        {len(samples)} ({args.threads} Threads à {args.rate:.0f}/s)")
+    print(f"Callback-Latenz:  p50 {p50:.1f} µs | p99 {p99:.1f} µs | max {worst:.2f} ms")
+    print(f"Backend-Delay:    {args.delay:.2f} s pro Batch")
+    print(f"Ring-Overflow:    {ic.ring.overflow}")
+    print(f"Noch im Ring:     {len(ic.ring)}")
+    print(f"Gesendet:         {ic.sent_events} (Fehler: {ic.failed_events})")
+    print(f"Backend erhalten: {SlowBackend.received}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+# benchmarks/load_test.py
+"""
+Last-Test: alle Collectoren + Browser-Extension + offenes Dashboard
+gleichzeitig gegen ein laufendes Backend.
+
+Spielt eine aufgezeichnete (JSON Lines aus benchmarks.synthetic oder
+JSON-Liste aus /export/events) oder synthetische Session mit 1x–100x
+Geschwindigkeit ab. Jede Quelle sendet so, wie ihr Collector es tut:
+
+- window, screenshot, browser: ein POST /events pro Event, nacheinander
+- input:    gepuffert, POST /events/batch jede Sekunde bzw. ab 200 Events
+- document: gepuffert, POST /events/batch nach dem Debounce-Fenster
+
+Fehler (Timeout, Verbindungsfehler, 5xx) werden mit exponentiellem Backoff
+wiederholt. Parallel lädt ein Dashboard-Task periodisch dieselben Abfragen
+wie die Übersichtsseite. Berichtet werden p50/p95/p99 je Quelle und
+Endpunkt, Fehler-/Retry-/Backoff-Zahlen, verworfene Events, SQLite-Lock-
+Konflikte (HTTP 503 "database is locked") und wie weit das Abspielen
+hinter den Sollzeitpunkten lag.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.load_test --spawn --speed 20 --duration 60
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --input session.jsonl --speed 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import httpx
+except ImportError:  # nur für diesen Test nötig
+    sys.exit("benchmarks.load_test braucht httpx: pip install httpx")
+
+from benchmarks.synthetic import add_workload_args, generate, workload_from_args
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Sendeverhalten der Collectoren (siehe collectors/*.py)
+INPUT_SEND_INTERVAL = 1.0
+INPUT_BUFFER_MAX = 200
+DOC_SEND_INTERVAL = 1.5
+BATCHED_SOURCES = {"input": (INPUT_SEND_INTERVAL, INPUT_BUFFER_MAX), "document": (DOC_SEND_INTERVAL, 100)}
+
+BACKOFF_START = 0.25
+BACKOFF_MAX = 8.0
+MAX_RETRIES = 5
+REQUEST_TIMEOUT = 10.0
+
+# Abfragen der Übersichtsseite (backend/templates/index.html)
+DASHBOARD_QUERIES = (
+    ("/analysis/dashboard/summary", {}),
+    ("/analysis/top-windows", {"limit": 10}),
+    ("/analysis/timeline", {"limit": 200}),
+    ("/analysis/routines", {"limit": 10}),
+    ("/analysis/automation-candidates", {"limit": 10}),
+    ("/analysis/screenshots/list", {"limit": 200}),
+)
+BROWSER_STATUS_QUERIES = (
+    ("/collectors/browser/status", {}),
+    ("/events/browser/recent", {"limit": 50}),
+)
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.requests: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.events_sent: Counter = Counter()
+        self.events_dropped: Counter = Counter()
+        self.retries = 0
+        self.backoff_seconds = 0.0
+        self.locked = 0
+        self.max_lag = 0.0
+
+    def error(self, name: str, kind: str):
+        self.errors[f"{name}: {kind}"] += 1
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e3, 2)
+
+    return {"count": len(ordered), "p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99),
+            "max_ms": round(ordered[-1] * 1e3, 2)}
+
+
+# =========================
+# Senden mit Backoff
+# =========================
+
+async def post_with_backoff(client: httpx.AsyncClient, stats: Stats, name: str, path: str, body: dict, n_events: int):
+    delay = BACKOFF_START
+    for attempt in range(MAX_RETRIES + 1):
+        stats.requests[name] += 1
+        t0 = time.perf_counter()
+        try:
+            r = await client.post(path, json=body)
+            stats.latencies[name].append(time.perf_counter() - t0)
+            if r.status_code < 400:
+                stats.events_sent[name] += n_events
+                return
+            if r.status_code == 503 and "locked" in r.text:
+                stats.locked += 1
+            stats.error(name, f"HTTP {r.status_code}")
+            if r.status_code < 500:
+                break  # Client-Fehler: erneut senden hilft nicht
+        except httpx.HTTPError as e:
+            stats.latencies[name].append(time.perf_counter() - t0)
+            stats.error(name, type(e).__name__)
+
+        if attempt == MAX_RETRIES:
+            break
+        stats.retries += 1
+        stats.backoff_seconds += delay
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, BACKOFF_MAX)
+
+    stats.events_dropped[name] += n_events
+
+
+async def single_sender(client, stats: Stats, source: str, queue: asyncio.Queue):
+    while True:
+        event = await queue.get()
+        if event is None:
+            return
+        await post_with_backoff(client, stats, source, "/events", event, 1)
+
+
+async def batch_sender(client, stats: Stats, source: str, queue: asyncio.Queue):
+    interval, buffer_max = BATCHED_SOURCES[source]
+    buffer: List[dict] = []
+    done = False
+    while not done:
+        deadline = time.monotonic() + interval
+        while len(buffer) < buffer_max:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if event is None:
+                done = True
+                break
+            buffer.append(event)
+        if buffer:
+            batch, buffer = buffer, []
+            await post_with_backoff(client, stats, f"{source} (batch)", "/events/batch", {"events": batch}, len(batch))
+
+
+# =========================
+# Abspielen
+# =========================
+
+def load_recording(path: Path) -> Iterable[Dict[str, Any]]:
+    text = path.read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        events = json.loads(text)
+    else:
+        events = [json.loads(line) for line in text.splitlines() if line.strip()]
+    events.sort(key=lambda e: e["timestamp"])
+    return events
+
+
+def _parse_ts(ts: str) -> float:
+    dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+async def replay(events: Iterable[Dict[str, Any]], queues: Dict[str, asyncio.Queue], speed: float,
+                 duration: float, stats: Stats):
+    """Reiht jedes Event zu (ts - t0) / speed ein; Zeitstempel werden auf 'jetzt' gesetzt."""
+    wall0 = time.monotonic()
+    t0: Optional[float] = None
+    for event in events:
+        ts = _parse_ts(event["timestamp"])
+        if t0 is None:
+            t0 = ts
+        due = wall0 + (ts - t0) / speed
+        if due - wall0 > duration:
+            break
+        pause = due - time.monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+        else:
+            stats.max_lag = max(stats.max_lag, -pause)
+            await asyncio.sleep(0)  # Sender nicht aushungern, wenn wir hinterherhängen
+
+        queue = queues.get(event["source"])
+        if queue is None:
+            continue
+        queue.put_nowait({
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "source": event["source"],
+            "type": event["type"],
+            "payload": event.get("payload") or {},
+        })
+
+
+async def poll(client, stats: Stats, queries, interval: float, stop: asyncio.Event):
+    """Lädt alle Abfragen gleichzeitig (wie das Dashboard) alle `interval` Sekunden."""
+    async def one(path, params):
+        name = f"GET {path}"
+        stats.requests[name] += 1
+        t0 = time.perf_counter()
+        try:
+            r = await client.get(path, params=params)
+            if r.status_code >= 400:
+                stats.error(name, f"HTTP {r.status_code}")
+                if r.status_code == 503 and "locked" in r.text:
+                    stats.locked += 1
+        except httpx.HTTPError as e:
+            stats.error(name, type(e).__name__)
+        stats.latencies[name].append(time.perf_counter() - t0)
+
+    while not stop.is_set():
+        await asyncio.gather(*(one(path, params) for path, params in queries))
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run(args, events) -> dict:
+    stats = Stats()
+    limits = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+    async with httpx.AsyncClient(base_url=args.url, timeout=REQUEST_TIMEOUT, limits=limits) as client:
+        queues = {s: asyncio.Queue() for s in ("window", "screenshot", "browser", "input", "document")}
+        senders = [
+            asyncio.create_task(
+                batch_sender(client, stats, s, q) if s in BATCHED_SOURCES else single_sender(client, stats, s, q)
+            )
+            for s, q in queues.items()
+        ]
+        stop = asyncio.Event()
+        pollers = []
+        if args.dashboard_interval > 0:
+            pollers.append(asyncio.create_task(poll(client, stats, DASHBOARD_QUERIES, args.dashboard_interval, stop)))
+            pollers.append(asyncio.create_task(poll(client, stats, BROWSER_STATUS_QUERIES, 10.0, stop)))
+
+        t0 = time.monotonic()
+        await replay(events, queues, args.speed, args.duration, stats)
+        for q in queues.values():
+            q.put_nowait(None)
+        await asyncio.gather(*senders)
+        stop.set()
+        await asyncio.gather(*pollers)
+        elapsed = time.monotonic() - t0
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "url": args.url,
+            "speed": args.speed,
+            "wall_seconds": round(elapsed, 1),
+        },
+        "ingest": {
+            name: percentiles(samples) for name, samples in sorted(stats.latencies.items())
+            if not name.startswith("GET ")
+        },
+        "dashboard": {
+            name: percentiles(samples) for name, samples in sorted(stats.latencies.items())
+            if name.startswith("GET ")
+        },
+        "events_sent": dict(stats.events_sent),
+        "events_dropped": dict(stats.events_dropped),
+        "requests": dict(stats.requests),
+        "errors": dict(stats.errors),
+        "retries": stats.retries,
+        "backoff_seconds": round(stats.backoff_seconds, 2),
+        "db_locked": stats.locked,
+        "max_replay_lag_seconds": round(stats.max_lag, 3),
+    }
+
+
+def print_report(report: dict):
+    m = report["meta"]
+    print(f"\n{m['url']}  Geschwindigkeit {m['speed']}x  Dauer {m['wall_seconds']} s")
+    print(f"\n{'Endpunkt':<42} {'n':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for section in ("ingest", "dashboard"):
+        for name, p in report[section].items():
+            print(f"{name:<42} {p['count']:>7} {p['p50_ms']:>9.2f} {p['p95_ms']:>9.2f} "
+                  f"{p['p99_ms']:>9.2f} {p['max_ms']:>9.2f}")
+    print(f"\nEvents gesendet:   {report['events_sent']}")
+    print(f"Events verworfen:  {report['events_dropped'] or 0}")
+    print(f"Fehler:            {report['errors'] or 0}")
+    print(f"Retries/Backoff:   {report['retries']} / {report['backoff_seconds']} s")
+    print(f"DB gesperrt (503): {report['db_locked']}")
+    print(f"max. Verzug:       {report['max_replay_lag_seconds']} s")
+
+
+def spawn_backend(port: int) -> subprocess.Popen:
+    """Startet uvicorn mit einer leeren Datenbank in einem Temp-Verzeichnis."""
+    tmp = tempfile.mkdtemp(prefix="lat-load-")
+    # HOME umbiegen: Screenshot-Ordner/Retention des Backends sollen nichts Echtes anfassen
+    env = dict(os.environ, HOME=tmp, USERPROFILE=tmp, TRACKER_DB_PATH=os.path.join(tmp, "tracker.db"),
+               PYTHONPATH=str(PROJECT_ROOT))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=tmp, env=env,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/settings", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.terminate()
+    sys.exit("Backend ist nicht gestartet.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_workload_args(parser)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--spawn", action="store_true", help="eigenes Backend mit leerer DB starten")
+    parser.add_argument("--input", type=Path, default=None, help="aufgezeichnete Session (JSONL oder JSON-Liste)")
+    parser.add_argument("--speed", type=float, default=10.0, help="Abspielgeschwindigkeit (1–100)")
+    parser.add_argument("--duration", type=float, default=60.0, help="max. Laufzeit in Sekunden")
+    parser.add_argument("--dashboard-interval", type=float, default=5.0, help="0 = kein Dashboard")
+    parser.add_argument("--out", type=Path, default=None, help="Bericht zusätzlich als JSON speichern")
+    args = parser.parse_args()
+
+    if args.input:
+        events = load_recording(args.input)
+    else:
+        events = generate(workload_from_args(args))
+
+    proc = None
+    if args.spawn:
+        port = int(args.url.rsplit(":", 1)[-1]) if args.url.count(":") == 2 else 8000
+        proc = spawn_backend(port)
+    try:
+        report = asyncio.run(run(args, events))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    print_report(report)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/parallel_analysis.py
+"""
+Fenster-Analyse (Routinen/Automatisierung) über lange Zeiträume: ein
+Durchlauf inline gegen Tages-Partitionen im Prozess-Pool.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.parallel_analysis --days 30 --per-day 20000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+os.chdir(tempfile.mkdtemp(prefix="lat-bench-"))
+
+import backend.analysis_executor as ax  # noqa: E402
+from backend.db import SessionLocal, init_db  # noqa: E402
+from backend.models import Event  # noqa: E402
+
+
+def seed(days: int, per_day: int, end: datetime):
+    rnd = random.Random(42)
+    apps = [f"app{i}.exe" for i in range(20)]
+    db = SessionLocal()
+    step = 86400 / per_day
+    t = end - timedelta(days=days)
+    while t < end:
+        rows = []
+        for _ in range(per_day):
+            app = rnd.choice(apps)
+            rows.append({
+                "timestamp": t,
+                "source": "window",
+                "type": "window_focus",
+                "payload": {"app": app, "title": f"{app} – Dokument {rnd.randint(1, 200)}", "pid": 1},
+            })
+            t += timedelta(seconds=step)
+        db.bulk_insert_mappings(Event, rows)
+        db.commit()
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--per-day", type=int, default=20000)
+    parser.add_argument("--n", type=int, default=3)
+    args = parser.parse_args()
+
+    init_db()
+    end = datetime.now(timezone.utc)
+    seed(args.days, args.per_day, end)
+    start = end - timedelta(days=args.days)
+
+    ax.PARALLEL_MIN_DAYS = 10 ** 6
+    t0 = time.perf_counter()
+    inline = ax.analyze_windows(start, end, args.n)
+    t_inline = time.perf_counter() - t0
+
+    ax.PARALLEL_MIN_DAYS = 1
+    ax.analyze_windows(start, end, args.n)  # Pool hochfahren
+    t0 = time.perf_counter()
+    parallel = ax.analyze_windows(start, end, args.n)
+    t_parallel = time.perf_counter() - t0
+
+    same = inline[0].keys() == parallel[0].keys() and inline[1].keys() == parallel[1].keys()
+    print(f"Events:    {args.days * args.per_day} ({args.days} Tage)")
+    print(f"Prozesse:  {ax.ANALYSIS_PROCESSES}")
+    print(f"inline:    {t_inline:.2f} s")
+    print(f"parallel:  {t_parallel:.2f} s ({t_inline / t_parallel:.1f}x)")
+    print(f"Ergebnis identisch: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+# benchmarks/suite.py
+"""
+Benchmark-Suite für Backend und Analyse.
+
+Läuft in-process (TestClient) gegen eine temporäre SQLite-Datenbank, die
+mit benchmarks.synthetic befüllt wird, und misst:
+
+- ingest:   Durchsatz von POST /events (einzeln) und /events/batch
+- storage:  DB-Größe (inkl. WAL) pro Event nach dem Befüllen
+- analysis: Latenz (Median/p95) jedes Lese-/Analyse-Endpunkts
+- export:   Durchsatz von /export/events als CSV und JSON
+
+Das Ergebnis wird als JSON gespeichert (Standard: benchmarks/results/),
+mit --compare wird gegen einen früheren Lauf verglichen.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.suite --days 7 --rate 2
+    python -m benchmarks.suite --days 7 --rate 2 --compare benchmarks/results/<alt>.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+
+# vor dem ersten DB-Zugriff: tracker.db (und tracker-days/) landen im aktuellen Verzeichnis
+os.chdir(tempfile.mkdtemp(prefix="lat-bench-"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.db import DB_PATH, SessionLocal, init_db  # noqa: E402
+from backend.main import app  # noqa: E402
+from benchmarks.synthetic import Workload, add_workload_args, generate, seed_db, workload_from_args  # noqa: E402
+
+
+def percentile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def db_bytes() -> int:
+    return sum(os.path.getsize(p) for p in (DB_PATH, DB_PATH + "-wal") if os.path.exists(p))
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+# =========================
+# Messungen
+# =========================
+
+def bench_ingest(client: TestClient, w: Workload, count: int, batch_size: int) -> dict:
+    # eigener Seed, Tag vor dem Analyse-Zeitraum – die Analyse-Daten bleiben unberührt
+    ingest = Workload(days=1, seed=w.seed + 1, end=w.start, screenshot_interval=0)
+    events = list(islice(generate(ingest), count * 2))
+    single, batch = events[:count], events[count:]
+
+    t0 = time.perf_counter()
+    for e in single:
+        client.post("/events", json=e)
+    t_single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for i in range(0, len(batch), batch_size):
+        client.post("/events/batch", json={"events": batch[i:i + batch_size]})
+    t_batch = time.perf_counter() - t0
+
+    return {
+        "single_events": len(single),
+        "single_events_per_s": round(len(single) / t_single, 1),
+        "batch_events": len(batch),
+        "batch_size": batch_size,
+        "batch_events_per_s": round(len(batch) / t_batch, 1),
+    }
+
+
+def bench_storage(w: Workload) -> dict:
+    before = db_bytes()
+    db = SessionLocal()
+    t0 = time.perf_counter()
+    try:
+        inserted = seed_db(db, generate(w))
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - t0
+    after = db_bytes()
+    return {
+        "events": inserted,
+        "seed_seconds": round(elapsed, 2),
+        "db_bytes": after,
+        "bytes_per_event": round((after - before) / max(inserted, 1), 1),
+    }
+
+
+def analysis_endpoints(w: Workload):
+    frm, to = w.start.isoformat(), w.end.isoformat()
+    return {
+        "events": ("/events", {"limit": 100}),
+        "timeline": ("/analysis/timeline", {"limit": 500}),
+        "top_windows": ("/analysis/top-windows", {"start": frm, "end": to}),
+        "top_windows_approx": ("/analysis/top-windows", {"start": frm, "end": to, "approx": True}),
+        "distinct_counts": ("/analysis/distinct-counts", {"start": frm, "end": to}),
+        "series": ("/analysis/series", {"from": frm, "to": to, "source": "input", "width": 300}),
+        "routines": ("/analysis/routines", {"days": w.days}),
+        "automation_candidates": ("/analysis/automation-candidates", {"days": w.days}),
+        "dashboard_summary": ("/analysis/dashboard/summary", {"from": frm, "to": to}),
+        "screenshots_list": ("/analysis/screenshots/list", {"from": frm, "to": to}),
+        "browser": ("/browser", {}),
+    }
+
+
+def bench_analysis(client: TestClient, w: Workload, repeat: int) -> dict:
+    results = {}
+    for name, (url, params) in analysis_endpoints(w).items():
+        samples = []
+        status = None
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            r = client.get(url, params=params)
+            samples.append((time.perf_counter() - t0) * 1e3)
+            status = r.status_code
+        results[name] = {
+            "status": status,
+            "median_ms": round(statistics.median(samples), 2),
+            "p95_ms": round(percentile(samples, 0.95), 2),
+        }
+    return results
+
+
+def bench_export(client: TestClient, sources) -> dict:
+    results = {}
+    for source in sources:
+        for fmt in ("csv", "json"):
+            t0 = time.perf_counter()
+            r = client.get("/export/events", params={"source": source, "fmt": fmt})
+            elapsed = time.perf_counter() - t0
+            if r.status_code != 200:
+                continue
+            rows = r.content.count(b"\n") - 1 if fmt == "csv" else len(r.json())
+            results[f"{source}_{fmt}"] = {
+                "rows": rows,
+                "seconds": round(elapsed, 3),
+                "rows_per_s": round(rows / elapsed, 1),
+                "mb_per_s": round(len(r.content) / elapsed / 1e6, 2),
+            }
+    return results
+
+
+# =========================
+# Vergleich
+# =========================
+
+# Metriken, bei denen kleiner besser ist; alles andere (…_per_s): größer ist besser
+LOWER_IS_BETTER = ("_ms", "bytes_per_event", "seconds")
+
+
+def flatten(d: dict, prefix: str = "") -> dict:
+    out = {}
+    for k, v in d.items():
+        key = f"{prefix}.{k}" if prefix else k
+        if isinstance(v, dict):
+            out.update(flatten(v, key))
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            out[key] = v
+    return out
+
+
+def compare(old: dict, new: dict, threshold: float) -> int:
+    """Druckt die Änderungen und liefert die Anzahl Regressionen über `threshold` Prozent."""
+    a, b = flatten(old["results"]), flatten(new["results"])
+    regressions = 0
+    print(f"\nVergleich mit {old['meta'].get('revision') or '?'} ({old['meta']['created']}):")
+    for key in sorted(a.keys() & b.keys()):
+        if not key.endswith(("_per_s",) + LOWER_IS_BETTER) or not a[key]:
+            continue
+        change = (b[key] - a[key]) / a[key] * 100
+        worse = change > threshold if key.endswith(LOWER_IS_BETTER) else change < -threshold
+        regressions += worse
+        mark = "  ← REGRESSION" if worse else ""
+        print(f"  {key:<48} {a[key]:>12} → {b[key]:>12} ({change:+6.1f}%){mark}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_workload_args(parser)
+    parser.add_argument("--ingest", type=int, default=2000, help="Events je Ingest-Messung")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5, help="Wiederholungen je Analyse-Endpunkt")
+    parser.add_argument("--out", type=Path, default=None, help="Ergebnis-Datei (Standard: benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, default=None, help="früheres Ergebnis zum Vergleich")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regressionsschwelle in Prozent")
+    args = parser.parse_args()
+
+    init_db()
+    workload = workload_from_args(args)
+    client = TestClient(app)
+
+    results = {}
+    print("Befülle Datenbank …", flush=True)
+    results["storage"] = bench_storage(workload)
+    print(f"  {results['storage']}")
+    print("Ingest …", flush=True)
+    results["ingest"] = bench_ingest(client, workload, args.ingest, args.batch_size)
+    print(f"  {results['ingest']}")
+    print("Analyse-Endpunkte …", flush=True)
+    results["analysis"] = bench_analysis(client, workload, args.repeat)
+    for name, r in results["analysis"].items():
+        print(f"  {name:<24} {r['median_ms']:>9.2f} ms (p95 {r['p95_ms']:.2f} ms, HTTP {r['status']})")
+    print("Export …", flush=True)
+    results["export"] = bench_export(client, ("window", "input"))
+    for name, r in results["export"].items():
+        print(f"  {name:<24} {r['rows_per_s']:>12.1f} Zeilen/s ({r['mb_per_s']} MB/s)")
+
+    now = datetime.now(timezone.utc)
+    report = {
+        "meta": {
+            "created": now.isoformat(),
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "workload": {k: v for k, v in vars(args).items() if k in ("days", "rate", "apps", "titles", "seed", "screenshot_interval")},
+        },
+        "results": results,
+    }
+
+    out = args.out or RESULTS_DIR / f"suite-{now:%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nErgebnis: {out}")
+
+    if args.compare:
+        old = json.loads(args.compare.read_text(encoding="utf-8"))
+        if compare(old, report, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
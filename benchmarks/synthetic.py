@@ -0,0 +1,246 @@
+# benchmarks/synthetic.py
+"""
+Deterministischer Generator für realistische Event-Ströme.
+
+Erzeugt für jeden Arbeitstag im Zeitraum eine Folge von Fokuswechseln
+(window), Tastatur-/Maus-Events im jeweils aktiven Fenster (input),
+Dokument-Speichervorgängen (document), periodischen Screenshots
+(screenshot) und Tab-/Seiten-Events, solange ein Browser im Vordergrund
+ist (browser). Gleicher Seed + gleiche Parameter = gleiche Events.
+
+Die Events haben dasselbe Format wie die Collectoren sie an /events und
+/events/batch schicken (timestamp als ISO-String, UTC).
+
+Aufruf (aus dem Projekt-Root), schreibt JSON Lines nach stdout:
+    python -m benchmarks.synthetic --days 2 --rate 5 --apps 20 > events.jsonl
+"""
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+BROWSERS = ("chrome.exe", "firefox.exe", "msedge.exe")
+OFFICE_APPS = ("WINWORD.EXE", "EXCEL.EXE", "POWERPNT.EXE", "Code.exe", "notepad++.exe")
+OTHER_APPS = (
+    "OUTLOOK.EXE", "Teams.exe", "explorer.exe", "SAP.exe", "DATEV.exe", "slack.exe",
+    "cmd.exe", "WindowsTerminal.exe", "AcroRd32.exe", "Spotify.exe", "mstsc.exe",
+)
+DOC_SUFFIXES = {
+    "WINWORD.EXE": ".docx",
+    "EXCEL.EXE": ".xlsx",
+    "POWERPNT.EXE": ".pptx",
+    "Code.exe": ".py",
+    "notepad++.exe": ".txt",
+}
+DOMAINS = (
+    "mail.google.com", "github.com", "stackoverflow.com", "docs.python.org",
+    "intranet.example.com", "jira.example.com", "confluence.example.com",
+    "www.google.com", "de.wikipedia.org", "www.youtube.com", "portal.azure.com",
+)
+INPUT_MIX = (
+    ("key_down", 0.36), ("key_up", 0.36), ("mouse_move", 0.2),
+    ("mouse_click_down", 0.03), ("mouse_click_up", 0.03), ("mouse_scroll", 0.02),
+)
+KEYS = "etaoinshrdlucmfwypvbgkqjxz"
+
+
+class Workload:
+    """
+    Parameter eines synthetischen Arbeitsverlaufs.
+
+    - days: Anzahl Tage bis `end` (Standard: jetzt)
+    - rate: Input-Events pro Sekunde während aktiver Zeit
+    - apps / titles: Anzahl verschiedener Programme / Fenstertitel je Programm
+    - work_hours: (von, bis) in UTC-Stunden; außerhalb entstehen keine Events
+    - mean_focus_seconds: mittlere Verweildauer in einem Fenster
+    - screenshot_interval: Sekunden zwischen Screenshots (0 = keine)
+    """
+
+    def __init__(
+        self,
+        days: int = 1,
+        rate: float = 5.0,
+        apps: int = 15,
+        titles: int = 40,
+        seed: int = 42,
+        end: Optional[datetime] = None,
+        work_hours: tuple = (7, 17),
+        mean_focus_seconds: float = 90.0,
+        screenshot_interval: float = 60.0,
+        doc_save_probability: float = 0.3,
+    ):
+        self.days = days
+        self.rate = rate
+        self.apps = apps
+        self.titles = titles
+        self.seed = seed
+        self.end = end or datetime.now(timezone.utc).replace(microsecond=0)
+        self.work_hours = work_hours
+        self.mean_focus_seconds = mean_focus_seconds
+        self.screenshot_interval = screenshot_interval
+        self.doc_save_probability = doc_save_probability
+
+    @property
+    def start(self) -> datetime:
+        return self.end - timedelta(days=self.days)
+
+    def app_names(self) -> List[str]:
+        pool = list(BROWSERS[:1] + OFFICE_APPS + OTHER_APPS + BROWSERS[1:])
+        names = pool[: self.apps]
+        names += [f"tool{i}.exe" for i in range(len(names), self.apps)]
+        return names
+
+
+def _title(app: str, k: int) -> str:
+    if app in BROWSERS:
+        return f"{DOMAINS[k % len(DOMAINS)]} – Seite {k} - {app[:-4].capitalize()}"
+    if app in DOC_SUFFIXES:
+        return f"Dokument{k}{DOC_SUFFIXES[app]} - {app[:-4]}"
+    return f"{app[:-4]} – Ansicht {k}"
+
+
+def _input_payload(event_type: str, rnd: random.Random) -> Dict[str, Any]:
+    if event_type.startswith("key_"):
+        key = rnd.choice(KEYS)
+        return {"key": key, "combo": key if event_type == "key_down" else ""}
+    payload = {"x": rnd.randrange(1920), "y": rnd.randrange(1080)}
+    if event_type.startswith("mouse_click"):
+        payload["button"] = "Button.left"
+    elif event_type == "mouse_scroll":
+        payload.update(dx=0, dy=rnd.choice((-1, 1)))
+    return payload
+
+
+def generate(w: Workload) -> Iterator[Dict[str, Any]]:
+    """Liefert die Events zeitlich sortiert."""
+    rnd = random.Random(w.seed)
+    apps = w.app_names()
+    # Zipf-artige Gewichte: wenige Programme dominieren den Tag
+    weights = [1.0 / (i + 1) for i in range(len(apps))]
+    pids = {app: 1000 + 4 * i for i, app in enumerate(apps)}
+    input_types = [t for t, _ in INPUT_MIX]
+    input_weights = [p for _, p in INPUT_MIX]
+
+    day = w.start.replace(hour=0, minute=0, second=0, microsecond=0)
+    while day < w.end:
+        t = max(day + timedelta(hours=w.work_hours[0]), w.start)
+        day_end = min(day + timedelta(hours=w.work_hours[1]), w.end)
+        next_shot = t
+        shot_index = 0
+
+        while t < day_end:
+            app = rnd.choices(apps, weights)[0]
+            k = int(rnd.paretovariate(1.2)) % w.titles
+            title = _title(app, k)
+            ctx = {"app": app, "title": title, "pid": pids[app]}
+            focus_end = min(t + timedelta(seconds=rnd.expovariate(1.0 / w.mean_focus_seconds) + 1), day_end)
+
+            pending = [(t, "window", "window_focus", dict(ctx))]
+
+            if app in BROWSERS:
+                url = f"https://{DOMAINS[k % len(DOMAINS)]}/seite/{k}"
+                for et in ("tab_activated", "page_loaded"):
+                    pending.append((t, "browser", et, {
+                        "url": url, "title": title, "tab_id": k, "window_id": 1, "dom_event": None,
+                    }))
+
+            if app in DOC_SUFFIXES and rnd.random() < w.doc_save_probability:
+                name = f"Dokument{k}{DOC_SUFFIXES[app]}"
+                save_at = t + (focus_end - t) * rnd.random()
+                pending.append((save_at, "document", "doc_modified", {
+                    "path": f"C:\\Users\\bench\\Documents\\{name}", "name": name, "suffix": DOC_SUFFIXES[app],
+                }))
+
+            # Input: Poisson-Prozess mit `rate` Events/s
+            if w.rate > 0:
+                ts = t + timedelta(seconds=rnd.expovariate(w.rate))
+                while ts < focus_end:
+                    et = rnd.choices(input_types, input_weights)[0]
+                    pending.append((ts, "input", et, {**ctx, **_input_payload(et, rnd)}))
+                    ts += timedelta(seconds=rnd.expovariate(w.rate))
+
+            if w.screenshot_interval > 0:
+                while next_shot < focus_end:
+                    size = rnd.randint(60_000, 400_000)
+                    pending.append((next_shot, "screenshot", "screenshot_taken", {
+                        "screen_index": 0,
+                        "path": f"C:\\Users\\bench\\.tracker\\screens\\{next_shot:%Y-%m-%d}\\{shot_index:06d}.webp",
+                        "width": 1920,
+                        "height": 1080,
+                        "size_bytes": size,
+                    }))
+                    shot_index += 1
+                    next_shot += timedelta(seconds=w.screenshot_interval)
+
+            pending.sort(key=lambda e: e[0])
+            for ts, source, event_type, payload in pending:
+                yield {"timestamp": ts.isoformat(), "source": source, "type": event_type, "payload": payload}
+
+            t = focus_end
+
+        day += timedelta(days=1)
+
+
+def seed_db(db, events, chunk: int = 5000) -> int:
+    """Schreibt Events direkt (ohne HTTP) in die Event-Tabelle."""
+    from backend.models import Event
+
+    total = 0
+    rows = []
+    for e in events:
+        rows.append({
+            "timestamp": datetime.fromisoformat(e["timestamp"]),
+            "source": e["source"],
+            "type": e["type"],
+            "payload": e["payload"],
+        })
+        if len(rows) >= chunk:
+            db.bulk_insert_mappings(Event, rows)
+            db.commit()
+            total += len(rows)
+            rows = []
+    if rows:
+        db.bulk_insert_mappings(Event, rows)
+        db.commit()
+        total += len(rows)
+    return total
+
+
+def add_workload_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--rate", type=float, default=5.0, help="Input-Events/s in aktiver Zeit")
+    parser.add_argument("--apps", type=int, default=15)
+    parser.add_argument("--titles", type=int, default=40, help="verschiedene Titel je Programm")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--screenshot-interval", type=float, default=60.0)
+
+
+def workload_from_args(args, end: Optional[datetime] = None) -> Workload:
+    return Workload(
+        days=args.days,
+        rate=args.rate,
+        apps=args.apps,
+        titles=args.titles,
+        seed=args.seed,
+        end=end,
+        screenshot_interval=args.screenshot_interval,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_workload_args(parser)
+    parser.add_argument("--end", type=datetime.fromisoformat, default=None, help="Ende (ISO, Standard: jetzt)")
+    args = parser.parse_args()
+
+    end = args.end
+    if end is not None and end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    for event in generate(workload_from_args(args, end)):
+        sys.stdout.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
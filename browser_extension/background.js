@@ -1,93 +1,18 @@
-const BACKEND_URL = "http://127.0.0.1:8000/events";
-
-function sendBrowserEvent(type, details) {
-  const payload = {
-    timestamp: new Date().toISOString(),
-    source: "browser",
-    type: type,
-    payload: {
-      url: details.url || null,
-      title: details.title || null,
-      tab_id: details.tabId || null,
-      window_id: details.windowId || null,
-    },
-  };
-
-  fetch(BACKEND_URL, {
-    method: "POST",
-    headers: {
-      "Content-Type": "application/json",
-    },
-    body: JSON.stringify(payload),
-  }).catch((err) => {
-    console.warn("Local Activity Tracker – sendBrowserEvent failed", err);
-  });
-}
-
-chrome.tabs.onActivated.addListener(async (activeInfo) => {
-  try {
-    const tab = await chrome.tabs.get(activeInfo.tabId);
-    if (!tab.url || tab.url.startsWith("chrome://")) return;
-
-    sendBrowserEvent("tab_activated", {
-      url: tab.url,
-      title: tab.title,
-      tabId: tab.id,
-      windowId: tab.windowId,
-    });
-  } catch (e) {
-    console.warn("Local Activity Tracker – onActivated error", e);
-  }
-});
-
-chrome.tabs.onUpdated.addListener((tabId, changeInfo, tab) => {
-  if (changeInfo.status !== "complete") return;
-  if (!tab.url || tab.url.startsWith("chrome://")) return;
-
-  sendBrowserEvent("page_loaded", {
-    url: tab.url,
-    title: tab.title,
-    tabId: tab.id,
-    windowId: tab.windowId,
-  });
-});
-
-// Events aus dem Content Script verarbeiten
-chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
-  try {
-    if (!message || message.type !== "browser-event") {
-      return; // andere Messages ignorieren
-    }
-
-    const payload = message.payload || {};
-    const tabId = sender.tab?.id || null;
-    const windowId = sender.tab?.windowId || null;
-
-    // Wir verwenden denselben Backend-Endpunkt wie für tab_activated / page_loaded
-    sendBrowserEvent("browser_dom_event", {
-      url: payload.url,
-      title: payload.title,
-      tabId,
-      windowId
-    });
-
-    // Du könntest hier auch mehr Details aus payload nach hinten durchreichen
-    // z. B. event_type, element_tag, value_preview etc.
-    // sendBrowserEvent("browser_dom_event", { ...payload, tabId, windowId });
-
-    sendResponse({ ok: true });
-  } catch (e) {
-    console.warn("Local Activity Tracker – onMessage error", e);
-    sendResponse({ ok: false, error: e?.message || String(e) });
-  }
+// background.js – Manifest V3 Service Worker
 
-  // Kein asynchrones sendResponse → false zurückgeben
-  return false;
-});
+const BACKEND_BASE = "http://127.0.0.1:8000";
+const EVENTS_URL = `${BACKEND_BASE}/events`;
+const BROWSER_EVENTS_BATCH_URL = `${BACKEND_BASE}/browser-events/batch`;
 
-// background.js – Manifest V3 Service Worker
+// DOM-Events aus content.js werden gesammelt und gebündelt geschickt –
+// das Backend verdichtet Duplikate und Tipp-Folgen pro Batch.
+const DOM_FLUSH_DELAY_MS = 2_000;
+const DOM_BATCH_MAX = 50;
+const DOM_BUFFER_MAX = 1_000; // Backend länger weg → älteste verwerfen
 
-const BACKEND_URL = "http://127.0.0.1:8000/events";
+let domBuffer = [];
+let domFlushTimer = null;
+let domFlushing = false;
 
 async function sendBrowserEvent(type, details) {
   const payload = {
@@ -99,12 +24,11 @@ async function sendBrowserEvent(type, details) {
       title: details.title || null,
       tab_id: details.tabId || null,
       window_id: details.windowId || null,
-      dom_event: details.domEvent || null,  // für Content-Script-Details
     },
   };
 
   try {
-    await fetch(BACKEND_URL, {
+    await fetch(EVENTS_URL, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify(payload),
@@ -114,6 +38,56 @@ async function sendBrowserEvent(type, details) {
   }
 }
 
+// ----------------------------------------
+// DOM-Events: Puffer + Batch-Versand
+// ----------------------------------------
+function queueDomEvent(event) {
+  domBuffer.push(event);
+  if (domBuffer.length > DOM_BUFFER_MAX) {
+    domBuffer.splice(0, domBuffer.length - DOM_BUFFER_MAX);
+  }
+  if (domBuffer.length >= DOM_BATCH_MAX) {
+    flushDomEvents();
+  } else if (domFlushTimer === null) {
+    domFlushTimer = setTimeout(flushDomEvents, DOM_FLUSH_DELAY_MS);
+  }
+}
+
+async function flushDomEvents() {
+  if (domFlushTimer !== null) {
+    clearTimeout(domFlushTimer);
+    domFlushTimer = null;
+  }
+  if (domFlushing) return; // der laufende Versand holt den Rest nach
+  domFlushing = true;
+
+  try {
+    while (domBuffer.length > 0) {
+      const batch = domBuffer.slice(0, DOM_BATCH_MAX);
+      const resp = await fetch(BROWSER_EVENTS_BATCH_URL, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ events: batch }),
+      });
+      if (resp.status === 422) {
+        // ungültige Events: Wiederholen hilft nicht
+        console.warn("Local Activity Tracker – batch rejected", await resp.text());
+      } else if (!resp.ok) {
+        throw new Error(`HTTP ${resp.status}`);
+      }
+      domBuffer.splice(0, batch.length);
+    }
+  } catch (err) {
+    // Events bleiben im Puffer, nächster Versuch nach DOM_FLUSH_DELAY_MS
+    console.warn("Local Activity Tracker – flushDomEvents failed:", err);
+    if (domFlushTimer === null) {
+      domFlushTimer = setTimeout(flushDomEvents, DOM_FLUSH_DELAY_MS);
+    }
+  } finally {
+    domFlushing = false;
+  }
+}
+
 // ----------------------------------------
 // TAB ACTIVATED
 // ----------------------------------------
@@ -158,19 +132,12 @@ chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
     }
 
     const payload = message.payload || {};
-    const tabId = sender.tab?.id || null;
-    const windowId = sender.tab?.windowId || null;
-
-    const domEvent = { ...payload };
-
-    sendBrowserEvent(payload.event_type || "browser_dom_event", {
-      url: payload.url,
-      title: payload.title,
-      tabId,
-      windowId,
-      domEvent,
-    });
+    if (!payload.url || !payload.event_type) {
+      sendResponse({ ok: false, error: "url und event_type fehlen" });
+      return false;
+    }
 
+    queueDomEvent(payload);
     sendResponse({ ok: true });
   } catch (e) {
     console.warn("Local Activity Tracker – onMessage error", e);
@@ -190,10 +157,11 @@ function sendHeartbeat() {
     title: null,
     tabId: null,
     windowId: null,
-    domEvent: null,
   });
 }
 
-// alle 30 Sekunden ein Lebenszeichen
-setInterval(sendHeartbeat, 30_000);
-
+// alle 30 Sekunden ein Lebenszeichen – und liegengebliebene DOM-Events raus
+setInterval(() => {
+  sendHeartbeat();
+  flushDomEvents();
+}, 30_000);
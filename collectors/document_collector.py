@@ -1,14 +1,30 @@
 # collectors/document_collector.py
 #!/usr/bin/env python3
+import fnmatch
+import hashlib
+import os
+import queue
+import re
+import sqlite3
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, List, Optional, Tuple
 
-import requests
 from watchdog.observers import Observer
+from watchdog.observers.api import ObservedWatch
 from watchdog.events import FileSystemEventHandler
 
+try:
+    from collectors.runtime import CollectorContext, Transport, standalone_context
+    from collectors.telemetry import CollectorTelemetry
+except ImportError:  # Start als Skript: python collectors/document_collector.py
+    from runtime import CollectorContext, Transport, standalone_context
+    from telemetry import CollectorTelemetry
+
 
 BACKEND_URL = "http://127.0.0.1:8000"
 
@@ -32,87 +48,536 @@ INTERESTING_EXTENSIONS = {
     ".csv",
 }
 
+# Verzeichnisse, deren Inhalt nie interessant ist (irgendwo im Pfad)
+IGNORE_DIR_NAMES = {
+    ".git", ".svn", ".hg",
+    "node_modules", "__pycache__",
+    ".venv", "venv", ".tox", ".mypy_cache", ".pytest_cache",
+    ".idea", ".vs", ".vscode",
+    "bin", "obj", "dist", "build",
+}
+
+# inotify (Linux) überwacht rekursiv jedes Unterverzeichnis einzeln – auch in
+# .git, node_modules & Co. Dort daher nur die erlaubten Verzeichnisse einzeln
+# beobachten (WatchTree). Windows/macOS beobachten einen Baum mit einem Handle.
+PRUNE_WATCHES = sys.platform.startswith("linux")
+
+# Temporär-/Lock-Dateien von Office & Editoren
+IGNORE_FILE_PATTERNS = [
+    "~$*",        # Office-Lockfiles (~$Bericht.docx)
+    ".~lock.*",   # LibreOffice
+    "*.tmp",
+    "*.swp", "*.swx", "*~", ".#*",
+]
+
+# Debouncing: mehrere Events pro Datei innerhalb dieses Fensters → ein Event
+DEBOUNCE_SECONDS = 1.5
+# Spätestens nach dieser Zeit wird auch bei Dauer-Schreibzugriffen gesendet
+MAX_DELAY_SECONDS = 15.0
+
+SEND_BATCH_MAX = 100       # Events pro POST /events/batch
+SEND_QUEUE_MAX = 5000      # darüber werden Events verworfen (Backend weg)
+
+# Inhalts-Fingerprint (Größe + SHA-256) für echte Änderungen vs. "nur gespeichert"
+ENABLE_FINGERPRINT = True
+HASH_WORKERS = 2                        # parallele Hash-Threads
+HASH_QUEUE_MAX = 64                     # wartende Hash-Jobs, darüber ohne Hash senden
+HASH_MAX_BYTES = 200 * 1024 * 1024      # größere Dateien nur mit Größe melden
+HASH_CHUNK_BYTES = 1024 * 1024          # Lesen in 1-MB-Blöcken
+FINGERPRINT_DB = Path.home() / ".tracker" / "doc_fingerprints.sqlite"
+
 
 def now_iso():
     return datetime.now(timezone.utc).isoformat()
 
 
+class IgnoreRules:
+    """
+    Einmal kompilierte Filterregeln. Arbeitet nur auf dem Pfad-String –
+    kein stat(), damit der watchdog-Thread nie auf die Platte wartet.
+    """
+
+    _SPLIT = re.compile(r"[\\/]")
+
+    def __init__(self, extensions, dir_names, file_patterns):
+        self.extensions = {e.lower() for e in extensions}
+        self.dir_names = {d.lower() for d in dir_names}
+        self.file_re = re.compile(
+            "|".join(fnmatch.translate(p) for p in file_patterns),
+            re.IGNORECASE,
+        )
+
+    def is_ignored_dir(self, name: str) -> bool:
+        return name.lower() in self.dir_names
+
+    def is_interesting(self, path: str) -> bool:
+        parts = self._SPLIT.split(path)
+        name = parts[-1]
+
+        dot = name.rfind(".")
+        if dot <= 0 or name[dot:].lower() not in self.extensions:
+            return False
+        if self.file_re.match(name):
+            return False
+        for part in parts[:-1]:
+            if part.lower() in self.dir_names:
+                return False
+        return True
+
+
+rules = IgnoreRules(INTERESTING_EXTENSIONS, IGNORE_DIR_NAMES, IGNORE_FILE_PATTERNS)
+
+
 def is_interesting(path: Path) -> bool:
-    if not path.is_file():
-        return False
-    return path.suffix.lower() in INTERESTING_EXTENSIONS
+    return rules.is_interesting(str(path))
+
 
+def _merge(old: str, new: str) -> Optional[str]:
+    """
+    Fasst zwei Event-Typen derselben Datei zusammen.
+    None = beide heben sich auf (z.B. angelegt und gleich wieder gelöscht).
+    """
+    if old == "doc_created":
+        if new == "doc_deleted":
+            return None
+        return "doc_created"
+    if old == "doc_deleted" and new == "doc_created":
+        # Editoren speichern oft per Löschen + Neu-Anlegen
+        return "doc_modified"
+    if old == "doc_moved" and new == "doc_modified":
+        return "doc_moved"
+    return new
 
-def send_doc_event(event_type: str, path: Path):
-    payload = {
-        "timestamp": now_iso(),
+
+class DocEventCoalescer:
+    """
+    Sammelt Datei-Events pro Pfad und gibt sie erst frei, wenn für
+    DEBOUNCE_SECONDS Ruhe war (bzw. spätestens nach MAX_DELAY_SECONDS).
+    """
+
+    def __init__(
+        self,
+        window: float = DEBOUNCE_SECONDS,
+        max_delay: float = MAX_DELAY_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window = window
+        self.max_delay = max_delay
+        self.clock = clock
+        self._lock = threading.Lock()
+        # path -> [event_type, first_seen, last_seen, timestamp_iso]
+        self._pending: Dict[str, list] = {}
+
+        self.received = 0
+        self.emitted = 0
+
+    def add(self, event_type: str, path: str):
+        now = self.clock()
+        with self._lock:
+            self.received += 1
+            entry = self._pending.get(path)
+            if entry is None:
+                self._pending[path] = [event_type, now, now, now_iso()]
+                return
+
+            merged = _merge(entry[0], event_type)
+            if merged is None:
+                del self._pending[path]
+                return
+            entry[0] = merged
+            entry[2] = now
+            entry[3] = now_iso()
+
+    def pop_due(self, flush: bool = False) -> List[Tuple[str, str, str]]:
+        """
+        Liefert fällige Events als (event_type, path, timestamp_iso).
+        flush=True: alle offenen, unabhängig vom Zeitfenster (beim Beenden).
+        """
+        now = self.clock()
+        due = []
+        with self._lock:
+            for path, (event_type, first, last, ts) in list(self._pending.items()):
+                if flush or now - last >= self.window or now - first >= self.max_delay:
+                    due.append((event_type, path, ts))
+                    del self._pending[path]
+            self.emitted += len(due)
+        return due
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending)
+
+
+def build_doc_event(event_type: str, path: Path, timestamp: Optional[str] = None) -> dict:
+    return {
+        "timestamp": timestamp or now_iso(),
         "source": "document",
         "type": event_type,
         "payload": {
             "path": str(path),
             "name": path.name,
             "suffix": path.suffix,
-            # evtl. später: Dateigröße, Hash, etc.
         }
     }
+
+
+telemetry = CollectorTelemetry("document")
+
+
+def send_doc_events(transport: Transport, events: List[dict]):
     try:
-        requests.post(f"{BACKEND_URL}/events", json=payload, timeout=2)
+        with telemetry.timer("send"):
+            transport.post("/events/batch", {"events": events}, timeout=5)
     except Exception as e:
+        telemetry.incr("send_errors")
         print(f"[ERROR] Backend unreachable in document_collector: {e}")
 
 
+class FingerprintCache:
+    """
+    Persistenter Cache (path, mtime, size) -> sha256 in einer kleinen SQLite-Datei.
+    Unveränderte Dateien (gleiche mtime/Größe) werden nicht erneut gehasht.
+    """
+
+    def __init__(self, db_path: Path = FINGERPRINT_DB):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            " path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, sha256 TEXT)"
+        )
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, path: str) -> Optional[Tuple[int, int, str]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT mtime_ns, size, sha256 FROM fingerprints WHERE path = ?", (path,)
+            ).fetchone()
+
+    def store(self, path: str, mtime_ns: int, size: int, sha256: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fingerprints (path, mtime_ns, size, sha256) VALUES (?, ?, ?, ?)",
+                (path, mtime_ns, size, sha256),
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def hash_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_BYTES)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def fingerprint(cache: FingerprintCache, path: Path) -> Dict[str, object]:
+    """
+    Liefert size_bytes und – bis HASH_MAX_BYTES – sha256 sowie content_changed
+    (False = Datei wurde nur neu gespeichert, Inhalt identisch).
+    """
+    st = path.stat()
+    info: Dict[str, object] = {"size_bytes": st.st_size}
+    if st.st_size > HASH_MAX_BYTES:
+        info["hash_skipped"] = "too_large"
+        return info
+
+    key = str(path)
+    previous = cache.lookup(key)
+    if previous is not None and previous[0] == st.st_mtime_ns and previous[1] == st.st_size:
+        cache.hits += 1
+        digest = previous[2]
+    else:
+        cache.misses += 1
+        digest = hash_file(path)
+        cache.store(key, st.st_mtime_ns, st.st_size, digest)
+
+    info["sha256"] = digest
+    if previous is not None:
+        info["content_changed"] = previous[2] != digest
+    return info
+
+
 class DocEventHandler(FileSystemEventHandler):
+    """
+    Läuft im watchdog-Thread: nur filtern und in den Coalescer legen.
+    Mit `tree` werden neue/verschobene/gelöschte Verzeichnisse nachgeführt.
+    """
+
+    def __init__(self, coalescer: DocEventCoalescer):
+        super().__init__()
+        self.coalescer = coalescer
+        self.tree: Optional["WatchTree"] = None
+
     def on_created(self, event):
         if event.is_directory:
+            if self.tree is not None:
+                self.tree.add(event.src_path)
             return
-        p = Path(event.src_path)
-        if is_interesting(p):
-            send_doc_event("doc_created", p)
+        if rules.is_interesting(event.src_path):
+            self.coalescer.add("doc_created", event.src_path)
 
     def on_modified(self, event):
         if event.is_directory:
             return
-        p = Path(event.src_path)
-        if is_interesting(p):
-            send_doc_event("doc_modified", p)
+        if rules.is_interesting(event.src_path):
+            self.coalescer.add("doc_modified", event.src_path)
 
     # Optional: löschen / verschieben ebenfalls loggen
     def on_moved(self, event):
         if event.is_directory:
+            if self.tree is not None:
+                self.tree.remove(event.src_path)
+                self.tree.add(event.dest_path)
             return
-        dest = Path(event.dest_path)
-        if is_interesting(dest):
-            send_doc_event("doc_moved", dest)
+        if rules.is_interesting(event.dest_path):
+            self.coalescer.add("doc_moved", event.dest_path)
 
     def on_deleted(self, event):
         if event.is_directory:
+            if self.tree is not None:
+                self.tree.remove(event.src_path)
             return
-        p = Path(event.src_path)
-        if is_interesting(p):
-            send_doc_event("doc_deleted", p)
+        if rules.is_interesting(event.src_path):
+            self.coalescer.add("doc_deleted", event.src_path)
 
 
-def main():
-    observer = Observer()
-    handler = DocEventHandler()
+class WatchTree:
+    """
+    Nicht-rekursive Watches für jedes Verzeichnis unterhalb der Wurzeln, außer
+    ignorierten (rules.is_ignored_dir) samt Inhalt. Symlinks werden nicht
+    verfolgt. Dateien, die in einem neuen Verzeichnis vor dessen Watch
+    entstehen, werden nicht gemeldet.
+    """
 
-    for d in WATCH_DIRS:
-        if d.exists():
-            print(f"[INFO] Überwache Ordner: {d}")
-            observer.schedule(handler, str(d), recursive=True)
-        else:
-            print(f"[WARN] Ordner existiert nicht: {d}")
+    def __init__(self, observer: Observer, handler: FileSystemEventHandler):
+        self.observer = observer
+        self.handler = handler
+        self._watches: Dict[str, ObservedWatch] = {}
 
-    observer.start()
-    print("Document-Collector läuft… (Strg+C zum Beenden)")
+    def __len__(self):
+        return len(self._watches)
 
-    try:
+    def add(self, root: str) -> int:
+        """Beobachtet root und alle erlaubten Unterverzeichnisse; liefert die Anzahl neuer Watches."""
+        if rules.is_ignored_dir(os.path.basename(root.rstrip("\\/"))):
+            return 0
+        added = 0
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            if path not in self._watches:
+                try:
+                    self._watches[path] = self.observer.schedule(self.handler, path, recursive=False)
+                except OSError as e:
+                    # z.B. fs.inotify.max_user_watches erreicht, Ordner schon weg
+                    print(f"[WARN] Kann {path} nicht überwachen: {e}")
+                    continue
+                added += 1
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False) and not rules.is_ignored_dir(entry.name):
+                            stack.append(entry.path)
+            except OSError:
+                continue
+        return added
+
+    def remove(self, root: str):
+        prefix = root.rstrip("\\/") + os.sep
+        for path in [p for p in self._watches if p == root or p.startswith(prefix)]:
+            watch = self._watches.pop(path)
+            try:
+                self.observer.unschedule(watch)
+            except KeyError:
+                pass
+
+
+class DocEventDispatcher:
+    """
+    Hintergrund-Threads: holt fällige Events aus dem Coalescer (inkl. stat),
+    lässt sie optional im Hash-Pool anreichern und sendet sie gebündelt an
+    /events/batch.
+    """
+
+    def __init__(
+        self,
+        coalescer: DocEventCoalescer,
+        fingerprints: Optional[FingerprintCache] = None,
+        transport: Optional[Transport] = None,
+    ):
+        self.coalescer = coalescer
+        self.outbox: "queue.Queue[dict]" = queue.Queue(maxsize=SEND_QUEUE_MAX)
+        self.dropped = 0
+        self.unhashed = 0
+        self.transport = transport or Transport(BACKEND_URL)
+
+        self.fingerprints = fingerprints
+        self.pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="doc-hash")
+        self._hash_slots = threading.BoundedSemaphore(HASH_QUEUE_MAX)
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def telemetry_gauges(self) -> Dict[str, float]:
+        gauges = {
+            "received": self.coalescer.received,
+            "events": self.coalescer.emitted,
+            "dropped": self.dropped,
+            "unhashed": self.unhashed,
+            "pending": len(self.coalescer),
+            "buffer_depth": self.outbox.qsize(),
+            "buffer_capacity": SEND_QUEUE_MAX,
+        }
+        if self.fingerprints is not None:
+            gauges["hash_cache_hits"] = self.fingerprints.hits
+            gauges["hash_cache_misses"] = self.fingerprints.misses
+        return gauges
+
+    def start(self):
+        self._threads = [
+            threading.Thread(target=self._dispatch_loop, name="doc-dispatch", daemon=True),
+            threading.Thread(target=self._send_loop, name="doc-send", daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self, flush: bool = True, timeout: float = 5.0):
+        """
+        Beendet Threads und Hash-Pool und schließt den Fingerprint-Cache.
+        flush=True: offene Events (Coalescer, laufende Hashes, Outbox) vorher senden.
+        """
+        self._stopping.set()
+        for t in self._threads:
+            t.join(timeout)
+        if flush:
+            # ohne Hash – beim Beenden zählt, dass das Event ankommt
+            self._dispatch(self.coalescer.pop_due(flush=True), hash_allowed=False)
+        self.pool.shutdown(wait=True, cancel_futures=not flush)
+        if self.fingerprints is not None:
+            self.fingerprints.close()
+        if flush:
+            self._send_pending()
+
+    def _dispatch_loop(self):
+        tick = max(self.coalescer.window / 4, 0.1)
+        while not self._stopping.wait(tick):
+            loop_start = time.perf_counter()
+            self._dispatch(self.coalescer.pop_due())
+            telemetry.observe("loop", time.perf_counter() - loop_start)
+
+    def _dispatch(self, due: List[Tuple[str, str, str]], hash_allowed: bool = True):
+        for event_type, raw_path, ts in due:
+            path = Path(raw_path)
+            # Existenz erst jetzt prüfen – einmal pro zusammengefasstem Event
+            if event_type != "doc_deleted" and not path.is_file():
+                continue
+            event = build_doc_event(event_type, path, ts)
+            if not hash_allowed or self.fingerprints is None or event_type == "doc_deleted":
+                self.enqueue(event)
+            elif self._hash_slots.acquire(blocking=False):
+                self.pool.submit(self._enrich, event, path)
+            else:
+                # Hash-Pool ausgelastet → lieber ohne Hash als verspätet
+                self.unhashed += 1
+                self.enqueue(event)
+
+    def _enrich(self, event: dict, path: Path):
+        try:
+            with telemetry.timer("hash"):
+                event["payload"].update(fingerprint(self.fingerprints, path))
+        except OSError as e:
+            # Datei zwischenzeitlich gelöscht/gesperrt (z.B. von Office)
+            event["payload"]["hash_error"] = str(e)
+        except Exception as e:
+            print(f"[WARN] Fingerprint fehlgeschlagen für {path}: {e}")
+        finally:
+            self._hash_slots.release()
+            self.enqueue(event)
+
+    def enqueue(self, event: dict):
+        try:
+            self.outbox.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def _send_loop(self):
+        while not self._stopping.is_set():
+            try:
+                first = self.outbox.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            send_doc_events(self.transport, self._take_batch([first]))
+
+    def _take_batch(self, batch: List[dict]) -> List[dict]:
+        while len(batch) < SEND_BATCH_MAX:
+            try:
+                batch.append(self.outbox.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _send_pending(self):
         while True:
-            time.sleep(1)
+            batch = self._take_batch([])
+            if not batch:
+                return
+            send_doc_events(self.transport, batch)
+
+
+def main(ctx: CollectorContext = None):
+    ctx = ctx or standalone_context(BACKEND_URL)
+    observer = Observer()
+    coalescer = DocEventCoalescer()
+    handler = DocEventHandler(coalescer)
+    fingerprints = FingerprintCache() if ENABLE_FINGERPRINT else None
+    dispatcher = DocEventDispatcher(coalescer, fingerprints, ctx.transport)
+    dispatcher.start()
+    # im Host wird main() nach einem Absturz erneut aufgerufen: alles, was hier
+    # entsteht, wird im finally wieder abgebaut (Threads, Pool, SQLite, Gauges)
+    telemetry.add_gauges(dispatcher.telemetry_gauges)
+    telemetry.start(ctx.transport)
+
+    if PRUNE_WATCHES:
+        handler.tree = WatchTree(observer, handler)
+
+    try:
+        for d in WATCH_DIRS:
+            if d.exists():
+                if handler.tree is not None:
+                    count = handler.tree.add(str(d))
+                    print(f"[INFO] Überwache Ordner: {d} ({count} Verzeichnisse)")
+                else:
+                    print(f"[INFO] Überwache Ordner: {d}")
+                    observer.schedule(handler, str(d), recursive=True)
+            else:
+                print(f"[WARN] Ordner existiert nicht: {d}")
+
+        observer.start()
+        print("Document-Collector läuft… (Strg+C zum Beenden)")
+
+        # endet der Observer-Thread (z.B. überwachter Ordner entfernt), kehrt
+        # main() zurück und der Host startet den Collector neu
+        while observer.is_alive() and not ctx.sleep(1):
+            pass
     except KeyboardInterrupt:
+        pass
+    finally:
         observer.stop()
-
-    observer.join()
+        if observer.ident is not None:
+            observer.join()
+        dispatcher.stop()
+        telemetry.remove_gauges(dispatcher.telemetry_gauges)
 
 
 if __name__ == "__main__":
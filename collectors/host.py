@@ -0,0 +1,155 @@
+# collectors/host.py
+"""
+Collector-Host: alle Collectoren in einem Python-Prozess.
+
+Statt vier Interpretern (je mit eigener Kopie von Runtime, requests, psutil,
+Pillow …) läuft jeder Collector hier als eigener Thread mit gemeinsamem
+CollectorContext (collectors/runtime.py):
+
+- eine Konfiguration (~/.tracker/collectors.json bzw. TRACKER_BACKEND_URL),
+  dort lassen sich Collectoren einzeln abschalten
+- ein Transport (eine HTTP-Session mit Connection-Pool)
+- ein WindowContext – window- und input-Collector fragen das
+  Vordergrundfenster nicht mehr getrennt ab
+
+Fehler bleiben beim jeweiligen Collector: eine Exception beendet nur dessen
+Thread, der nach Backoff (1 s … 60 s) neu gestartet wird. Fehlt eine
+Abhängigkeit (ImportError, z.B. pynput ohne Desktop-Session), wird nur dieser
+Collector deaktiviert. Gegen Abstürze in C-Erweiterungen hilft das nicht –
+dafür startet start_all.py --supervise den ganzen Host neu.
+
+CPU/RSS in den Telemetrie-Berichten sind die des Host-Prozesses.
+
+Strg+C / SIGTERM (Windows: CTRL_BREAK) setzen ctx.stopping: alle Collectoren
+verlassen main() und leeren ihre Puffer, der Host wartet darauf höchstens
+STOP_TIMEOUT Sekunden (kürzer als der Kill-Timeout in start_all.py).
+
+Aufruf (aus dem Projekt-Root):
+    python -m collectors.host
+    python -m collectors.host --only window,input
+"""
+import argparse
+import importlib
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, List, Optional
+
+# nur als Modul (python -m collectors.host): die Collectoren werden als
+# collectors.<name>_collector importiert
+from collectors.runtime import COLLECTOR_NAMES, CollectorContext, Transport, install_stop_signals, load_config
+from collectors.window_context import WindowContext
+
+
+BACKOFF_MIN = 1.0
+BACKOFF_MAX = 60.0
+BACKOFF_RESET = 60.0  # so lange stabil → Backoff zurücksetzen
+STOP_TIMEOUT = 8.0
+
+MODULES = {name: f"collectors.{name}_collector" for name in COLLECTOR_NAMES}
+
+
+class CollectorTask:
+    """Ein Collector als Thread, mit Neustart nach Fehlern."""
+
+    def __init__(self, name: str, ctx: CollectorContext):
+        self.name = name
+        self.ctx = ctx
+        self.state = "starting"  # running / backoff / disabled / stopped
+        self.restarts = 0
+        self.last_error: Optional[str] = None
+        self.thread = threading.Thread(target=self._run, name=f"collector-{name}", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def _run(self):
+        backoff = BACKOFF_MIN
+        while True:
+            started = time.monotonic()
+            try:
+                module = importlib.import_module(MODULES[self.name])
+                self.state = "running"
+                module.main(self.ctx)
+                self.last_error = "main() hat sich beendet"
+            except ImportError as e:
+                self.state = "disabled"
+                self.last_error = str(e)
+                print(f"[ERROR] Collector {self.name} deaktiviert, Abhängigkeit fehlt: {e}")
+                return
+            except Exception as e:
+                self.last_error = repr(e)
+                print(f"[ERROR] Collector {self.name} abgestürzt:")
+                traceback.print_exc()
+
+            if self.ctx.stopping.is_set():
+                self.state = "stopped"
+                return
+            if time.monotonic() - started >= BACKOFF_RESET:
+                backoff = BACKOFF_MIN
+            self.state = "backoff"
+            print(f"[WARN] Collector {self.name}: Neustart in {backoff:.0f} s")
+            if self.ctx.sleep(backoff):
+                self.state = "stopped"
+                return
+            backoff = min(backoff * 2, BACKOFF_MAX)
+            self.restarts += 1
+
+
+def build_context(backend_url: Optional[str] = None) -> CollectorContext:
+    config = load_config()
+    if backend_url:
+        config.backend_url = backend_url.rstrip("/")
+    return CollectorContext(
+        config=config,
+        # Sender von input/document, Fenster- und Screenshot-Events, 4× Telemetrie
+        transport=Transport(config.backend_url, pool_size=len(COLLECTOR_NAMES) * 2),
+        window_context=WindowContext(),
+    )
+
+
+def run(
+    names: Optional[List[str]] = None,
+    backend_url: Optional[str] = None,
+    ctx: Optional[CollectorContext] = None,
+) -> Dict[str, CollectorTask]:
+    """Startet die Collectoren (Standard: alle laut Konfiguration aktivierten) und kehrt zurück."""
+    ctx = ctx or build_context(backend_url)
+    names = names or [n for n in COLLECTOR_NAMES if ctx.config.is_enabled(n)]
+    tasks = {}
+    for name in names:
+        if name not in MODULES:
+            print(f"[WARN] Unbekannter Collector: {name}")
+            continue
+        tasks[name] = CollectorTask(name, ctx)
+        tasks[name].start()
+    print(f"[INFO] Collector-Host: {', '.join(tasks) or 'keine Collectoren'} → {ctx.config.backend_url}")
+    return tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help="Kommagetrennt, z.B. window,input (überschreibt die Konfiguration)")
+    parser.add_argument("--backend", help="Backend-URL (überschreibt Konfiguration und Umgebung)")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.only.split(",") if n.strip()] if args.only else None
+    ctx = build_context(args.backend)
+    install_stop_signals(ctx)
+    tasks = run(names, ctx=ctx)
+    while any(t.thread.is_alive() for t in tasks.values()):
+        if ctx.sleep(1):
+            break
+    else:
+        print("[WARN] Kein Collector mehr aktiv – Host beendet sich")
+        sys.exit(1)
+
+    print("[INFO] Collector-Host beendet sich, Puffer werden gesendet…")
+    deadline = time.monotonic() + STOP_TIMEOUT
+    for task in tasks.values():
+        task.thread.join(max(0.0, deadline - time.monotonic()))
+
+
+if __name__ == "__main__":
+    main()
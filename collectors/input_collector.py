@@ -3,51 +3,117 @@
 import time
 import threading
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Optional, Set
 
-import requests
-from pynput import mouse, keyboard
-import win32gui
-import win32process
-import psutil
+try:
+    from collectors.runtime import CollectorContext, Transport, standalone_context
+    from collectors.telemetry import CollectorTelemetry
+    from collectors.window_context import WindowContext
+except ImportError:  # Start als Skript: python collectors/input_collector.py
+    from runtime import CollectorContext, Transport, standalone_context
+    from telemetry import CollectorTelemetry
+    from window_context import WindowContext
 
 
 BACKEND_URL = "http://127.0.0.1:8000"
 SEND_INTERVAL = 1.0    # alle 1 Sekunde Buffer senden
-BUFFER_MAX = 200       # ab so vielen Events sofort senden
+BUFFER_MAX = 200       # ab so vielen Events Sender sofort wecken
+SEND_BATCH_MAX = 1000  # max. Events pro POST
+RING_CAPACITY = 50_000 # Events im Ringpuffer, darüber wird verworfen (overflow)
 
-
-buffer: List[Dict[str, Any]] = []
-lock = threading.Lock()
+# Nach diesen Tasten (Loslassen, z.B. Ende von Alt+Tab / Win-Taste) wechselt der
+# Fokus typischerweise → Fenster-Kontext sofort neu lesen statt bis zu
+# REFRESH_INTERVAL lang den alten zu melden
+FOCUS_SWITCH_KEYS = {"alt", "alt_l", "alt_r", "alt_gr", "tab", "cmd", "cmd_l", "cmd_r"}
 
 # Set aller aktuell gedrückten Tasten für Shortcut-Erkennung
 pressed_keys: Set[str] = set()
 
+# Fenster-Kontext wird gecacht statt pro Mausbewegung abgefragt.
+# Austauschbar (z.B. WindowContext(FakeProvider()) für Benchmarks);
+# im Collector-Host setzt main(ctx) den geteilten Kontext ein.
+window_context = WindowContext()
+
 
 def now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
 def get_active_window():
-    """Gibt (app, title, pid) des aktiven Fensters zurück."""
-    try:
-        hwnd = win32gui.GetForegroundWindow()
-        if not hwnd:
-            return None, None, None
-
-        title = win32gui.GetWindowText(hwnd)
-        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-
-        app = None
-        try:
-            proc = psutil.Process(pid)
-            app = proc.name()
-        except Exception:
-            pass
+    """Gibt (app, title, pid) des aktiven Fensters zurück (gecacht)."""
+    return window_context.get()
 
-        return app, title, pid
-    except Exception:
-        return None, None, None
+
+class EventRing:
+    """
+    Vorallokierter Ringpuffer zwischen pynput-Callbacks und Sender-Thread.
+
+    push() hält den Lock nur für die Index-Arithmetik – niemals während I/O.
+    Ist der Ring voll (Backend hängt), wird das Event verworfen und gezählt,
+    statt den Hook-Thread zu blockieren.
+    """
+
+    def __init__(self, capacity: int = RING_CAPACITY):
+        self.capacity = capacity
+        self._slots: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._head = 0  # nächster Schreibindex (monoton steigend)
+        self._tail = 0  # nächster Leseindex
+        self._lock = threading.Lock()
+
+        self.pushed = 0
+        self.overflow = 0
+
+    def push(self, event: Dict[str, Any]) -> int:
+        """Legt ein Event ab und liefert die Füllhöhe (-1 bei Überlauf)."""
+        with self._lock:
+            depth = self._head - self._tail
+            if depth >= self.capacity:
+                self.overflow += 1
+                return -1
+            self._slots[self._head % self.capacity] = event
+            self._head += 1
+            self.pushed += 1
+            return depth + 1
+
+    def drain(self, max_items: int) -> List[Dict[str, Any]]:
+        """Entnimmt bis zu max_items Events (nur ein Leser zugleich, siehe _drain_lock)."""
+        with self._lock:
+            n = min(self._head - self._tail, max_items)
+            start = self._tail
+        # Slots außerhalb des Locks lesen: solange _tail noch nicht weitergesetzt
+        # ist, gelten sie als belegt und push() schreibt nicht hinein
+        out = []
+        for i in range(start, start + n):
+            idx = i % self.capacity
+            out.append(self._slots[idx])
+            self._slots[idx] = None
+        with self._lock:
+            self._tail += n
+        return out
+
+    def __len__(self):
+        return self._head - self._tail
+
+
+ring = EventRing()
+wakeup = threading.Event()
+_sender: Optional[threading.Thread] = None
+_drain_lock = threading.Lock()  # Sender-Thread und Flush beim Beenden lesen nie gleichzeitig
+
+# Sender-Statistik
+sent_events = 0
+failed_events = 0
+
+# Callbacks zählen nichts zusätzlich – die Werte werden erst beim Bericht gelesen
+telemetry = CollectorTelemetry("input")
+telemetry.add_gauges(lambda: {
+    "events": ring.pushed,
+    "dropped": ring.overflow + failed_events,
+    "buffer_depth": len(ring),
+    "buffer_capacity": ring.capacity,
+    "sent": sent_events,
+    "window_refreshes": window_context.refreshes,
+})
 
 
 def add_event(event_type: str, payload: Dict[str, Any]):
@@ -66,37 +132,47 @@ def add_event(event_type: str, payload: Dict[str, Any]):
         }
     }
 
-    with lock:
-        buffer.append(event)
-        if len(buffer) >= BUFFER_MAX:
-            flush_buffer_locked()
-
+    if ring.push(event) >= BUFFER_MAX:
+        wakeup.set()
 
-def flush_buffer_locked():
-    """Buffer senden – nur aufrufen, wenn lock bereits gehalten wird."""
-    global buffer
-    if not buffer:
-        return
-
-    to_send = buffer
-    buffer = []
 
+def send_batch(transport: Transport, events: List[Dict[str, Any]]):
+    global sent_events, failed_events
     try:
-        requests.post(
-            f"{BACKEND_URL}/events/batch",
-            json={"events": to_send},
-            timeout=2
-        )
+        with telemetry.timer("send"):
+            transport.post("/events/batch", {"events": events}, timeout=2)
+        sent_events += len(events)
     except Exception as e:
+        telemetry.incr("send_errors")
+        failed_events += len(events)
         print(f"[ERROR] Backend unreachable while sending batch: {e}")
 
 
-def sender_loop():
-    """Hintergrund-Thread, der den Buffer alle X Sekunden sendet."""
+def sender_loop(transport: Optional[Transport] = None):
+    """
+    Hintergrund-Thread: sendet alle SEND_INTERVAL Sekunden (oder sobald
+    BUFFER_MAX erreicht ist) den Inhalt des Rings. Nur hier findet I/O statt.
+    """
+    transport = transport or Transport(BACKEND_URL)
     while True:
-        time.sleep(SEND_INTERVAL)
-        with lock:
-            flush_buffer_locked()
+        wakeup.wait(SEND_INTERVAL)
+        wakeup.clear()
+        send_pending(transport)
+
+
+def send_pending(transport: Transport, until_empty: bool = False):
+    """
+    Sendet den Inhalt des Rings in Batches. Ohne until_empty endet das nach
+    dem ersten nicht vollen Batch (Nachzügler gehen mit dem nächsten Intervall).
+    """
+    with _drain_lock:
+        while True:
+            batch = ring.drain(SEND_BATCH_MAX)
+            if not batch:
+                return
+            send_batch(transport, batch)
+            if len(batch) < SEND_BATCH_MAX and not until_empty:
+                return
 
 
 # === Maus-Callbacks ===
@@ -113,6 +189,9 @@ def on_click(x, y, button, pressed):
         "y": y,
         "button": str(button)
     })
+    # der Hook meldet den Klick, bevor das Zielfenster aktiviert wird: der
+    # Klick gehört noch zum alten Kontext, das nächste Event fragt neu ab
+    window_context.invalidate()
 
 
 def on_scroll(x, y, dx, dy):
@@ -174,11 +253,24 @@ def on_key_release(key):
         "key": key_name,
         "combo": get_combo_string()
     })
+    if key_name in FOCUS_SWITCH_KEYS:
+        window_context.invalidate()
+
+
+def main(ctx: CollectorContext = None):
+    global window_context, _sender
+    # erst hier importieren: pynput braucht eine Desktop-Session, der Rest des
+    # Moduls (Buffer, Callbacks) soll auch ohne importierbar sein
+    from pynput import mouse, keyboard
 
+    ctx = ctx or standalone_context(BACKEND_URL, window_context)
+    window_context = ctx.window_context
 
-def main():
     # Hinweis: Nur auf deinem eigenen Rechner verwenden, nicht zum „Spionieren“ bei anderen.
-    threading.Thread(target=sender_loop, daemon=True).start()
+    if _sender is None or not _sender.is_alive():
+        _sender = threading.Thread(target=sender_loop, args=(ctx.transport,), name="input-sender", daemon=True)
+        _sender.start()
+    telemetry.start(ctx.transport)
 
     with mouse.Listener(
         on_move=on_move,
@@ -190,8 +282,12 @@ def main():
     ) as kl:
 
         print("Input-Collector läuft… (Strg+C zum Beenden)")
-        ml.join()
-        kl.join()
+        # stirbt ein Listener, kehrt main() zurück (Host: Neustart)
+        while ml.is_alive() and kl.is_alive() and not ctx.sleep(0.5):
+            pass
+
+    # Puffer leeren – beim Beenden wie beim Neustart
+    send_pending(ctx.transport, until_empty=True)
 
 
 if __name__ == "__main__":
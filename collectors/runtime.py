@@ -0,0 +1,225 @@
+# collectors/runtime.py
+"""
+Gemeinsame Laufzeit der Collectoren: Konfiguration, Transport, Fenster-Kontext.
+
+Ein Collector bekommt in main(ctx) einen CollectorContext. Im Collector-Host
+(collectors/host.py) teilen sich alle Collectoren denselben Kontext – eine
+HTTP-Session mit Connection-Pool und einen WindowContext, statt dass input-
+und window-Collector das Vordergrundfenster jeweils selbst abfragen. Beim
+Start als einzelnes Skript baut sich der Collector mit standalone_context()
+einen eigenen.
+
+Konfiguration (CONFIG_PATH, optional):
+    {
+        "backend_url": "http://127.0.0.1:8000",
+        "collectors": {"window": true, "input": true, "document": true, "screenshot": false}
+    }
+Die Umgebungsvariable TRACKER_BACKEND_URL hat Vorrang vor der Datei.
+
+Einstellungen aus dem Backend (POST /settings im Dashboard) liefert
+ctx.settings: ein SettingsWatcher, der GET /settings/watch per Long-Poll
+offen hält – Änderungen kommen innerhalb von Millisekunden an, ohne
+regelmäßiges Abfragen. Im Host teilen sich alle Collectoren einen Watcher.
+
+Beenden: SIGINT/SIGTERM (Windows: CTRL_BREAK → SIGBREAK) setzen über
+install_stop_signals() ctx.stopping. Die Collector-Schleifen prüfen das
+(ctx.sleep() statt time.sleep()), verlassen main() und leeren dabei ihre
+Puffer ans Backend.
+"""
+import json
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from collectors.window_context import WindowContext
+except ImportError:  # Start als Skript aus collectors/
+    from window_context import WindowContext
+
+
+CONFIG_PATH = Path.home() / ".tracker" / "collectors.json"
+DEFAULT_BACKEND_URL = "http://127.0.0.1:8000"
+COLLECTOR_NAMES = ("window", "input", "document", "screenshot")
+
+
+@dataclass
+class CollectorConfig:
+    backend_url: str = DEFAULT_BACKEND_URL
+    enabled: Dict[str, bool] = field(default_factory=lambda: {name: True for name in COLLECTOR_NAMES})
+
+    def is_enabled(self, name: str) -> bool:
+        return self.enabled.get(name, True)
+
+
+def load_config(path: Path = CONFIG_PATH, default_backend_url: str = DEFAULT_BACKEND_URL) -> CollectorConfig:
+    config = CollectorConfig(backend_url=default_backend_url)
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        raw = {}
+    except (OSError, ValueError) as e:
+        print(f"[WARN] Collector-Konfiguration {path} nicht lesbar: {e}")
+        raw = {}
+
+    config.backend_url = raw.get("backend_url", config.backend_url)
+    for name, on in (raw.get("collectors") or {}).items():
+        config.enabled[name] = bool(on)
+    config.backend_url = os.environ.get("TRACKER_BACKEND_URL", config.backend_url).rstrip("/")
+    return config
+
+
+class Transport:
+    """
+    Eine requests.Session für alle Collectoren eines Prozesses. Der Pool hält
+    mehrere Keep-Alive-Verbindungen, damit parallele Sender (input-Batches,
+    Dokumente, Telemetrie) nicht aufeinander warten.
+    """
+
+    def __init__(self, backend_url: str, pool_size: int = 8):
+        self.backend_url = backend_url.rstrip("/")
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def post(self, path: str, payload: Any, timeout: float = 2) -> requests.Response:
+        return self.session.post(f"{self.backend_url}{path}", json=payload, timeout=timeout)
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None, timeout: float = 2) -> requests.Response:
+        return self.session.get(f"{self.backend_url}{path}", params=params, timeout=timeout)
+
+
+WATCH_TIMEOUT = 25.0      # Long-Poll-Dauer, die das Backend maximal wartet
+WATCH_RETRY_MIN = 1.0
+WATCH_RETRY_MAX = 30.0
+
+
+class SettingsWatcher:
+    """
+    Hält die Backend-Einstellungen aktuell (GET /settings/watch, Long-Poll).
+
+    Der Thread startet erst beim ersten Zugriff – Collectoren, die keine
+    Einstellungen brauchen, erzeugen keinen Request. Ist das Backend nicht
+    erreichbar, liefert get() den Default und es wird mit Backoff erneut
+    versucht.
+    """
+
+    def __init__(self, transport: Transport, stopping: Optional[threading.Event] = None):
+        self.transport = transport
+        self.stopping = stopping or threading.Event()
+        self.version = -1
+        self.values: Dict[str, Any] = {}
+        self._cond = threading.Condition()
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="settings-watch", daemon=True)
+                self._thread.start()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self.start()
+        return self.values.get(key, default)
+
+    def subscribe(self, listener: Callable[[Dict[str, Any]], None]):
+        """listener(values) nach jeder Änderung (im Watcher-Thread)."""
+        self._listeners.append(listener)
+        self.start()
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Wie time.sleep(timeout), kehrt aber bei einer Änderung (→ True) oder
+        beim Beenden sofort zurück.
+        """
+        self.start()
+        with self._cond:
+            version = self.version
+            self._cond.wait_for(lambda: self.version != version or self.stopping.is_set(), timeout)
+            return self.version != version
+
+    def interrupt(self):
+        """Wartende in wait() wecken (nach dem Setzen von stopping)."""
+        with self._cond:
+            self._cond.notify_all()
+
+    def _run(self):
+        retry = WATCH_RETRY_MIN
+        while True:
+            try:
+                res = self.transport.get(
+                    "/settings/watch",
+                    params={"version": self.version, "timeout": WATCH_TIMEOUT},
+                    timeout=WATCH_TIMEOUT + 10,
+                )
+                res.raise_for_status()
+                data = res.json()
+                retry = WATCH_RETRY_MIN
+            except Exception:
+                time.sleep(retry)
+                retry = min(retry * 2, WATCH_RETRY_MAX)
+                continue
+
+            if data.get("version") == self.version:
+                continue  # Timeout ohne Änderung
+            with self._cond:
+                self.values = data
+                self.version = data.get("version", 0)
+                self._cond.notify_all()
+            for listener in list(self._listeners):
+                try:
+                    listener(data)
+                except Exception as e:
+                    print(f"[ERROR] Settings-Listener fehlgeschlagen: {e}")
+
+
+@dataclass
+class CollectorContext:
+    config: CollectorConfig
+    transport: Transport
+    window_context: WindowContext
+    settings: Optional[SettingsWatcher] = None
+    stopping: threading.Event = field(default_factory=threading.Event)
+
+    def __post_init__(self):
+        if self.settings is None:
+            self.settings = SettingsWatcher(self.transport, self.stopping)
+
+    def stop(self):
+        self.stopping.set()
+        self.settings.interrupt()
+
+    def sleep(self, seconds: float) -> bool:
+        """Wie time.sleep(), kehrt beim Beenden sofort zurück (→ True)."""
+        return self.stopping.wait(seconds)
+
+
+STOP_SIGNALS = tuple(getattr(signal, name) for name in ("SIGINT", "SIGTERM", "SIGBREAK") if hasattr(signal, name))
+
+
+def install_stop_signals(ctx: CollectorContext):
+    """Stopp-Signale → ctx.stop(). Nur im Haupt-Thread möglich, sonst ohne Wirkung."""
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for signum in STOP_SIGNALS:
+        signal.signal(signum, lambda signum, frame: ctx.stop())
+
+
+def standalone_context(default_backend_url: str = DEFAULT_BACKEND_URL, window_context: Optional[WindowContext] = None) -> CollectorContext:
+    """Kontext für einen einzeln gestarteten Collector."""
+    config = load_config(default_backend_url=default_backend_url)
+    ctx = CollectorContext(
+        config=config,
+        transport=Transport(config.backend_url),
+        window_context=window_context or WindowContext(),
+    )
+    install_stop_signals(ctx)
+    return ctx
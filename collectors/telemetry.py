@@ -0,0 +1,181 @@
+# collectors/telemetry.py
+"""
+Selbstauskunft der Collectoren.
+
+Jeder Collector hält Zähler (erzeugte/verworfene Events, Fehler), Gauges
+(Pufferfüllstand) und Zeitmessungen (Loop-Dauer, Sende-Latenz) und schickt
+sie alle TELEMETRY_INTERVAL Sekunden zusammen mit CPU und RSS des Prozesses
+an POST /collectors/telemetry. Zeitmessungen gelten je Intervall, Zähler
+laufen seit dem Start.
+
+Nutzung:
+    telemetry = CollectorTelemetry("window")
+    telemetry.start(ctx.transport)      # collectors/runtime.py
+    with telemetry.timer("loop"):
+        ...
+    telemetry.incr("events")
+"""
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:  # optional: dann ohne CPU/RSS
+    psutil = None
+
+TELEMETRY_INTERVAL = 30.0  # Sekunden zwischen zwei Berichten
+
+# Obergrenzen der Buckets (Sekunden) für p95 je Intervall
+TIMING_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Timing:
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(TIMING_BUCKETS) + 1)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect.bisect_left(TIMING_BUCKETS, seconds)] += 1
+
+    def p95(self) -> float:
+        rank = 0.95 * self.count
+        seen = 0
+        for i, c in enumerate(self.buckets):
+            seen += c
+            if seen >= rank:
+                return TIMING_BUCKETS[i] if i < len(TIMING_BUCKETS) else self.max
+        return self.max
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1e3, 2) if self.count else 0.0,
+            "p95_ms": round(min(self.p95(), self.max) * 1e3, 2),
+            "max_ms": round(self.max * 1e3, 2),
+        }
+
+
+class CollectorTelemetry:
+    def __init__(self, collector: str, interval: float = TELEMETRY_INTERVAL):
+        self.collector = collector
+        self.interval = interval
+        self.started = datetime.now(timezone.utc)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._gauges: Dict[str, float] = {}
+        self._timings: Dict[str, Timing] = {}
+        self._gauge_sources: List[Callable[[], Dict[str, float]]] = []
+        self._reporter: Optional[threading.Thread] = None
+        self._process = psutil.Process(os.getpid()) if psutil is not None else None
+        if self._process is not None:
+            self._process.cpu_percent(None)  # erster Aufruf liefert immer 0
+
+    # --- Erfassung ---
+
+    def incr(self, name: str, n: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def gauge(self, name: str, value: float):
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                timing = self._timings[name] = Timing()
+            timing.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0)
+
+    def add_gauges(self, source: Callable[[], Dict[str, float]]):
+        """
+        Werte, die erst beim Bericht abgefragt werden (z.B. Puffertiefe oder
+        Zähler, die der Collector ohnehin führt) – kostet im Hot Path nichts.
+        """
+        self._gauge_sources.append(source)
+
+    def remove_gauges(self, source: Callable[[], Dict[str, float]]):
+        """Gegenstück zu add_gauges, wenn die Quelle beendet wird (Neustart im Host)."""
+        try:
+            self._gauge_sources.remove(source)
+        except ValueError:
+            pass
+
+    # --- Bericht ---
+
+    def snapshot(self, reset: bool = True) -> dict:
+        gauges: Dict[str, float] = {}
+        for source in self._gauge_sources:
+            try:
+                gauges.update(source())
+            except Exception as e:
+                print(f"[WARN] Telemetrie-Gauge fehlgeschlagen: {e}")
+
+        with self._lock:
+            gauges.update(self._gauges)
+            timings = {name: t.as_dict() for name, t in self._timings.items()}
+            counters = dict(self._counters)
+            if reset:
+                self._timings = {}
+
+        report = {
+            "collector": self.collector,
+            "pid": os.getpid(),
+            "started": self.started.isoformat(),
+            "interval_seconds": self.interval,
+            "counters": counters,
+            "gauges": gauges,
+            "timings": timings,
+            "cpu_percent": None,
+            "rss_bytes": None,
+        }
+        if self._process is not None:
+            try:
+                report["cpu_percent"] = self._process.cpu_percent(None)
+                report["rss_bytes"] = self._process.memory_info().rss
+                report["threads"] = self._process.num_threads()
+            except psutil.Error:
+                pass
+        return report
+
+    def _report_loop(self, transport):
+        while True:
+            time.sleep(self.interval)
+            try:
+                transport.post("/collectors/telemetry", self.snapshot(), timeout=2)
+            except Exception:
+                # Backend weg: nächster Bericht enthält die Zähler ohnehin kumuliert
+                pass
+
+    def start(self, transport):
+        """
+        transport: collectors.runtime.Transport (im Collector-Host geteilt).
+        Mehrfacher Aufruf (Neustart des Collectors im Host) startet keinen zweiten Thread.
+        """
+        if self._reporter is not None:
+            return
+        self._reporter = threading.Thread(
+            target=self._report_loop, args=(transport,), name=f"{self.collector}-telemetry", daemon=True
+        )
+        self._reporter.start()
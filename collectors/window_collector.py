@@ -2,45 +2,32 @@
 import time
 from datetime import datetime, timezone
 
-import requests
-import win32gui
-import win32process
-import psutil
+try:
+    from collectors.runtime import CollectorContext, standalone_context
+    from collectors.telemetry import CollectorTelemetry
+except ImportError:  # Start als Skript: python collectors/window_collector.py
+    from runtime import CollectorContext, standalone_context
+    from telemetry import CollectorTelemetry
 
 
 BACKEND_URL = "http://127.0.0.1:8000"
 INTERVAL_SECONDS = 1  # jede Sekunde prüfen
 
+telemetry = CollectorTelemetry("window")
 
-def get_active_window_info():
-    try:
-        hwnd = win32gui.GetForegroundWindow()
-        if not hwnd:
-            return None, None, None
 
-        title = win32gui.GetWindowText(hwnd)
-        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-
-        app = None
-        try:
-            proc = psutil.Process(pid)
-            app = proc.name()
-        except Exception:
-            pass
-
-        return app, title, pid
-    except Exception:
-        return None, None, None
-
-
-def main():
+def main(ctx: CollectorContext = None):
+    ctx = ctx or standalone_context(BACKEND_URL)
+    telemetry.start(ctx.transport)
     last_state = None
 
-    while True:
+    while not ctx.stopping.is_set():
+        loop_start = time.perf_counter()
         now = datetime.now(timezone.utc)
         timestamp_iso = now.isoformat()
 
-        app, title, pid = get_active_window_info()
+        # im Collector-Host derselbe (gecachte) Kontext wie im input_collector
+        app, title, pid = ctx.window_context.get()
         state = (app, title, pid)
 
         # Nur bei Änderung ein Event senden
@@ -56,13 +43,17 @@ def main():
                 },
             }
 
+            telemetry.incr("events")
             try:
-                requests.post(f"{BACKEND_URL}/events", json=payload, timeout=2)
+                with telemetry.timer("send"):
+                    ctx.transport.post("/events", payload, timeout=2)
                 last_state = state
             except Exception as e:
+                telemetry.incr("send_errors")
                 print(f"[ERROR] Backend nicht erreichbar: {e}")
 
-        time.sleep(INTERVAL_SECONDS)
+        telemetry.observe("loop", time.perf_counter() - loop_start)
+        ctx.sleep(INTERVAL_SECONDS)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,191 @@
+# collectors/window_context.py
+"""
+Gemeinsamer Zugriff auf das aktive Fenster (app, title, pid).
+
+- ProcessNameCache: LRU pid -> Prozessname (spart psutil.Process(pid).name()),
+                    Einträge verfallen nach PROCESS_NAME_TTL (PIDs werden
+                    vom System wiederverwendet)
+- WindowContext:    gecachter Fenster-Kontext für Hot-Paths (input_collector),
+                    aktualisiert höchstens alle REFRESH_INTERVAL Sekunden oder
+                    sofort nach invalidate() – das ruft der input_collector
+                    nach Klicks und Fokus-Tasten (Alt+Tab, Win) auf
+- Provider:         austauschbar, damit sich der Hot-Path auch ohne Win32
+                    (z.B. unter Linux mit einem Fake-Provider) messen lässt
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+import psutil
+
+try:
+    import win32gui
+    import win32process
+except ImportError:  # kein Windows → nur eigene Provider nutzbar
+    win32gui = None
+    win32process = None
+
+
+WindowInfo = Tuple[Optional[str], Optional[str], Optional[int]]
+
+REFRESH_INTERVAL = 0.25        # max. 4 Fenster-Abfragen pro Sekunde
+PROCESS_NAME_CACHE_SIZE = 256
+PROCESS_NAME_TTL = 30.0        # Sekunden; begrenzt falsche Namen nach PID-Wiederverwendung
+
+
+class ProcessNameCache:
+    """
+    Thread-sicherer LRU-Cache pid -> Prozessname mit Ablaufzeit.
+
+    Der Schlüssel (pid, create_time) wäre exakt, kostet aber pro Abfrage
+    denselben Systemaufruf, den der Cache sparen soll – daher TTL.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = PROCESS_NAME_CACHE_SIZE,
+        ttl: float = PROCESS_NAME_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        # pid -> (Name, gültig bis)
+        self._names: "OrderedDict[int, Tuple[Optional[str], float]]" = OrderedDict()
+
+    def get(self, pid: Optional[int]) -> Optional[str]:
+        if not pid:
+            return None
+
+        with self._lock:
+            entry = self._names.get(pid)
+            if entry is not None and entry[1] > self.clock():
+                self._names.move_to_end(pid)
+                return entry[0]
+
+        try:
+            name = psutil.Process(pid).name()
+        except Exception:
+            # z.B. AccessDenied / Prozess schon beendet – nicht cachen
+            return None
+
+        with self._lock:
+            self._names[pid] = (name, self.clock() + self.ttl)
+            self._names.move_to_end(pid)
+            if len(self._names) > self.maxsize:
+                self._names.popitem(last=False)
+        return name
+
+
+process_names = ProcessNameCache()
+
+
+class Win32WindowProvider:
+    """Liest das Vordergrundfenster über die Win32-API."""
+
+    def foreground(self) -> int:
+        return win32gui.GetForegroundWindow()
+
+    def title(self, hwnd: int) -> str:
+        return win32gui.GetWindowText(hwnd)
+
+    def pid(self, hwnd: int) -> int:
+        _, pid = win32process.GetWindowThreadProcessId(hwnd)
+        return pid
+
+
+class NullWindowProvider:
+    """Fallback ohne Win32: kein aktives Fenster bekannt."""
+
+    def foreground(self) -> int:
+        return 0
+
+    def title(self, hwnd: int) -> str:
+        return ""
+
+    def pid(self, hwnd: int) -> int:
+        return 0
+
+
+def default_provider():
+    return Win32WindowProvider() if win32gui is not None else NullWindowProvider()
+
+
+def get_active_window_info(provider=None) -> WindowInfo:
+    """Ungecachte Abfrage (app, title, pid); Prozessname kommt aus dem LRU."""
+    provider = provider or _default
+    try:
+        hwnd = provider.foreground()
+        if not hwnd:
+            return None, None, None
+
+        title = provider.title(hwnd)
+        pid = provider.pid(hwnd)
+        return process_names.get(pid), title, pid
+    except Exception:
+        return None, None, None
+
+
+class WindowContext:
+    """
+    Gecachter Fenster-Kontext. get() ist im Normalfall nur ein Zeitvergleich;
+    die eigentliche Abfrage passiert höchstens alle `refresh_interval` Sekunden.
+    Bleibt das Fenster-Handle gleich, wird nur der Titel neu gelesen.
+    """
+
+    def __init__(
+        self,
+        provider=None,
+        refresh_interval: float = REFRESH_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.provider = provider or default_provider()
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._info: WindowInfo = (None, None, None)
+        self._hwnd = 0
+        self._checked_at = float("-inf")
+
+        self.refreshes = 0
+
+    def get(self) -> WindowInfo:
+        if self.clock() - self._checked_at < self.refresh_interval:
+            return self._info
+        with self._lock:
+            now = self.clock()
+            if now - self._checked_at >= self.refresh_interval:
+                self._refresh_locked()
+                self._checked_at = now
+            return self._info
+
+    def invalidate(self):
+        """Nach einem bekannten Fokuswechsel: nächstes get() fragt neu ab."""
+        self._checked_at = float("-inf")
+
+    def _refresh_locked(self):
+        self.refreshes += 1
+        try:
+            hwnd = self.provider.foreground()
+            if not hwnd:
+                self._hwnd = 0
+                self._info = (None, None, None)
+                return
+
+            title = self.provider.title(hwnd)
+            if hwnd == self._hwnd:
+                app, _, pid = self._info
+            else:
+                pid = self.provider.pid(hwnd)
+                app = process_names.get(pid)
+            self._hwnd = hwnd
+            self._info = (app, title, pid)
+        except Exception:
+            self._hwnd = 0
+            self._info = (None, None, None)
+
+
+_default = default_provider()
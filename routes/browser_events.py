@@ -1,13 +1,17 @@
 # routes/browser_events.py
 
+from datetime import datetime
 from typing import List
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend import metrics, search, sketches
+from backend.browser_dedup import browser_deduper
 from backend.models import BrowserEvent
-from backend.schemas import BrowserEventCreate, BrowserEventRead
-from routes.deps import get_db
+from backend.schemas import BrowserEventBatch, BrowserEventCreate, BrowserEventRead
+from routes.deps import get_async_db
 
 router = APIRouter(
     prefix="/browser-events",
@@ -16,9 +20,9 @@ router = APIRouter(
 
 
 @router.post("/", response_model=dict, status_code=201)
-def create_browser_event(
+async def create_browser_event(
     event: BrowserEventCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     db_event = BrowserEvent(
         timestamp=event.timestamp,
@@ -33,22 +37,60 @@ def create_browser_event(
         value_preview=event.value_preview,
     )
     db.add(db_event)
-    db.commit()
-    db.refresh(db_event)
+    await db.flush()
+    await db.run_sync(search.index_browser_events, [db_event])
+    await db.run_sync(sketches.invalidate_days, [db_event.timestamp])
+    await db.commit()
+    metrics.count_ingest(1)
     return {"id": db_event.id}
 
 
+def _row(event: BrowserEventCreate, now: datetime) -> dict:
+    row = event.model_dump()
+    if row["timestamp"] is None:
+        row["timestamp"] = now  # wie der Spalten-Default
+    return row
+
+
+@router.post("/batch", response_model=dict, status_code=201)
+async def create_browser_events_batch(
+    batch: BrowserEventBatch,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Mehrere DOM-Events in einem INSERT. Wiederholte identische Events und
+    Tipp-Folgen auf demselben Feld werden vorher verdichtet (backend.browser_dedup).
+    """
+    kept, dropped = browser_deduper.filter(batch.events)
+    if kept:
+        now = datetime.utcnow()
+        try:
+            rows = (await db.scalars(
+                insert(BrowserEvent).returning(BrowserEvent),
+                [_row(event, now) for event in kept],
+            )).all()
+            await db.run_sync(search.index_browser_events, rows)
+            await db.run_sync(sketches.invalidate_days, [row.timestamp for row in rows])
+            await db.commit()
+        except BaseException:
+            # nicht gespeichert → die Wiederholung des Clients darf durch
+            browser_deduper.forget(kept)
+            raise
+        metrics.count_ingest(len(rows))
+    return {"received": len(batch.events), "inserted": len(kept), "deduplicated": dropped}
+
+
 @router.get("/", response_model=List[BrowserEventRead])
-def list_browser_events(
+async def list_browser_events(
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Liefert die letzten Browser-Events (standardmäßig 100, absteigend nach Zeit).
     """
     q = (
-        db.query(BrowserEvent)
+        select(BrowserEvent)
         .order_by(BrowserEvent.timestamp.desc())
         .limit(limit)
     )
-    return q.all()
+    return (await db.execute(q)).scalars().all()
@@ -0,0 +1,28 @@
+# routes/collectors.py
+from typing import List
+
+from fastapi import APIRouter
+
+from backend.collector_telemetry import telemetry_store
+from backend.schemas import CollectorTelemetryIn, CollectorTelemetryOut
+
+router = APIRouter(
+    prefix="/collectors",
+    tags=["collectors"]
+)
+
+
+@router.post("/telemetry", status_code=204)
+async def report_telemetry(report: CollectorTelemetryIn):
+    telemetry_store.add(report)
+
+
+@router.get("/telemetry", response_model=List[CollectorTelemetryOut])
+async def list_telemetry():
+    """Neuester Bericht je Collector inkl. Status (ok / warn / offline)."""
+    return telemetry_store.latest()
+
+
+@router.get("/telemetry/{collector}/history", response_model=List[CollectorTelemetryOut])
+async def telemetry_history(collector: str):
+    return telemetry_store.history(collector)
@@ -0,0 +1,44 @@
+# routes/days.py
+import gzip
+import hashlib
+from datetime import date, datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+
+from backend import day_cache
+from routes.deps import get_db
+
+router = APIRouter(prefix="/analysis", tags=["analysis"])
+
+# Auch abgeschlossene Tage können sich durch späte Events noch ändern (→ neue
+# Datei, neues ETag), die URL bleibt dieselbe: immer revalidieren, 304 ist billig
+REVALIDATE_CACHE = "no-cache"
+
+
+@router.get("/day/{day}")
+def day_timeline(day: date, request: Request, db: Session = Depends(get_db)):
+    """
+    Timeline eines UTC-Tages: Fenster-Spans (RLE), Input pro Minute und
+    Dokument-Events. Abgeschlossene Tage kommen vorberechnet von der Platte,
+    der laufende Tag wird jedes Mal neu gebaut. Clients revalidieren per ETag.
+    """
+    if day > datetime.now(timezone.utc).date():
+        raise HTTPException(status_code=404, detail="Tag liegt in der Zukunft.")
+
+    data, _ = day_cache.get_day(db, day)
+    etag = f'"{hashlib.sha1(data).hexdigest()[:20]}"'
+    headers = {
+        "Cache-Control": REVALIDATE_CACHE,
+        "ETag": etag,
+        "Vary": "Accept-Encoding",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    # Datei liegt schon gzip-komprimiert vor – so wie sie ist ausliefern
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=data, media_type="application/json", headers=headers)
+    return Response(content=gzip.decompress(data), media_type="application/json", headers=headers)
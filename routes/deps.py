@@ -1,21 +1,8 @@
-from typing import Generator
-from sqlalchemy.orm import Session
-
-from backend.db import SessionLocal
-
-
-def get_db() -> Generator[Session, None, None]:
-    """
-    FastAPI-Dependency für eine DB-Session.
-    Nutzung in Routern z.B.:
-
-        @router.get("/items")
-        def get_items(db: Session = Depends(get_db)):
-            ...
-
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# routes/deps.py
+"""
+DB-Dependencies für die Router. Definiert sind sie nur in backend/db.py –
+hier werden sie re-exportiert, damit Router nicht von backend.db abhängen müssen.
+"""
+from backend.db import get_async_db, get_db
+
+__all__ = ["get_async_db", "get_db"]
@@ -0,0 +1,48 @@
+# routes/domains.py
+from datetime import datetime, timedelta, timezone
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import url_index
+from backend.schemas import TopDomainOut
+from routes.deps import get_async_db
+
+router = APIRouter(prefix="/analysis", tags=["browser"])
+
+
+@router.get("/top-domains", response_model=List[TopDomainOut])
+async def top_domains(
+    from_: Optional[datetime] = Query(None, alias="from"),
+    to: Optional[datetime] = None,
+    by: Literal["domain", "path"] = "domain",
+    max_gap: float = Query(url_index.DEFAULT_MAX_GAP_SECONDS, gt=0, description="max. Sekunden je Seitenaufruf"),
+    limit: int = Query(20, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Zeit pro Website aus der Folge der tab_activated/page_loaded-Events:
+    jeder Aufruf zählt bis zum nächsten (höchstens max_gap Sekunden).
+    page_loaded zählt nur im zuletzt aktivierten Tab; Ladevorgänge in
+    Hintergrund-Tabs bleiben außen vor. Fokuswechsel zu anderen Programmen
+    sieht die Extension nicht – die Zeit läuft dann bis max_gap weiter.
+    Standardzeitraum: die letzten 7 Tage. by=path schlüsselt nach Pfad-Template auf.
+    """
+    end = to or datetime.now(timezone.utc)
+    start = from_ or end - timedelta(days=7)
+    stmt = url_index.top_statement(by_path=by == "path")
+    rows = (await db.execute(stmt, url_index.top_params(start, end, max_gap, limit))).all()
+
+    # total = Zeit aller Websites im Zeitraum, nicht nur der ersten `limit`
+    return [
+        TopDomainOut(
+            domain=r.domain,
+            path=r.path,
+            visits=r.visits,
+            total_seconds=round(r.seconds, 1),
+            total_minutes=round(r.seconds / 60.0, 2),
+            share=round(r.seconds / (r.total or 1.0), 4),
+        )
+        for r in rows
+    ]
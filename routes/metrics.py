@@ -0,0 +1,22 @@
+# routes/metrics.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from backend import metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus-Scrape-Endpunkt."""
+    return PlainTextResponse(metrics.prometheus_text(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@router.get("/debug/perf")
+def debug_perf():
+    """
+    Dieselben Zahlen als JSON: Latenz-Perzentile, Größen und SQL-Statistik je
+    Route, Ingest-Rate und die langsamsten SQL-Statements.
+    """
+    return metrics.snapshot()
@@ -0,0 +1,133 @@
+# routes/screenshots.py
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response
+from sqlalchemy.orm import Session
+
+from backend.models import Event
+from backend.retention import SCREENSHOT_DIR
+from backend.thumbnails import snap_width, thumbnail_cache
+from routes.deps import get_db
+
+router = APIRouter(
+    tags=["screenshots"],
+)
+
+# Screenshots ändern sich nach dem Schreiben nie mehr → dauerhaft cachebar
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+
+def _screenshot_path(db: Session, event_id: int) -> Path:
+    ev = (
+        db.query(Event)
+        .filter(Event.id == event_id)
+        .filter(Event.source == "screenshot")
+        .first()
+    )
+    if ev is None:
+        raise HTTPException(status_code=404, detail="Screenshot-Event nicht gefunden.")
+
+    payload = ev.payload or {}
+    raw = payload.get("path")
+    if not raw:
+        raise HTTPException(status_code=404, detail="Screenshot-Event hat keinen Pfad.")
+
+    # Ausgeliefert wird nur, was unter SCREENSHOT_DIR liegt – Events könnten
+    # sonst auf beliebige Dateien zeigen.
+    path = Path(raw).resolve()
+    if not path.is_relative_to(SCREENSHOT_DIR.resolve()):
+        raise HTTPException(status_code=403, detail="Pfad liegt außerhalb des Screenshot-Ordners.")
+    if not path.is_file():
+        raise HTTPException(status_code=410, detail="Screenshot-Datei existiert nicht mehr.")
+    return path
+
+
+@router.get("/screenshots/{event_id}")
+def get_screenshot(event_id: int, db: Session = Depends(get_db)):
+    """
+    Liefert die Original-Datei eines Screenshot-Events.
+    FileResponse streamt direkt von der Platte und unterstützt Range-Requests.
+    """
+    path = _screenshot_path(db, event_id)
+    return FileResponse(
+        path,
+        media_type="image/webp",
+        headers={"Cache-Control": IMMUTABLE_CACHE},
+    )
+
+
+@router.get("/screenshots/{event_id}/thumb")
+def get_screenshot_thumb(
+    event_id: int,
+    request: Request,
+    w: int = Query(320, ge=16, le=2000, description="Gewünschte Breite in Pixel"),
+    db: Session = Depends(get_db),
+):
+    """
+    Thumbnail eines Screenshots. Wird beim ersten Zugriff erzeugt und danach
+    aus dem RAM- bzw. Platten-Cache bedient.
+    """
+    path = _screenshot_path(db, event_id)
+
+    # ETag = Cache-Key (Pfad, mtime, Größe, Breite) – nur ein stat(), damit ein
+    # 304 weder dekodiert noch skaliert
+    try:
+        etag = f'"{thumbnail_cache.make_key(path, snap_width(w))}"'
+    except OSError as e:
+        raise HTTPException(status_code=410, detail=f"Screenshot-Datei existiert nicht mehr: {e}")
+    headers = {"Cache-Control": IMMUTABLE_CACHE, "ETag": etag}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    try:
+        key, data, cached_path = thumbnail_cache.get(path, w)
+    except ImportError:
+        raise HTTPException(status_code=503, detail="Pillow ist nicht installiert.")
+    except OSError as e:
+        raise HTTPException(status_code=422, detail=f"Screenshot nicht lesbar: {e}")
+    headers["ETag"] = f'"{key}"'  # Datei könnte sich zwischen stat() und Rendern geändert haben
+
+    if cached_path is not None:
+        return FileResponse(cached_path, media_type="image/webp", headers=headers)
+    return Response(content=data, media_type="image/webp", headers=headers)
+
+
+@router.get("/analysis/screenshots/list")
+def list_screenshots(
+    from_: Optional[datetime] = Query(None, alias="from"),
+    to: Optional[datetime] = None,
+    limit: int = 200,
+    db: Session = Depends(get_db),
+):
+    """
+    Screenshot-Metadaten fürs Dashboard, neueste zuerst.
+    Bilder werden nicht mitgeschickt, nur Links auf Original und Thumbnail.
+    """
+    q = db.query(Event).filter(Event.source == "screenshot")
+    if from_:
+        q = q.filter(Event.timestamp >= from_)
+    if to:
+        q = q.filter(Event.timestamp <= to)
+
+    rows = q.order_by(Event.timestamp.desc()).limit(limit).all()
+
+    result = []
+    for ev in rows:
+        payload = ev.payload or {}
+        path = payload.get("path") or ""
+        result.append(
+            {
+                "id": ev.id,
+                "timestamp": ev.timestamp.isoformat() if ev.timestamp else None,
+                "filename": Path(path).name if path else None,
+                "path": path,
+                "size_bytes": payload.get("size_bytes"),
+                "url": f"/screenshots/{ev.id}",
+                "thumb_url": f"/screenshots/{ev.id}/thumb?w=160",
+            }
+        )
+    return result
@@ -0,0 +1,59 @@
+# routes/search.py
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import search
+from backend.fastjson import FastJSONResponse
+from routes.deps import get_async_db
+
+router = APIRouter(tags=["search"])
+
+
+@router.get("/search", response_class=FastJSONResponse)
+async def search_activity(
+    q: str = Query(..., min_length=1, description='Suchbegriffe; Wörter als Präfix, "…" als Phrase'),
+    from_: Optional[datetime] = Query(None, alias="from"),
+    to: Optional[datetime] = None,
+    kind: Optional[List[str]] = Query(None, description="window, url, document (mehrfach möglich)"),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Volltextsuche über Fenstertitel, URLs und Dokumentpfade.
+    Ein Treffer = ein Text an einem Tag (erster/letzter Zeitpunkt, Anzahl),
+    sortiert nach Relevanz (bm25), dann nach Aktualität.
+    """
+    match = search.build_match(q)
+    if match is None:
+        raise HTTPException(status_code=422, detail="Keine suchbaren Begriffe in q.")
+    if kind and any(k not in search.KINDS for k in kind):
+        raise HTTPException(status_code=422, detail=f"kind muss einer von {', '.join(search.KINDS)} sein.")
+
+    t0 = time.perf_counter()
+    stmt = search.search_statement(from_, to, kind)
+    rows = (await db.execute(stmt, search.search_params(match, from_, to, kind, limit))).all()
+    took_ms = (time.perf_counter() - t0) * 1e3
+
+    return FastJSONResponse({
+        "query": q,
+        "match": match,
+        "took_ms": round(took_ms, 2),
+        "results": [
+            {
+                "kind": r.kind,
+                "text": r.text,
+                "day": r.day,
+                "first_seen": r.first_ts,
+                "last_seen": r.last_ts,
+                "hits": r.hits,
+                "source": r.source,
+                "ref_id": r.ref_id,
+                "score": round(r.score, 4),
+            }
+            for r in rows
+        ],
+    })
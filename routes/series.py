@@ -0,0 +1,34 @@
+# routes/series.py
+from datetime import datetime, timedelta, timezone
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from backend import series
+from backend.concurrency import run_in_db_thread
+from backend.schemas import SeriesResponse
+
+router = APIRouter(prefix="/analysis", tags=["analysis"])
+
+
+@router.get("/series", response_model=SeriesResponse, response_model_by_alias=True)
+async def activity_series(
+    from_: Optional[datetime] = Query(None, alias="from"),
+    to: Optional[datetime] = None,
+    source: Optional[str] = Query(None, description="ohne source: eine Reihe je Quelle, sonst je Typ"),
+    type: Optional[List[str]] = Query(None, description="nur diese Typen (mehrfach möglich)"),
+    metric: Literal["count", "duration"] = "count",
+    width: int = Query(300, ge=10, le=2000, description="Diagrammbreite in Pixeln = max. Punkte je Reihe"),
+):
+    """
+    Anzahl (metric=count) oder Dauer in Sekunden (metric=duration, jedes Event
+    bis zum nächsten) je Bucket. Bucket-Größe passt sich dem Zeitraum an; mehr
+    Buckets als width werden per LTTB auf width Punkte reduziert. total ist exakt.
+    Standardzeitraum: die letzten 24 Stunden.
+    """
+    # naive Angaben gelten als UTC – sonst scheitert der Vergleich mit dem Default
+    end = series._utc(to) if to else datetime.now(timezone.utc)
+    start = series._utc(from_) if from_ else end - timedelta(days=1)
+    if start >= end:
+        raise HTTPException(status_code=422, detail="from muss vor to liegen")
+    return await run_in_db_thread(series.build_series, start, end, source, type, metric, width)
@@ -1,27 +1,85 @@
 # start_all.py
+"""
+Startet Backend und Collectoren.
+
+    python start_all.py               Entwicklung: uvicorn --reload, alles gleichzeitig
+    python start_all.py --supervise   Produktion: Supervisor
+
+    --collector-host   alle Collectoren in einem Prozess (collectors/host.py)
+                       statt vier einzelner Interpreter
+
+Supervisor-Modus:
+- Backend ohne --reload starten und auf GET /healthz warten, erst dann die
+  Collectoren – sonst gehen deren erste Events ins Leere.
+- Abgestürzte Prozesse mit exponentiellem Backoff neu starten (1 s, 2 s, 4 s …
+  bis BACKOFF_MAX). Lief ein Prozess mindestens BACKOFF_RESET Sekunden stabil,
+  beginnt der Backoff wieder bei BACKOFF_MIN.
+- Alle SAMPLE_INTERVAL Sekunden CPU und RSS je Prozess messen (psutil, optional).
+  Zusammen mit Neustarts und letztem Exit-Code landet das in STATUS_PATH und als
+  Telemetrie-Bericht "supervisor/<name>" bei POST /collectors/telemetry.
+- Die Collectoren bekommen die Backend-URL über TRACKER_BACKEND_URL
+  (collectors/runtime.py), folgen also --host/--port.
+- Strg+C / SIGTERM: erst Collectoren beenden (die leeren dabei ihre Puffer
+  ans Backend, siehe collectors/runtime.py), dann das Backend. Unter Windows
+  bekommt jeder Prozess eine eigene Prozessgruppe und CTRL_BREAK statt
+  TerminateProcess; wer nach STOP_TIMEOUT noch läuft, wird gekillt.
+"""
+import argparse
+import json
+import os
+import signal
 import subprocess
 import sys
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 
+import requests
+
+try:
+    import psutil
+except ImportError:  # optional: dann ohne CPU/RSS
+    psutil = None
+
 BASE_DIR = Path(__file__).resolve().parent
 PYTHON = sys.executable  # nutzt das Python aus der aktiven venv
 
+COLLECTORS = {
+    "screenshot": "collectors/screenshot_collector.py",
+    "window": "collectors/window_collector.py",
+    "input": "collectors/input_collector.py",
+    "document": "collectors/document_collector.py",
+}
+
+READY_TIMEOUT = 60.0     # Sekunden, die das Backend für /healthz bekommt
+BACKOFF_MIN = 1.0
+BACKOFF_MAX = 60.0
+BACKOFF_RESET = 60.0     # so lange stabil → Backoff zurücksetzen
+SAMPLE_INTERVAL = 30.0   # wie collectors/telemetry.py
+STOP_TIMEOUT = 10.0      # danach kill
+STATUS_PATH = Path.home() / ".tracker" / "supervisor.json"
+# eigene Prozessgruppe, damit stop() gezielt CTRL_BREAK senden kann
+CREATION_FLAGS = subprocess.CREATE_NEW_PROCESS_GROUP if sys.platform == "win32" else 0
+
 processes = []
 
+def collector_commands(single_process):
+    if single_process:
+        return {"collectors": [PYTHON, "-m", "collectors.host"]}
+    return {name: [PYTHON, script] for name, script in COLLECTORS.items()}
+
 def start(name, args):
     print(f"Starte {name}: {' '.join(args)}")
     p = subprocess.Popen(args, cwd=BASE_DIR)
     processes.append((name, p))
 
-def main():
+def run_dev(single_process=False):
     # Backend
     start("backend", [PYTHON, "-m", "uvicorn", "backend.main:app", "--reload"])
 
     # Collectors
-    start("screenshot", [PYTHON, "collectors/screenshot_collector.py"])
-    start("window",     [PYTHON, "collectors/window_collector.py"])
-    start("input",      [PYTHON, "collectors/input_collector.py"])
-    start("document",   [PYTHON, "collectors/document_collector.py"])
+    for name, args in collector_commands(single_process).items():
+        start(name, args)
 
     print("Alle Prozesse gestartet. Strg+C zum Beenden dieses Starters (Child-Prozesse laufen weiter).")
     try:
@@ -32,5 +90,210 @@ def main():
         for name, p in processes:
             p.terminate()
 
+
+# =========================
+# Supervisor
+# =========================
+
+class Child:
+    """Ein überwachter Prozess samt Neustart-Zustand und letzter Messung."""
+
+    def __init__(self, name, args, env=None):
+        self.name = name
+        self.args = args
+        self.env = env
+        self.proc = None
+        self.started_at = 0.0   # time.monotonic()
+        self.next_start = 0.0   # frühester Neustart (monotonic)
+        self.backoff = BACKOFF_MIN
+        self.restarts = 0
+        self.last_exit = None
+        self.cpu_percent = None
+        self.rss_bytes = None
+        self._ps = None
+
+    @property
+    def running(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def spawn(self):
+        print(f"[supervisor] Starte {self.name}: {' '.join(self.args)}")
+        self.proc = subprocess.Popen(self.args, cwd=BASE_DIR, env=self.env, creationflags=CREATION_FLAGS)
+        self.started_at = time.monotonic()
+        self.cpu_percent = self.rss_bytes = None
+        self._ps = None
+        if psutil is not None:
+            try:
+                self._ps = psutil.Process(self.proc.pid)
+                self._ps.cpu_percent(None)  # erster Aufruf liefert immer 0
+            except psutil.Error:
+                self._ps = None
+
+    def check(self, now):
+        """Exit erkennen bzw. fälligen Neustart ausführen."""
+        if self.proc is not None:
+            code = self.proc.poll()
+            if code is None:
+                return
+            self.last_exit = code
+            self.proc = None
+            if now - self.started_at >= BACKOFF_RESET:
+                self.backoff = BACKOFF_MIN
+            self.next_start = now + self.backoff
+            print(f"[supervisor] {self.name} beendet (Exit {code}), Neustart in {self.backoff:.0f} s")
+            self.backoff = min(self.backoff * 2, BACKOFF_MAX)
+        elif now >= self.next_start:
+            self.restarts += 1
+            self.spawn()
+
+    def sample(self):
+        if self._ps is None or not self.running:
+            self.cpu_percent = self.rss_bytes = None
+            return
+        try:
+            self.cpu_percent = self._ps.cpu_percent(None)
+            self.rss_bytes = self._ps.memory_info().rss
+        except psutil.Error:
+            self.cpu_percent = self.rss_bytes = None
+
+    def status(self, now):
+        return {
+            "name": self.name,
+            "pid": self.proc.pid if self.running else None,
+            "running": self.running,
+            "uptime_seconds": round(max(0.0, now - self.started_at), 1) if self.running else 0.0,
+            "restarts": self.restarts,
+            "last_exit": self.last_exit,
+            "cpu_percent": self.cpu_percent,
+            "rss_bytes": self.rss_bytes,
+        }
+
+    def stop(self):
+        if self.running:
+            # terminate() wäre unter Windows TerminateProcess – ohne Chance, Puffer zu leeren
+            if sys.platform == "win32":
+                self.proc.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                self.proc.terminate()
+
+    def wait(self, deadline):
+        if self.proc is None:
+            return
+        try:
+            self.proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            print(f"[supervisor] {self.name} reagiert nicht, kill")
+            self.proc.kill()
+            self.proc.wait()
+
+
+def wait_ready(backend, url, timeout):
+    """Pollt /healthz, bis es 200 liefert. False bei Timeout oder wenn das Backend stirbt."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not backend.running:
+            return False
+        try:
+            if requests.get(f"{url}/healthz", timeout=1).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def report(session, url, children, now):
+    """Status nach STATUS_PATH schreiben und je Prozess als Telemetrie ans Backend schicken."""
+    status = {
+        "updated": datetime.now(timezone.utc).isoformat(),
+        "children": [c.status(now) for c in children],
+    }
+    try:
+        STATUS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        STATUS_PATH.write_text(json.dumps(status, indent=2), encoding="utf-8")
+    except OSError as e:
+        print(f"[supervisor] Status konnte nicht geschrieben werden: {e}")
+
+    for s in status["children"]:
+        body = {
+            "collector": f"supervisor/{s['name']}",
+            "pid": s["pid"],
+            "interval_seconds": SAMPLE_INTERVAL,
+            "counters": {"restarts": s["restarts"]},
+            "gauges": {"running": int(s["running"]), "uptime_seconds": s["uptime_seconds"]},
+            "cpu_percent": s["cpu_percent"],
+            "rss_bytes": s["rss_bytes"],
+        }
+        try:
+            session.post(f"{url}/collectors/telemetry", json=body, timeout=2)
+        except requests.RequestException:
+            break  # Backend gerade weg – Datei reicht bis zum nächsten Intervall
+
+
+def run_supervisor(host, port, ready_timeout, single_process=False):
+    url = f"http://{host}:{port}"
+    backend = Child("backend", [PYTHON, "-m", "uvicorn", "backend.main:app", "--host", host, "--port", str(port)])
+    env = {**os.environ, "TRACKER_BACKEND_URL": url}
+    collectors = [Child(name, args, env) for name, args in collector_commands(single_process).items()]
+
+    stopping = False
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    backend.spawn()
+    if not wait_ready(backend, url, ready_timeout):
+        if backend.running:
+            print(f"[supervisor] Backend nicht bereit nach {ready_timeout:.0f} s – Abbruch")
+        else:
+            print(f"[supervisor] Backend vor der Bereitschaft beendet (Exit {backend.proc.returncode}) – Abbruch")
+        backend.stop()
+        backend.wait(time.monotonic() + STOP_TIMEOUT)
+        return 1
+    print(f"[supervisor] Backend bereit ({url}/healthz), starte Collectoren")
+    for child in collectors:
+        child.spawn()
+
+    children = [backend] + collectors
+    session = requests.Session()
+    next_sample = time.monotonic() + SAMPLE_INTERVAL
+    while not stopping:
+        now = time.monotonic()
+        for child in children:
+            child.check(now)
+        if now >= next_sample:
+            for child in children:
+                child.sample()
+            report(session, url, children, now)
+            next_sample = now + SAMPLE_INTERVAL
+        time.sleep(0.5)
+
+    print("[supervisor] Beende Prozesse...")
+    for group in (collectors, [backend]):
+        for child in group:
+            child.stop()
+        deadline = time.monotonic() + STOP_TIMEOUT
+        for child in group:
+            child.wait(deadline)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--supervise", action="store_true", help="Produktionsmodus mit Health-Check und Neustarts")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--ready-timeout", type=float, default=READY_TIMEOUT)
+    parser.add_argument("--collector-host", action="store_true", help="alle Collectoren in einem Prozess")
+    args = parser.parse_args()
+
+    if args.supervise:
+        sys.exit(run_supervisor(args.host, args.port, args.ready_timeout, args.collector_host))
+    run_dev(args.collector_host)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,66 @@
+# tests/conftest.py
+"""
+Gemeinsame Fixtures. Datenbank, Tages-Dateien und ~/.tracker liegen in einem
+temporären Verzeichnis – die Umgebung muss stehen, bevor backend importiert
+wird (DB_PATH, DAY_DIR und SCREENSHOT_DIR werden beim Import gelesen).
+"""
+import os
+import tempfile
+
+_TMP = tempfile.mkdtemp(prefix="lat-tests-")
+os.environ["TRACKER_DB_PATH"] = os.path.join(_TMP, "tracker.db")
+os.environ["TRACKER_DAY_DIR"] = os.path.join(_TMP, "days")
+# Retention-Worker und Fingerprint-Cache arbeiten unter Path.home()
+os.environ["HOME"] = os.environ["USERPROFILE"] = _TMP
+
+from datetime import datetime  # noqa: E402
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend import settings_store, url_index  # noqa: E402
+from backend.browser_dedup import browser_deduper  # noqa: E402
+from backend.db import SessionLocal, init_db  # noqa: E402
+from backend.models import Base, Event  # noqa: E402
+
+init_db()
+
+
+@pytest.fixture
+def db():
+    """Session auf einer leeren Datenbank (samt geleerter Caches im Prozess)."""
+    session = SessionLocal()
+    for table in reversed(Base.metadata.sorted_tables):
+        session.execute(table.delete())
+    session.commit()
+    url_index._domain_ids.clear()
+    settings_store.store.invalidate()
+    browser_deduper._seen.clear()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    from backend.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def client(app_client, db):
+    return app_client
+
+
+def add_events(db, rows):
+    """rows: (ISO-Zeit, source, type, payload) – naive Zeiten gelten als UTC."""
+    for ts, source, type_, payload in rows:
+        db.add(Event(timestamp=datetime.fromisoformat(ts), source=source, type=type_, payload=payload))
+    db.commit()
+
+
+def focus(ts, title, app="editor"):
+    return ts, "window", "window_focus", {"app": app, "title": title}
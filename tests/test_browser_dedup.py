@@ -0,0 +1,72 @@
+# tests/test_browser_dedup.py
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend import search
+from backend.browser_dedup import BrowserEventDeduper
+from backend.schemas import BrowserEventCreate
+
+T0 = datetime(2026, 1, 1, 10, 0, 0)
+
+
+def _event(seconds=0.0, event_type="click", value=None, element_id="save"):
+    return BrowserEventCreate(
+        timestamp=T0 + timedelta(seconds=seconds),
+        url="https://example.com/form",
+        event_type=event_type,
+        element_tag="INPUT",
+        element_id=element_id,
+        value_preview=value,
+    )
+
+
+def test_duplicates_within_window_are_dropped_across_batches():
+    deduper = BrowserEventDeduper(window_seconds=2.0)
+    kept, dropped = deduper.filter([_event(0), _event(1)])
+    assert (len(kept), dropped) == (1, 1)
+
+    kept, dropped = deduper.filter([_event(1.5)])
+    assert (kept, dropped) == ([], 1)
+
+    kept, _ = deduper.filter([_event(10)])
+    assert len(kept) == 1
+
+
+def test_typing_keeps_only_the_last_input():
+    deduper = BrowserEventDeduper()
+    typing = [_event(i * 0.3, "input", "hallo"[: i + 1]) for i in range(5)]
+    kept, dropped = deduper.filter(typing)
+    assert [e.value_preview for e in kept] == ["hallo"]
+    assert dropped == 4
+
+
+def test_forget_lets_the_retry_through():
+    deduper = BrowserEventDeduper()
+    kept, _ = deduper.filter([_event(0)])
+    deduper.forget(kept)
+    assert deduper.filter([_event(0)])[0] == kept
+
+
+def test_forget_keeps_newer_entries():
+    deduper = BrowserEventDeduper(window_seconds=2.0)
+    first, _ = deduper.filter([_event(0)])
+    deduper.filter([_event(5)])
+    deduper.forget(first)
+    assert deduper.filter([_event(6)]) == ([], 1)
+
+
+def test_failed_insert_does_not_swallow_the_retry(client, monkeypatch):
+    body = {"events": [{"timestamp": "2026-01-01T10:00:00", "url": "https://example.com/", "event_type": "click"}]}
+
+    def broken(db, rows):
+        raise RuntimeError("index kaputt")
+
+    with monkeypatch.context() as m:
+        m.setattr(search, "index_browser_events", broken)
+        with pytest.raises(RuntimeError):
+            client.post("/browser-events/batch", json=body)
+
+    resp = client.post("/browser-events/batch", json=body)
+    assert resp.status_code == 201
+    assert resp.json()["inserted"] == 1
@@ -0,0 +1,47 @@
+# tests/test_day_cache.py
+from datetime import date, datetime
+
+from backend import day_cache
+from tests.conftest import add_events, focus
+
+DAY = date(2026, 1, 5)
+
+
+def test_closed_day_is_written_once_and_served_from_disk(db):
+    add_events(db, [focus("2026-01-05T09:00:00", "a")])
+    day_cache.invalidate([DAY])
+
+    data, final = day_cache.get_day(db, DAY)
+    assert final and day_cache.day_path(DAY).read_bytes() == data
+
+    add_events(db, [focus("2026-01-05T10:00:00", "b")])
+    assert day_cache.get_day(db, DAY)[0] == data  # ohne note_events bleibt die Datei
+
+
+def test_late_events_drop_the_file(db):
+    add_events(db, [focus("2026-01-05T09:00:00", "a")])
+    day_cache.invalidate([DAY])
+    first, _ = day_cache.get_day(db, DAY)
+
+    add_events(db, [focus("2026-01-05T10:00:00", "b")])
+    day_cache.note_events([datetime(2026, 1, 5, 10)])
+
+    assert not day_cache.day_path(DAY).exists()
+    assert day_cache.get_day(db, DAY)[0] != first
+
+
+def test_build_racing_an_invalidation_is_not_stored(db, monkeypatch):
+    add_events(db, [focus("2026-01-05T09:00:00", "a")])
+    day_cache.invalidate([DAY])
+    build = day_cache.build_timeline
+
+    def build_then_invalidate(session, day):
+        timeline = build(session, day)
+        day_cache.invalidate([day])  # spätes Event während des Builds
+        return timeline
+
+    monkeypatch.setattr(day_cache, "build_timeline", build_then_invalidate)
+    _, final = day_cache.get_day(db, DAY)
+
+    assert final
+    assert not day_cache.day_path(DAY).exists()
@@ -0,0 +1,54 @@
+# tests/test_document_collector.py
+import os
+
+import pytest
+
+from collectors.document_collector import WatchTree, rules
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/home/u/Documents/bericht.docx", True),
+    ("C:\\Users\\u\\Documents\\notes.md", True),
+    ("/home/u/Documents/bild.png", False),
+    ("/home/u/Documents/~$bericht.docx", False),
+    ("/home/u/Documents/.~lock.tabelle.xlsx#", False),
+    ("/home/u/dev/app/node_modules/pkg/index.js", False),
+    ("C:\\dev\\app\\.Git\\hooks\\pre-commit.py", False),
+    ("/home/u/dev/app/.venv/lib/site.py", False),
+    ("/home/u/Documents/.gitignore", False),
+])
+def test_ignore_rules(path, expected):
+    assert rules.is_interesting(path) is expected
+
+
+class FakeObserver:
+    def __init__(self):
+        self.watches = {}
+
+    def schedule(self, handler, path, recursive=False):
+        assert recursive is False
+        self.watches[path] = object()
+        return self.watches[path]
+
+    def unschedule(self, watch):
+        self.watches = {p: w for p, w in self.watches.items() if w is not watch}
+
+
+def test_watch_tree_prunes_ignored_directories(tmp_path):
+    for sub in ("src/pkg", "src/node_modules/dep", ".git/objects", "docs", "venv/lib"):
+        (tmp_path / sub).mkdir(parents=True)
+    observer = FakeObserver()
+    tree = WatchTree(observer, handler=None)
+
+    assert tree.add(str(tmp_path)) == 4
+    assert sorted(os.path.relpath(p, tmp_path) for p in observer.watches) == [".", "docs", "src", os.path.join("src", "pkg")]
+
+    tree.remove(str(tmp_path / "src"))
+    assert sorted(os.path.relpath(p, tmp_path) for p in observer.watches) == [".", "docs"]
+    assert len(tree) == 2
+
+
+def test_watch_tree_ignores_an_ignored_root(tmp_path):
+    (tmp_path / "node_modules").mkdir()
+    tree = WatchTree(FakeObserver(), handler=None)
+    assert tree.add(str(tmp_path / "node_modules")) == 0
@@ -0,0 +1,89 @@
+# tests/test_ingest.py
+from datetime import datetime
+
+from backend import active_time, retention
+from backend.models import BrowserVisit, Event, ScreenshotFile
+from tests.conftest import add_events, focus
+
+
+def _browser(ts, url, tab_id):
+    return {"timestamp": ts, "source": "browser", "type": "tab_activated", "payload": {"url": url, "tab_id": tab_id}}
+
+
+def test_batch_rejects_incomplete_events(client, db):
+    resp = client.post("/events/batch", json={"events": [{"source": "window", "type": "window_focus"}]})
+    assert resp.status_code == 422
+    assert db.query(Event).count() == 0
+
+
+def test_batch_inserts_and_indexes(client, db):
+    events = [
+        _browser("2026-01-01T10:00:00Z", "https://a.example/x", 1),
+        {"timestamp": "2026-01-01T10:01:00", "source": "window", "type": "window_focus",
+         "payload": {"app": "editor", "title": "bericht"}},
+    ]
+    assert client.post("/events/batch", json={"events": events}).json() == {"inserted": 2}
+    assert client.post("/events/batch", json={"events": []}).json() == {"inserted": 0}
+
+    ids = {e.id for e in db.query(Event)}
+    assert len(ids) == 2
+    assert {v.event_id for v in db.query(BrowserVisit)} <= ids
+    assert db.query(BrowserVisit).count() == 1
+
+
+def test_domain_share_is_relative_to_all_domains(client, db):
+    events = [
+        _browser("2026-01-01T10:00:00", "https://a.example/", 1),
+        _browser("2026-01-01T10:05:00", "https://b.example/", 2),
+        _browser("2026-01-01T10:08:00", "https://c.example/", 3),
+    ]
+    client.post("/events/batch", json={"events": events})
+
+    params = {"from": "2026-01-01T09:00:00", "to": "2026-01-01T10:10:00", "limit": 1}
+    (top,) = client.get("/analysis/top-domains", params=params).json()
+    assert top["domain"] == "a.example"
+    assert top["share"] == 0.5
+
+
+def test_screenshot_ingest_does_not_stat(client, db, tmp_path, monkeypatch):
+    shot = tmp_path / "a.png"
+    shot.write_bytes(b"x" * 123)
+
+    def no_stat(path):
+        raise AssertionError("stat() auf dem Ingest-Pfad")
+
+    with monkeypatch.context() as m:
+        m.setattr(retention, "_file_size", no_stat)
+        event = {"timestamp": "2026-01-01T10:00:00", "source": "screenshot", "type": "screenshot",
+                 "payload": {"path": str(shot)}}
+        assert client.post("/events/batch", json={"events": [event]}).status_code == 200
+
+    (row,) = db.query(ScreenshotFile).all()
+    assert row.size_bytes == 0
+
+    monkeypatch.setattr(retention, "_sized_through", 0)
+    assert retention.fill_missing_sizes(db) == 1
+    db.refresh(row)
+    assert row.size_bytes == 123
+
+
+def test_active_time_closes_its_cursors(db, monkeypatch):
+    add_events(db, [
+        focus("2026-01-01T10:00:00", "a"),
+        ("2026-01-01T10:01:00", "input", "key", {}),
+        focus("2026-01-01T10:30:00", "b"),
+    ])
+    opened = []
+    stream = active_time._stream
+
+    def tracking(session, sql, start, end):
+        gen = stream(session, sql, start, end)
+        opened.append(gen)
+        return gen
+
+    monkeypatch.setattr(active_time, "_stream", tracking)
+    result = active_time.window_activity(db, datetime(2026, 1, 1), datetime(2026, 1, 1, 11))
+
+    assert result[("editor", "a")] == [360.0, 1440.0]
+    assert len(opened) == 2
+    assert all(gen.gi_frame is None for gen in opened)  # beendet → finally hat geschlossen
@@ -0,0 +1,30 @@
+# tests/test_series.py
+import math
+
+from backend.series import lttb
+
+
+def test_lttb_keeps_endpoints_and_size():
+    points = [(float(x), math.sin(x / 10.0)) for x in range(1000)]
+    sampled = lttb(points, 50)
+    assert len(sampled) == 50
+    assert sampled[0] == points[0] and sampled[-1] == points[-1]
+    assert [p[0] for p in sampled] == sorted(p[0] for p in sampled)
+
+
+def test_lttb_keeps_spikes():
+    points = [(float(x), 0.0) for x in range(500)]
+    points[250] = (250.0, 100.0)
+    assert (250.0, 100.0) in lttb(points, 20)
+
+
+def test_lttb_passes_small_inputs_through():
+    points = [(0.0, 1.0), (1.0, 2.0), (2.0, 0.0)]
+    assert lttb(points, 10) == points
+    assert lttb(points, 2) == points
+
+
+def test_series_accepts_from_without_to(client):
+    for params in ({"from": "2026-01-01T00:00:00"}, {"to": "2026-01-02T00:00:00+02:00"}):
+        resp = client.get("/analysis/series", params=params)
+        assert resp.status_code == 200, resp.text
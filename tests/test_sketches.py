@@ -0,0 +1,108 @@
+# tests/test_sketches.py
+import random
+from datetime import date, datetime, timezone
+
+import pytest
+
+from backend import durations, sketches
+from backend.models import DailySketch
+from backend.sketches import SpaceSaving
+from tests.conftest import add_events, focus
+
+
+def _utc(ts: str) -> datetime:
+    return datetime.fromisoformat(ts).replace(tzinfo=timezone.utc)
+
+
+def _random_days(rng, days=6, keys=60):
+    out = []
+    for _ in range(days):
+        weights = {f"k{rng.randrange(keys)}": float(rng.randint(1, 500)) for _ in range(keys)}
+        out.append(dict(weights))
+    return out
+
+
+def test_merge_bounds_hold_against_exact_sums():
+    rng = random.Random(7)
+    days = _random_days(rng)
+    truth = {}
+    for day in days:
+        for key, weight in day.items():
+            truth[key] = truth.get(key, 0.0) + weight
+
+    parts = [SpaceSaving.from_sorted(sorted(d.items(), key=lambda kv: kv[1], reverse=True), capacity=10)
+             for d in days]
+    merged = SpaceSaving.merge(parts, capacity=10)
+
+    for key, count, err in merged.top(10):
+        assert count - err <= truth[key] + 1e-9
+        assert truth[key] <= count + 1e-9
+    missing = set(truth) - set(merged.counts)
+    assert all(truth[key] <= merged.floor + 1e-9 for key in missing)
+
+
+def test_merge_is_exact_below_capacity():
+    parts = [SpaceSaving.from_sorted([("a", 5.0), ("b", 2.0)]), SpaceSaving.from_sorted([("b", 4.0), ("c", 1.0)])]
+    merged = SpaceSaving.merge(parts)
+    assert merged.top(3) == [("b", 6.0, 0.0), ("a", 5.0, 0.0), ("c", 1.0, 0.0)]
+
+
+def test_merge_roundtrips_through_dumps():
+    s = SpaceSaving.from_sorted([("a", 3.0), ("b", 2.0), ("c", 1.0)], capacity=2)
+    loaded = SpaceSaving.loads(s.dumps())
+    assert loaded.counts == s.counts and loaded.errors == s.errors
+    assert loaded.floor == s.floor == 2.0  # voll: kleinster Zähler begrenzt die übrigen
+
+
+def test_build_day_counts_switch_at_midnight_once(db):
+    add_events(db, [
+        focus("2026-01-01T23:00:00", "late"),
+        focus("2026-01-02T00:00:00", "midnight"),
+        focus("2026-01-02T01:00:00", "next"),
+    ])
+    first = SpaceSaving.loads(sketches.build_day(db, date(2026, 1, 1))["window_time"])
+    second = SpaceSaving.loads(sketches.build_day(db, date(2026, 1, 2))["window_time"])
+
+    assert set(first.counts) == {sketches.window_key("editor", "late")}
+    assert second.counts[sketches.window_key("editor", "midnight")] == 3600.0
+
+
+@pytest.mark.parametrize("start, end", [
+    ("2026-01-01T05:13:00", "2026-01-04T17:02:00"),  # beide Ränder angeschnitten
+    ("2026-01-02T00:00:00", "2026-01-04T00:00:00"),  # ganze Tage, Ende um Mitternacht
+    ("2026-01-02T03:00:00", "2026-01-02T09:00:00"),  # innerhalb eines Tages
+    ("2026-01-01T12:00:00", "2026-01-05T00:00:00"),  # letzter ganzer Tag ohne Wechsel
+])
+def test_approx_top_windows_matches_exact_range(db, start, end):
+    rng = random.Random(3)
+    rows = []
+    t = _utc("2026-01-01T00:00:00").timestamp()
+    while t < _utc("2026-01-06T00:00:00").timestamp():
+        ts = datetime.fromtimestamp(t, timezone.utc).replace(tzinfo=None)
+        if not datetime(2026, 1, 3, 20) < ts < datetime(2026, 1, 5, 2):
+            rows.append(focus(ts.isoformat(), str(rng.randint(0, 15))))
+        t += rng.randint(60, 4000)
+    add_events(db, rows)
+    start, end = _utc(start), _utc(end)
+
+    exact = {
+        (r.app, r.title): r.seconds
+        for r in durations.top_windows(db, start, end, limit=None, until=end, exclusive_end=True)
+    }
+    approx = {(r.app, r.title): r for r in sketches.approx_top_windows(db, start, end, limit=50)}
+
+    assert set(approx) == set(exact)
+    for key, row in approx.items():
+        assert row.error_seconds == 0.0
+        assert row.seconds == pytest.approx(exact[key], abs=1e-3)
+
+
+def test_invalidate_days_drops_day_and_previous(db):
+    for day in ("2026-01-01", "2026-01-02", "2026-01-03"):
+        db.add(DailySketch(day=day, kind="window_time", data="{}"))
+    db.commit()
+
+    sketches.invalidate_days(db, [datetime(2026, 1, 2, 0, 5)])
+    db.commit()
+
+    assert [row.day for row in db.query(DailySketch)] == ["2026-01-03"]